@@ -0,0 +1,41 @@
+"""
+Throughput of Model.dump_many()/load_many() versus calling dump()/load()
+for every instance.
+
+    PYTHONPATH=. python benchmarks/bulk.py
+"""
+import time
+
+import netcast as nc
+
+
+class Foo(nc.Model):
+    bar = nc.String()
+    baz = nc.Int()
+    biz = nc.Char(signed=False)
+    ext = nc.Int(version_added=2, default=20)
+
+
+def per_second(func, count):
+    start = time.perf_counter()
+    func()
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    print(f"{'driver':<11}{'batch':>7}{'dump/s':>12}{'dump_many/s':>13}"
+          f"{'load/s':>12}{'load_many/s':>13}")
+    for driver in ("construct", "codegen"):
+        for size in (10, 100, 1000, 10000):
+            foos = [Foo(bar="bar", baz=idx, biz=2, ext=3) for idx in range(size)]
+            dumps = Foo.dump_many(foos, driver)
+            dump = per_second(lambda: [foo.dump(driver) for foo in foos], size)
+            dump_many = per_second(lambda: Foo.dump_many(foos, driver), size)
+            load = per_second(lambda: [Foo().load(driver, data) for data in dumps], size)
+            load_many = per_second(lambda: Foo.load_many(dumps, driver), size)
+            print(f"{driver:<11}{size:>7}{dump:>12,.0f}{dump_many:>13,.0f}"
+                  f"{load:>12,.0f}{load_many:>13,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Dump/load throughput of the code-generating driver versus the construct driver.
+
+    PYTHONPATH=. python benchmarks/codegen_driver.py
+"""
+import timeit
+
+import netcast as nc
+
+
+class Point(nc.Model):
+    x = nc.Int()
+    y = nc.Int()
+
+
+class Foo(nc.Model):
+    bar = nc.String()
+    baz = nc.Int()
+    biz = nc.Char(signed=False)
+    ext = nc.Int(version_added=2, default=20)
+    point = Point
+
+
+def measure(func, number):
+    return number / min(timeit.repeat(func, number=number, repeat=5))
+
+
+def main(number=2000):
+    instance = Foo(bar="bar", baz=1, biz=2, ext=3)
+    instance.point.x = 4
+    instance.point.y = 5
+    print(f"{'driver':<11}{'dumps/s':>12}{'loads/s':>12}")
+    for driver in ("construct", "codegen"):
+        dump = instance.dump(driver)
+        dumps = measure(lambda: instance.dump(driver), number)
+        loads = measure(lambda: Foo().load(driver, dump), number)
+        print(f"{driver:<11}{dumps:>12,.0f}{loads:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Time to get a compiled construct parser for a big model, with and without
+the on-disk cache of compiled parsers.
+
+    PYTHONPATH=. python benchmarks/construct_cache.py
+"""
+import tempfile
+import timeit
+
+import construct
+
+import netcast as nc
+from netcast.drivers.construct_cache import CompileCache
+
+Big = nc.create_model(
+    *(nc.Int(name=f"i{idx}") for idx in range(100)),
+    *(nc.String(name=f"s{idx}") for idx in range(50)),
+    name="big",
+)
+
+
+def main(number=20):
+    impl = Big().impl("construct", final=True)
+    if isinstance(impl, construct.Renamed):
+        impl = impl.subcon
+
+    compile_time = min(timeit.repeat(impl.compile, number=number, repeat=3)) / number
+    with tempfile.TemporaryDirectory() as directory:
+        CompileCache(directory).compile(impl)
+        restore_time = min(
+            timeit.repeat(
+                lambda: CompileCache(directory).compile(impl), number=number, repeat=3
+            )
+        ) / number
+
+    print(f"compile:        {compile_time * 1000:8.2f} ms")
+    print(f"load from disk: {restore_time * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
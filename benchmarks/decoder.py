@@ -0,0 +1,67 @@
+"""
+Incremental decoding of records split into small network chunks: Model.decoder()
+versus buffering the chunks and retrying Model.load() until it succeeds.
+
+    PYTHONPATH=. python benchmarks/decoder.py
+"""
+import io
+import time
+
+import construct
+
+import netcast as nc
+
+
+class Packet(nc.Model):
+    kind = nc.Char(signed=False)
+    sender = nc.String(null_terminated=True)
+    payload = nc.String(pascal=True)
+    sequence = nc.Int()
+
+
+def chunked(data, size):
+    return [data[idx:idx + size] for idx in range(0, len(data), size)]
+
+
+def retry(driver, chunks):
+    impl = Packet().impl(driver).impl()
+    loaded, buffer = [], b""
+    for chunk in chunks:
+        buffer += chunk
+        stream = io.BytesIO(buffer)
+        try:
+            state = impl.parse_stream(stream)
+        except construct.ConstructError:
+            continue
+        loaded.append(Packet().load_state(state))
+        buffer = buffer[stream.tell():]
+    return loaded
+
+
+def incremental(driver, chunks):
+    decoder = Packet.decoder(driver)
+    loaded = []
+    for chunk in chunks:
+        loaded.extend(decoder.feed(chunk))
+    return loaded
+
+
+def main(count=200, chunk_size=8):
+    packets = [
+        Packet(kind=1, sender="sender", payload="p" * 200, sequence=idx) for idx in range(count)
+    ]
+    chunks = chunked(b"".join(Packet.dump_many(packets, "construct")), chunk_size)
+    for name, func, driver in (
+        ("retry load()", retry, "construct"),
+        ("decoder", incremental, "construct"),
+        ("decoder", incremental, "codegen"),
+    ):
+        start = time.perf_counter()
+        loaded = func(driver, chunks)
+        elapsed = time.perf_counter() - start
+        assert len(loaded) == count
+        print(f"{name:<14}{driver:<11}{count / elapsed:>10,.0f} packets/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Time to define many models, with and without building them right away.
+
+Models are built on first use, so defining them costs only a scan
+of their class namespace.
+
+    PYTHONPATH=. python benchmarks/import_time.py
+"""
+import time
+
+import netcast as nc
+
+
+def define(count):
+    return [
+        type(
+            f"Model{idx}",
+            (nc.Model,),
+            {
+                "a_kind": nc.Char(signed=False),
+                "b_id": nc.Int(),
+                "c_value": nc.Double(),
+                "d_label": nc.String(padded=True, size=16),
+                "e_flags": nc.Short(signed=False, version_added=2),
+            },
+        )
+        for idx in range(count)
+    ]
+
+
+def per_second(func, count):
+    start = time.perf_counter()
+    func()
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    count = 500
+
+    def deferred():
+        define(count)
+
+    def built():
+        for model in define(count):
+            model.stack
+
+    print(f"{'models':<11}{'define/s':>12}{'build/s':>12}")
+    print(f"{count:<11}{per_second(deferred, count):>12,.0f}{per_second(built, count):>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Throughput of re-dumping a 50-field model with one field changed,
+which splices the field into the cached dump, versus dumping a fresh model.
+
+    PYTHONPATH=. python benchmarks/incremental_dump.py
+"""
+import time
+
+import netcast as nc
+
+
+Wide = type(
+    "Wide",
+    (nc.Model,),
+    {f"field_{idx:02d}": nc.Int() for idx in range(50)},
+)
+
+
+def per_second(func, count):
+    start = time.perf_counter()
+    func()
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    count = 5000
+    state = {f"field_{idx:02d}": idx for idx in range(50)}
+    print(f"{'driver':<11}{'full/s':>12}{'spliced/s':>12}")
+    for driver in ("construct", "struct", "codegen"):
+        wide = Wide(**state)
+        wide.dump(driver)
+
+        def spliced():
+            for idx in range(count):
+                wide.field_25 = idx
+                wide.dump(driver)
+
+        fresh = Wide(**state)
+
+        def full():
+            for idx in range(count):
+                fresh.field_25 = idx
+                fresh._dump(fresh.impl(driver), {})  # bypasses the dump cache
+
+        full_rate = per_second(full, count)
+        print(f"{driver:<11}{full_rate:>12,.0f}{per_second(spliced, count):>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Memory taken by model instances and whether they are freed once unreferenced.
+
+    PYTHONPATH=. python benchmarks/model_memory.py
+"""
+import gc
+import time
+import tracemalloc
+import weakref
+
+import netcast as nc
+
+
+class Inner(nc.Model):
+    a = nc.Int()
+    b = nc.Int()
+
+
+class Foo(nc.Model):
+    bar = nc.String()
+    baz = nc.Int()
+    biz = nc.Char(signed=False)
+    inner = Inner
+
+
+def main():
+    print(f"{'instances':>10}{'bytes/instance':>16}{'create/s':>12}{'alive after del':>17}")
+    for count in (1000, 10000, 100000):
+        gc.collect()
+        tracemalloc.start()
+        start = time.perf_counter()
+        foos = [Foo(bar="bar", baz=idx, biz=2, inner={"a": 1, "b": 2}) for idx in range(count)]
+        elapsed = time.perf_counter() - start
+        size = tracemalloc.get_traced_memory()[0]
+        refs = [weakref.ref(foo) for foo in foos]
+        del foos
+        alive = sum(ref() is not None for ref in refs)
+        tracemalloc.stop()
+        print(f"{count:>10}{size / count:>16,.0f}{count / elapsed:>12,.0f}{alive:>17}")
+
+
+if __name__ == "__main__":
+    main()
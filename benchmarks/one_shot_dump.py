@@ -0,0 +1,64 @@
+"""
+Throughput and memory of dumping many model instances once each,
+the common case that keeps no dump cache (see Model.dump()).
+
+    PYTHONPATH=. python benchmarks/one_shot_dump.py
+"""
+import gc
+import time
+import tracemalloc
+
+import netcast as nc
+
+
+Wide = type(
+    "Wide",
+    (nc.Model,),
+    {f"field_{idx:02d}": nc.Int() for idx in range(50)},
+)
+
+
+def per_second(func, count):
+    start = time.perf_counter()
+    func()
+    return count / (time.perf_counter() - start)
+
+
+def retained(instances, driver):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for instance in instances:
+        instance.dump(driver)
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / len(instances)
+
+
+def main():
+    count = 5000
+    state = {f"field_{idx:02d}": idx for idx in range(50)}
+    print(f"{'driver':<11}{'dump/s':>12}{'bypass/s':>12}{'bytes kept/instance':>21}")
+    for driver in ("construct", "struct", "codegen"):
+        Wide(**state).dump(driver)  # warm the serializer up
+        instances = [Wide(**state) for _ in range(count)]
+
+        def dump():
+            for instance in instances:
+                instance.dump(driver)
+
+        others = [Wide(**state) for _ in range(count)]
+
+        def bypass():
+            for instance in others:
+                instance._dump(instance.impl(driver), {})  # bypasses the dump cache
+
+        dump_rate = per_second(dump, count)
+        bypass_rate = per_second(bypass, count)
+        kept = retained([Wide(**state) for _ in range(count)], driver)
+        print(f"{driver:<11}{dump_rate:>12,.0f}{bypass_rate:>12,.0f}{kept:>21,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Stress test of large stacks: pushing, discarding and reprioritizing components
+at random, and choosing components after every change.
+
+Every change publishes a new snapshot of the components, so changes cost O(size).
+
+    PYTHONPATH=. python benchmarks/stack.py
+"""
+import random
+import time
+
+import netcast as nc
+from netcast.stack import VersionAwareStack
+
+
+def per_second(func, count):
+    start = time.perf_counter()
+    func()
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    rng = random.Random(0)
+    print(f"{'size':>7}{'push/s':>12}{'discard/s':>12}{'reprioritize/s':>16}"
+          f"{'choose/s':>12}")
+    for size in (100, 1000, 10000):
+        stack = VersionAwareStack()
+        components = [
+            nc.Int(name=f"f{idx}", priority=rng.randrange(size), version_added=idx % 7)
+            for idx in range(size)
+        ]
+        push = per_second(lambda: [stack.push(component) for component in components], size)
+        changes = min(size, 1000)
+        victims = rng.sample(components, changes)
+        reprioritize = per_second(
+            lambda: [stack.reprioritize(component, rng.randrange(size)) for component in victims],
+            changes,
+        )
+        discard = per_second(lambda: [stack.discard(component) for component in victims], changes)
+        rounds = 20
+        choose = per_second(
+            lambda: [
+                (stack.push(component), stack.choose_components({"version": 3}))
+                for component in victims[:rounds]
+            ],
+            rounds,
+        )
+        print(f"{size:>7}{push:>12,.0f}{discard:>12,.0f}{reprioritize:>16,.0f}{choose:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Dump/load throughput of the struct driver versus the construct driver.
+
+The README's Foo model has a null-terminated string, so the struct driver
+falls back to construct for it; FixedFoo is the same model with a fixed-size
+padded string, which the struct driver packs with a single struct.Struct.
+
+    PYTHONPATH=. python benchmarks/struct_driver.py
+"""
+import timeit
+
+import netcast as nc
+
+
+class Foo(nc.Model):
+    bar = nc.String()
+    baz = nc.Int()
+    biz = nc.Char(signed=False)
+    ext = nc.Int(version_added=2, default=20)
+
+
+class FixedFoo(nc.Model):
+    bar = nc.String(padded=True, size=8)
+    baz = nc.Int()
+    biz = nc.Char(signed=False)
+    ext = nc.Int(version_added=2, default=20)
+
+
+def measure(func, number):
+    return number / min(timeit.repeat(func, number=number, repeat=5))
+
+
+def main(number=2000):
+    print(f"{'model':<10}{'driver':<11}{'dumps/s':>12}{'loads/s':>12}")
+    for model in (Foo, FixedFoo):
+        instance = model(bar="bar", baz=1, biz=2, ext=3)
+        for driver in ("construct", "struct"):
+            dump = instance.dump(driver)
+            dumps = measure(lambda: instance.dump(driver), number)
+            loads = measure(lambda: model().load(driver, dump), number)
+            print(f"{model.__name__:<10}{driver:<11}{dumps:>12,.0f}{loads:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
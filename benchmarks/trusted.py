@@ -0,0 +1,37 @@
+"""
+Throughput of dumping and loading models in the trusted mode,
+which skips casting the objects to the proper types, versus the default mode.
+
+    PYTHONPATH=. python benchmarks/trusted.py
+"""
+import time
+
+import netcast as nc
+
+
+class Foo(nc.Model):
+    bar = nc.String()
+    baz = nc.Int()
+    biz = nc.Char(signed=False)
+
+
+def per_second(func, count):
+    start = time.perf_counter()
+    func()
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    count = 20000
+    print(f"{'driver':<11}{'mode':<9}{'dump/s':>12}{'load/s':>12}")
+    for driver in ("construct", "struct", "codegen"):
+        for mode, settings in (("default", {}), ("trusted", {"trusted": True})):
+            foo = Foo(bar="bar", baz=1, biz=2, **settings)
+            data = foo.dump(driver)
+            dump = per_second(lambda: [foo.dump(driver) for _ in range(count)], count)
+            load = per_second(lambda: [foo.load(driver, data) for _ in range(count)], count)
+            print(f"{driver:<11}{mode:<9}{dump:>12,.0f}{load:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
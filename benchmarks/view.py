@@ -0,0 +1,49 @@
+"""
+Throughput of filtering records by one field with lazy model views,
+versus loading every record into a model.
+
+    PYTHONPATH=. python benchmarks/view.py
+"""
+import time
+
+import netcast as nc
+
+
+class Record(nc.Model):
+    a_kind = nc.Char(signed=False)
+    b_id = nc.Int()
+    c_value = nc.Double()
+    d_label = nc.String(padded=True, size=16)
+    e_flags = nc.Short(signed=False)
+
+
+def per_second(func, count):
+    start = time.perf_counter()
+    func()
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    count = 20000
+    print(f"{'driver':<11}{'load/s':>12}{'view/s':>12}")
+    for driver in ("construct", "struct", "codegen"):
+        record = Record(a_kind=1, b_id=2, c_value=3.0, d_label="label", e_flags=4)
+        data = record.dump(driver)
+        size = Record.static_size(driver)
+        buffer = memoryview(data * count)
+
+        def load():
+            for offset in range(0, len(buffer), size):
+                if Record().load(driver, buffer[offset:offset + size]).e_flags == 4:
+                    pass
+
+        def view():
+            for offset in range(0, len(buffer), size):
+                if Record.view(buffer, offset, driver).e_flags == 4:
+                    pass
+
+        print(f"{driver:<11}{per_second(load, count):>12,.0f}{per_second(view, count):>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
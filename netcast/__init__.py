@@ -6,4 +6,10 @@ from .serializer import *
 
 from .common import *
 
-from . import drivers, common, tools
+from . import common
+from .tools import _lazy
+
+# Subpackages imported on first access, see __getattr__()
+_lazy_submodules = ("drivers", "extras", "tools")
+
+__getattr__ = _lazy.lazy_getattr(__name__, _lazy_submodules)
@@ -96,10 +96,14 @@ class Object(Serializer):
     """Base class for all objects."""
 
     def __class_getitem__(cls, repeat):
-        return __import__("netcast.model").repeated(cls, repeat=repeat)
+        from netcast.model import repeated
+
+        return repeated(cls, repeat=repeat)
 
     def __getitem__(self, repeat):
-        return __import__("netcast.model").repeated(type(self), name=self.name, repeat=repeat)
+        from netcast.model import repeated
+
+        return repeated(self, name=self.name, repeat=repeat)
 
 
 class Entity(Object):
@@ -6,12 +6,13 @@ import inspect
 import itertools
 import sys
 import typing
-from typing import Any, ClassVar, Type
+from typing import Any, Callable, ClassVar, Hashable, Type
 
 from netcast import common
+from netcast.constants import MISSING
 from netcast.exceptions import NetcastError
 from netcast.serializer import Serializer, SettingsT, Interface
-from netcast.tools.collections import IDLookupDictionary
+from netcast.tools.collections import CacheInfo, LRUCache, Settings
 
 if typing.TYPE_CHECKING:
     from netcast.common import ModelSerializer
@@ -24,6 +25,7 @@ __all__ = (
     "driver_serializer",
     "driver_interface",
     "get_driver",
+    "repeated_element",
 )
 
 IMPLEMENTS_FIELD = "implements"
@@ -31,7 +33,7 @@ common_paths = ["netcast.drivers.%(driver_name)s"]
 
 
 class DriverMeta(type):
-    _memo: IDLookupDictionary[Model, Serializer]
+    _memo: LRUCache
     _map: dict[Type[Serializer], Type[Serializer]]
 
     default_model_serializer = None
@@ -50,9 +52,7 @@ class DriverMeta(type):
         components: tuple[Any, ...] = (),
         settings: SettingsT = None,
     ) -> ModelSerializer:
-        if settings is None:
-            settings = {}
-        settings = {**origin.settings, **settings}
+        settings = Settings(origin.settings).layer(settings)
         return serializer(*components, **settings)
 
     def lookup_model_serializer(cls, model: Model, /, **settings) -> Serializer:
@@ -85,6 +85,16 @@ class DriverMeta(type):
         )
         return serializer
 
+    def memoize(cls, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """
+        Return the implementation memoized under the key,
+        building and memoizing it with the factory if missing.
+        """
+        impl = cls._memo.get(key, MISSING)
+        if impl is MISSING:
+            impl = cls._memo[key] = factory()
+        return impl
+
     def lookup_type(cls, serializer_type: type[Serializer]):
         try:
             return cls._map[serializer_type]
@@ -95,6 +105,8 @@ class DriverMeta(type):
         alias = getattr(common, item, None)
         if alias is None or (isinstance(alias, type) and not issubclass(alias, Serializer)):
             raise AttributeError(item)
+        if isinstance(alias, Serializer):  # e.g. Int8, an Integer instance
+            return alias
         return object.__getattribute__(cls, alias.__name__)
 
     def __call__(
@@ -113,6 +125,7 @@ class Driver(metaclass=DriverMeta):
     registry: dict[str, Type[Driver]] = {}
     _map: ClassVar[dict[Type[Serializer], Type[Serializer]]]
     DEBUG: ClassVar[bool]
+    memo_size: ClassVar[int | None] = 1024
 
     def __init_subclass__(cls, driver_name: str | None = None, config: bool = False):
         if config:
@@ -126,7 +139,7 @@ class Driver(metaclass=DriverMeta):
 
         cls.name = driver_name
         cls._map = {}
-        cls._memo = IDLookupDictionary()
+        cls._memo = LRUCache(cls.memo_size)
         cls.init_model_serializer = functools.singledispatchmethod(
             cls._init_model_serializer
         )
@@ -154,6 +167,16 @@ class Driver(metaclass=DriverMeta):
             setattr(cls, name, impl_counterpart)
         return impl_counterpart
 
+    @classmethod
+    def clear_memo(cls):
+        """Forget all the implementations memoized by this driver."""
+        cls._memo.clear()
+
+    @classmethod
+    def memo_info(cls) -> CacheInfo:
+        """Return the statistics of this driver's implementation memo."""
+        return cls._memo.info()
+
     @classmethod
     def init_for(cls, *types: type[Serializer]):
         def _register(init):
@@ -205,6 +228,32 @@ def driver_interface(
     )
 
 
+def repeated_element(components: tuple[Any, ...]) -> Any:
+    """
+    Return the element of an array serializer given its components, which is either
+    the only component or the first one of the same components repeated,
+    see netcast.model.repeated().
+    """
+    if not components:
+        raise ValueError("an array takes exactly 1 argument")
+    element, *others = components
+    if isinstance(element, Serializer):
+        signature = type(element), _repeated_settings(element)
+        if all(
+            isinstance(other, Serializer)
+            and (type(other), _repeated_settings(other)) == signature
+            for other in others
+        ):
+            return element
+    elif not others:
+        return element
+    raise ValueError("an array takes exactly 1 argument or repeated components")
+
+
+def _repeated_settings(serializer: Serializer) -> dict[str, Any]:
+    return {key: value for key, value in serializer.settings.items() if key != "priority"}
+
+
 def load_driver(driver_name: str, paths: list[str] | None = None):
     import importlib
 
@@ -0,0 +1,6 @@
+from netcast.tools import _lazy
+
+# Submodules imported on first access, see __getattr__()
+_lazy_submodules = ("codegen", "construct", "construct_cache", "struct")
+
+__getattr__ = _lazy.lazy_getattr(__name__, _lazy_submodules)
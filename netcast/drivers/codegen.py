@@ -0,0 +1,940 @@
+"""
+A driver that generates specialized Python code for every model layout.
+
+For each built model serializer (which is bound to a model, its chosen components
+and settings), the driver walks the layout once, emits the source code of a dedicated
+`dump(state) -> bytes` and `load(buf, offset=0) -> dict` pair (plus `load_stream(stream)`
+for stream readers) and executes it.
+The generated functions are cached on the serializer, so on the hot path there is
+neither per-field dispatch nor settings merging.  Consecutive fixed-size fields are
+packed and unpacked with a single precompiled struct.Struct.
+"""
+from __future__ import annotations  # Python 3.8
+
+import collections.abc
+import contextlib
+import itertools
+import linecache
+import re
+import struct
+import sys
+from typing import Any, Callable, Generator, NamedTuple
+
+import netcast as nc
+from netcast.tools.collections import AttributeDict, Settings
+
+
+DRIVER_NAME = "codegen"
+
+
+class CodeGen:
+    """Python source code builder."""
+
+    def __init__(self):
+        self.lines = []
+        self.namespace = {
+            "_context": AttributeDict,
+            "_values": _values,
+            "read_exactly": _read_exactly,
+        }
+        self._indentation = 0
+        self._counter = itertools.count()
+        self.incremental = False
+        self.into = False  # whether the generated dumper writes into a buffer
+
+    def write(self, data: str):
+        """Emit code writing the bytes of an expression in the generated dumper."""
+        if not self.into:
+            self(f"append({data})")
+            return
+        chunk = self.var("c")
+        self(f"{chunk} = {data}")
+        self(f"end = offset + len({chunk})")
+        self("if end > len(view): raise ValueError('buffer too small')")
+        self(f"view[offset:end] = {chunk}")
+        self("offset = end")
+
+    def write_packed(self, packer: str, args: str):
+        """Emit code writing the arguments packed by a bound struct.Struct."""
+        if self.into:
+            self(f"{packer}.pack_into(view, offset, {args})")
+            self(f"offset += {packer}.size")
+        else:
+            self(f"append({packer}.pack({args}))")
+
+    def read(self, size: str) -> str:
+        """Return an expression reading exactly `size` bytes in the generated loader."""
+        if self.incremental:
+            return f"(yield {size})"
+        return f"read_exactly(stream, {size})"
+
+    def read_until(self, term: bytes) -> str:
+        """Return an expression reading the bytes up to an aligned terminator."""
+        if self.incremental:
+            return f"(yield {term!r})"
+        return f"stream.read_until({term!r})"
+
+    def read_rest(self) -> str:
+        """Return an expression reading all the remaining bytes."""
+        if self.incremental:
+            raise NotImplementedError("the rest of a stream can't be read incrementally")
+        return "stream.read()"
+
+    def var(self, prefix: str = "v") -> str:
+        """Allocate a new local variable name."""
+        return f"{prefix}{next(self._counter)}"
+
+    def bind(self, obj: Any, prefix: str = "_o") -> str:
+        """Make an object accessible from the generated code under a new global name."""
+        name = self.var(prefix)
+        self.namespace[name] = obj
+        return name
+
+    def __call__(self, line: str):
+        self.lines.append("    " * self._indentation + line)
+
+    @contextlib.contextmanager
+    def block(self, header: str):
+        self(header)
+        self._indentation += 1
+        try:
+            yield
+        finally:
+            self._indentation -= 1
+
+    @property
+    def source(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+    def execute(self, filename: str) -> dict[str, Any]:
+        source = self.source
+        # Make tracebacks show the generated lines
+        linecache.cache[filename] = (len(source), None, source.splitlines(True), filename)
+        namespace = self.namespace.copy()
+        exec(compile(source, filename, "exec"), namespace)  # pylint: disable=W0122
+        return namespace
+
+
+class Compiled(NamedTuple):
+    dump: Callable[[Any], bytes]
+    dump_into: Callable[..., int]
+    size: Callable[[Any], int]
+    load: Callable[..., Any]
+    load_from: Callable[..., tuple[Any, int]]
+    load_stream: Callable[[Any], Any]
+    load_incremental: Callable[[], Generator] | None
+    source: str
+
+
+def _values(obj):
+    if isinstance(obj, collections.abc.Mapping):
+        return list(obj.values())
+    return obj
+
+
+def _index(buf, term, offset):
+    try:
+        return buf.index(term, offset)
+    except AttributeError:  # mmap or memoryview
+        pass
+    find = getattr(buf, "find", None)
+    if find is not None:
+        end = find(term, offset)
+    else:
+        match = re.compile(re.escape(term)).search(buf, offset)
+        end = -1 if match is None else match.start()
+    if end < 0:
+        raise ValueError("missing string terminator")
+    return end
+
+
+def _find_terminator(buf, term, offset):
+    unit = len(term)
+    end = offset
+    while buf[end:end + unit] != term:
+        if end >= len(buf):
+            raise ValueError("missing string terminator")
+        end += unit
+    return end
+
+
+def _strip_padding(data, pad):
+    unit = len(pad)
+    end = len(data)
+    while end >= unit and data[end - unit:end] == pad:
+        end -= unit
+    return data[:end]
+
+
+def _read_exactly(stream, size):
+    data = stream.read(size)
+    if len(data) != size:
+        raise EOFError(f"expected {size} bytes, got {len(data)}")
+    return data
+
+
+def _byte_order(settings):
+    if settings.get("big_endian"):
+        return ">"
+    if settings.get("little_endian", True):
+        return "<"
+    return "="
+
+
+class Node:
+    """
+    A piece of a model layout that emits its own dumping and loading code.
+
+    Nodes with a `format` can be packed together with their neighbours by one struct.
+    """
+
+    format: str | None = None
+    byte_order: str | None = None
+
+    def __init__(self, name: str | None):
+        self.name = name
+
+    def pack(self, code: CodeGen, value: str) -> str:
+        """Return an expression converting the value into a packable object."""
+        return value
+
+    def unpack(self, code: CodeGen, raw: str) -> str:
+        """Return an expression converting the unpacked object into a value."""
+        return raw
+
+    def static_size(self) -> int | None:
+        """Return the size of every dump of this node, or None if it isn't fixed."""
+        if self.format is None:
+            return None
+        return struct.calcsize("<" + self.format)
+
+    def emit_size(self, code: CodeGen, value: str, context: str):
+        """Emit code adding the size of the value's dump to `size`."""
+        code(f"size += {self.static_size()}")
+
+    def emit_dump(self, code: CodeGen, value: str, context: str):
+        packer = code.bind(struct.Struct((self.byte_order or "<") + self.format), "_s")
+        code.write_packed(packer, self.pack(code, value))
+
+    def emit_load(self, code: CodeGen, target: str, context: str):
+        packer = code.bind(struct.Struct((self.byte_order or "<") + self.format), "_s")
+        raw = code.var("t")
+        code(f"({raw},) = {packer}.unpack_from(buf, offset)")
+        code(f"offset += {packer}.size")
+        code(f"{target} = {self.unpack(code, raw)}")
+
+    def emit_read(self, code: CodeGen, target: str, context: str):
+        """Emit code loading the value from a stream reader instead of a buffer."""
+        packer = code.bind(struct.Struct((self.byte_order or "<") + self.format), "_s")
+        raw = code.var("t")
+        code(f"({raw},) = {packer}.unpack({code.read(f'{packer}.size')})")
+        code(f"{target} = {self.unpack(code, raw)}")
+
+
+class Primitive(Node):
+    def __init__(self, name, fmt, byte_order=None):
+        super().__init__(name)
+        self.format = fmt
+        self.byte_order = byte_order
+
+
+class BigInteger(Node):
+    """An integer of a size that struct can't handle, e.g. 24 or 128 bits."""
+
+    def __init__(self, name, size, byte_order, signed):
+        super().__init__(name)
+        self.size = size
+        self.order = {"<": "little", ">": "big"}.get(byte_order, sys.byteorder)
+        self.signed = signed
+
+    def static_size(self):
+        return self.size
+
+    def emit_dump(self, code, value, context):
+        code.write(f"({value}).to_bytes({self.size}, {self.order!r}, signed={self.signed})")
+
+    def emit_load(self, code, target, context):
+        code(f"if len(buf) < offset + {self.size}: raise ValueError('buffer too short')")
+        code(
+            f"{target} = int.from_bytes(buf[offset:offset + {self.size}], "
+            f"{self.order!r}, signed={self.signed})"
+        )
+        code(f"offset += {self.size}")
+
+    def emit_read(self, code, target, context):
+        code(
+            f"{target} = int.from_bytes({code.read(self.size)}, "
+            f"{self.order!r}, signed={self.signed})"
+        )
+
+
+class PaddedString(Node):
+    def __init__(self, name, size, encoding):
+        super().__init__(name)
+        self.size = size
+        self.encoding = encoding
+        self.format = f"{size}s"
+
+    def pack(self, code, value):
+        encode = code.bind(self._encode, "_encode")
+        return f"{encode}({value})"
+
+    def unpack(self, code, raw):
+        strip = code.bind(_strip_padding, "_strip")
+        pad = bytes(len("\x00".encode(self.encoding)))
+        return f"str({strip}({raw}, {pad!r}), {self.encoding!r})"
+
+    def _encode(self, obj):
+        data = obj.encode(self.encoding)
+        if len(data) > self.size:
+            raise ValueError(f"string is longer than {self.size} bytes")
+        return data
+
+
+class CString(Node):
+    def __init__(self, name, encoding):
+        super().__init__(name)
+        self.encoding = encoding
+        self.term = bytes(len("\x00".encode(encoding)))
+
+    def emit_size(self, code, value, context):
+        code(f"size += len(({value}).encode({self.encoding!r})) + {len(self.term)}")
+
+    def emit_dump(self, code, value, context):
+        code.write(f"({value}).encode({self.encoding!r}) + {self.term!r}")
+
+    def emit_load(self, code, target, context):
+        end = code.var("e")
+        if len(self.term) == 1:
+            code(f"{end} = {code.bind(_index, '_index')}(buf, {self.term!r}, offset)")
+        else:
+            find = code.bind(_find_terminator, "_find")
+            code(f"{end} = {find}(buf, {self.term!r}, offset)")
+        code(f"{target} = str(buf[offset:{end}], {self.encoding!r})")
+        code(f"offset = {end} + {len(self.term)}")
+
+    def emit_read(self, code, target, context):
+        code(f"{target} = str({code.read_until(self.term)}, {self.encoding!r})")
+
+
+class PascalString(Node):
+    def __init__(self, name, prefix: Node, encoding):
+        super().__init__(name)
+        self.prefix = prefix
+        self.encoding = encoding
+
+    def emit_size(self, code, value, context):
+        data = code.var("d")
+        code(f"{data} = len(({value}).encode({self.encoding!r}))")
+        self.prefix.emit_size(code, data, context)
+        code(f"size += {data}")
+
+    def emit_dump(self, code, value, context):
+        data = code.var("d")
+        code(f"{data} = ({value}).encode({self.encoding!r})")
+        self.prefix.emit_dump(code, f"len({data})", context)
+        code.write(data)
+
+    def emit_load(self, code, target, context):
+        length = code.var("n")
+        self.prefix.emit_load(code, length, context)
+        code(f"if len(buf) < offset + {length}: raise ValueError('buffer too short')")
+        code(f"{target} = str(buf[offset:offset + {length}], {self.encoding!r})")
+        code(f"offset += {length}")
+
+    def emit_read(self, code, target, context):
+        length = code.var("n")
+        self.prefix.emit_read(code, length, context)
+        code(f"{target} = str({code.read(length)}, {self.encoding!r})")
+
+
+class GreedyString(Node):
+    def __init__(self, name, encoding):
+        super().__init__(name)
+        self.encoding = encoding
+
+    def emit_size(self, code, value, context):
+        code(f"size += len(({value}).encode({self.encoding!r}))")
+
+    def emit_dump(self, code, value, context):
+        code.write(f"({value}).encode({self.encoding!r})")
+
+    def emit_load(self, code, target, context):
+        code(f"{target} = str(buf[offset:], {self.encoding!r})")
+        code("offset = len(buf)")
+
+    def emit_read(self, code, target, context):
+        code(f"{target} = str({code.read_rest()}, {self.encoding!r})")
+
+
+class ArrayNode(Node):
+    def __init__(self, name, element: Node, count: int):
+        super().__init__(name)
+        self.element = element
+        self.count = count
+
+    def _packer(self, code):
+        element = self.element
+        fmt = (element.byte_order or "<") + element.format * self.count
+        return code.bind(struct.Struct(fmt), "_s")
+
+    def static_size(self):
+        size = self.element.static_size()
+        if size is None:
+            return None
+        return size * self.count
+
+    def emit_size(self, code, value, context):
+        if self.static_size() is not None:
+            super().emit_size(code, value, context)
+            return
+        item = code.var("i")
+        with code.block(f"for {item} in _values({value}):"):
+            self.element.emit_size(code, item, context)
+
+    def emit_dump(self, code, value, context):
+        items = code.var("a")
+        code(f"{items} = _values({value})")
+        if self.element.format is not None:
+            item = code.var("i")
+            packed = self.element.pack(code, item)
+            code.write_packed(self._packer(code), f"*[{packed} for {item} in {items}]")
+            return
+        code(f"if len({items}) != {self.count}: raise ValueError('expected {self.count} items')")
+        item = code.var("i")
+        with code.block(f"for {item} in {items}:"):
+            self.element.emit_dump(code, item, context)
+
+    def emit_load(self, code, target, context):
+        if self.element.format is not None:
+            packer = self._packer(code)
+            item = code.var("i")
+            unpacked = self.element.unpack(code, item)
+            code(f"{target} = [{unpacked} for {item} in {packer}.unpack_from(buf, offset)]")
+            code(f"offset += {packer}.size")
+            return
+        items, item = code.var("a"), code.var("i")
+        code(f"{items} = []")
+        with code.block(f"for _ in range({self.count}):"):
+            self.element.emit_load(code, item, context)
+            code(f"{items}.append({item})")
+        code(f"{target} = {items}")
+
+    def emit_read(self, code, target, context):
+        if self.element.format is not None:
+            packer = self._packer(code)
+            item = code.var("i")
+            unpacked = self.element.unpack(code, item)
+            code(
+                f"{target} = [{unpacked} for {item} in "
+                f"{packer}.unpack({code.read(f'{packer}.size')})]"
+            )
+            return
+        items, item = code.var("a"), code.var("i")
+        code(f"{items} = []")
+        with code.block(f"for _ in range({self.count}):"):
+            self.element.emit_read(code, item, context)
+            code(f"{items}.append({item})")
+        code(f"{target} = {items}")
+
+
+class SwitchNode(Node):
+    def __init__(self, name, func, cases: dict[Any, Node], default: Node | None = None):
+        super().__init__(name)
+        self.func = func
+        self.cases = cases
+        self.default = default
+
+    def _emit(self, code, context, emit_case, emit_default):
+        key = code.var("k")
+        code(f"{key} = {code.bind(self.func, '_func')}(_context({context}))")
+        keyword = "if"
+        for case_key, node in self.cases.items():
+            with code.block(f"{keyword} {key} == {code.bind(case_key, '_key')}:"):
+                emit_case(node)
+            keyword = "elif"
+        if keyword == "if":
+            emit_default()
+        else:
+            with code.block("else:"):
+                emit_default()
+
+    def static_size(self):
+        nodes = list(self.cases.values())
+        if self.default is not None:
+            nodes.append(self.default)
+        sizes = {node.static_size() for node in nodes}
+        if self.default is None:
+            sizes.add(0)
+        if len(sizes) == 1:
+            return sizes.pop()
+        return None
+
+    def emit_size(self, code, value, context):
+        if self.static_size() is not None:
+            super().emit_size(code, value, context)
+            return
+
+        def emit_default():
+            if self.default is None:
+                code("pass")
+            else:
+                self.default.emit_size(code, value, context)
+
+        self._emit(code, context, lambda node: node.emit_size(code, value, context), emit_default)
+
+    def emit_dump(self, code, value, context):
+        def emit_default():
+            if self.default is None:
+                code("pass")
+            else:
+                self.default.emit_dump(code, value, context)
+
+        self._emit(code, context, lambda node: node.emit_dump(code, value, context), emit_default)
+
+    def emit_load(self, code, target, context):
+        def emit_default():
+            if self.default is None:
+                code(f"{target} = None")
+            else:
+                self.default.emit_load(code, target, context)
+
+        self._emit(
+            code, context, lambda node: node.emit_load(code, target, context), emit_default
+        )
+
+    def emit_read(self, code, target, context):
+        def emit_default():
+            if self.default is None:
+                code(f"{target} = None")
+            else:
+                self.default.emit_read(code, target, context)
+
+        self._emit(
+            code, context, lambda node: node.emit_read(code, target, context), emit_default
+        )
+
+
+class ModelNode(Node):
+    def __init__(self, name, members: tuple[Node, ...]):
+        super().__init__(name)
+        self.members = members
+
+    def _runs(self):
+        """Group consecutive members that can be packed with one struct."""
+        run, byte_order = [], None
+        for member in self.members:
+            if member.format is None:
+                if run:
+                    yield run, byte_order
+                    run, byte_order = [], None
+                yield [member], None
+                continue
+            if run and None not in (member.byte_order, byte_order) and (
+                member.byte_order != byte_order
+            ):
+                yield run, byte_order
+                run, byte_order = [], None
+            run.append(member)
+            byte_order = byte_order or member.byte_order
+        if run:
+            yield run, byte_order
+
+    def static_size(self):
+        sizes = [member.static_size() for member in self.members]
+        if None in sizes:
+            return None
+        return sum(sizes)
+
+    def emit_size(self, code, value, context):
+        state = code.var("s")
+        code(f"{state} = {value}")
+        fixed = 0
+        for member in self.members:
+            size = member.static_size()
+            if size is None:
+                member.emit_size(code, f"{state}[{member.name!r}]", state)
+            else:
+                fixed += size
+        if fixed:
+            code(f"size += {fixed}")
+
+    def emit_dump(self, code, value, context):
+        state = code.var("s")
+        code(f"{state} = {value}")
+        for run, byte_order in self._runs():
+            if run[0].format is None:
+                run[0].emit_dump(code, f"{state}[{run[0].name!r}]", state)
+                continue
+            fmt = (byte_order or "<") + "".join(member.format for member in run)
+            packer = code.bind(struct.Struct(fmt), "_s")
+            args = ", ".join(
+                member.pack(code, f"{state}[{member.name!r}]") for member in run
+            )
+            code.write_packed(packer, args)
+
+    def emit_load(self, code, target, context):
+        result = code.var("r")
+        code(f"{result} = {{}}")
+        for run, byte_order in self._runs():
+            if run[0].format is None:
+                run[0].emit_load(code, f"{result}[{run[0].name!r}]", result)
+                continue
+            fmt = (byte_order or "<") + "".join(member.format for member in run)
+            packer = code.bind(struct.Struct(fmt), "_s")
+            raws = [code.var("t") for _ in run]
+            code(f"({', '.join(raws)},) = {packer}.unpack_from(buf, offset)")
+            code(f"offset += {packer}.size")
+            for member, raw in zip(run, raws):
+                code(f"{result}[{member.name!r}] = {member.unpack(code, raw)}")
+        code(f"{target} = {result}")
+
+    def emit_read(self, code, target, context):
+        result = code.var("r")
+        code(f"{result} = {{}}")
+        for run, byte_order in self._runs():
+            if run[0].format is None:
+                run[0].emit_read(code, f"{result}[{run[0].name!r}]", result)
+                continue
+            fmt = (byte_order or "<") + "".join(member.format for member in run)
+            packer = code.bind(struct.Struct(fmt), "_s")
+            raws = [code.var("t") for _ in run]
+            code(
+                f"({', '.join(raws)},) = "
+                f"{packer}.unpack({code.read(f'{packer}.size')})"
+            )
+            for member, raw in zip(run, raws):
+                code(f"{result}[{member.name!r}] = {member.unpack(code, raw)}")
+        code(f"{target} = {result}")
+
+
+def generate(node: Node, filename: str = "<netcast-codegen>") -> Compiled:
+    """Generate and execute the dumping and loading functions of a node."""
+    code = CodeGen()
+    with code.block("def dump(state):"):
+        code("parts = []")
+        code("append = parts.append")
+        node.emit_dump(code, "state", "state")
+        code("return b''.join(parts)")
+    code("")
+    code.into = True
+    with code.block("def dump_into(state, buf, offset=0):"):
+        code("start = offset")
+        with code.block("with memoryview(buf) as view:"):
+            node.emit_dump(code, "state", "state")
+        code("return offset - start")
+    code.into = False
+    code("")
+    with code.block("def size(state):"):
+        code("size = 0")
+        node.emit_size(code, "state", "state")
+        code("return size")
+    code("")
+    with code.block("def load_from(buf, offset=0):"):
+        node.emit_load(code, "result", "{}")
+        code("return result, offset")
+    code("")
+    with code.block("def load(buf, offset=0):"):
+        code("return load_from(buf, offset)[0]")
+    code("")
+    with code.block("def load_stream(stream):"):
+        node.emit_read(code, "result", "{}")
+        code("return result")
+    code("")
+    # A generator loader for netcast.tools.streams.Decoder, if the layout allows it
+    lines = len(code.lines)
+    code.incremental = True
+    try:
+        with code.block("def load_incremental():"):
+            node.emit_read(code, "result", "{}")
+            code("return result")
+    except NotImplementedError:
+        del code.lines[lines:]
+        code("load_incremental = None")
+    namespace = code.execute(filename)
+    return Compiled(
+        namespace["dump"],
+        namespace["dump_into"],
+        namespace["size"],
+        namespace["load"],
+        namespace["load_from"],
+        namespace["load_stream"],
+        namespace["load_incremental"],
+        code.source,
+    )
+
+
+class Interface(nc.Interface):
+    """
+    Base class of the codegen driver interfaces.
+
+    Settings are baked into the generated code when an interface is built;
+    model serializers are cached per settings, see :func:`netcast.model.Model.impl`.
+    """
+
+    def __init__(self, **settings):
+        self._compiled = None
+        super().__init__(**settings)
+
+    def _invalidate(self):
+        self._compiled = None
+
+    def impl(self, driver=None, settings=None, final=False):
+        impl = self._impl
+        if impl is NotImplemented:
+            raise NotImplementedError("missing requested serializer implementation")
+        return impl
+
+    @property
+    def compiled(self) -> Compiled:
+        compiled = self._compiled
+        if compiled is None:
+            filename = f"<netcast-codegen {type(self).__name__} {self.name!r}>"
+            compiled = self._compiled = generate(self.impl(), filename)
+        return compiled
+
+    @property
+    def driver(self):
+        return Driver
+
+    def dump(self, obj, settings=None, /, **kwargs):
+        try:
+            return self.compiled.dump(obj)
+        except Exception as exc:
+            raise nc.NetcastError(f"dumping failed: {exc}") from exc
+
+    def dump_into(self, obj, buffer, offset=0, settings=None, /, **kwargs):
+        try:
+            return self.compiled.dump_into(obj, buffer, offset)
+        except Exception as exc:
+            raise nc.NetcastError(f"dumping failed: {exc}") from exc
+
+    def _static_size(self, settings):
+        return self.impl().static_size()
+
+    def encoded_size(self, obj, settings=None, /, **kwargs):
+        try:
+            return self.compiled.size(obj)
+        except Exception as exc:
+            raise nc.NetcastError(f"sizing failed: {exc}") from exc
+
+    def load_from(self, buffer, offset=0, settings=None, /, **kwargs):
+        try:
+            obj, end = self.compiled.load_from(buffer, offset)
+        except Exception as exc:
+            raise nc.NetcastError(f"loading failed: {exc}") from exc
+        if self.load_type is not None and not self.trusted:
+            if not isinstance(obj, self.load_type):
+                obj = self._cast(obj, "load", self.settings)
+        return obj, end - offset
+
+    def load(self, obj, settings=None, /, **kwargs):
+        try:
+            obj = self.compiled.load(obj)
+        except Exception as exc:
+            raise nc.NetcastError(f"loading failed: {exc}") from exc
+        if self.load_type is not None and not self.trusted:
+            if not isinstance(obj, self.load_type):
+                obj = self._cast(obj, "load", self.settings)
+        return obj
+
+    def iter_load(self, stream, settings=None, /, **kwargs):
+        load_stream = self.compiled.load_stream
+        load_type = None if self.trusted else self.load_type
+        while not stream.at_eof():
+            try:
+                obj = load_stream(stream)
+            except Exception as exc:
+                raise nc.NetcastError(f"loading failed: {exc}") from exc
+            if load_type is not None and not isinstance(obj, load_type):
+                obj = self._cast(obj, "load", self.settings)
+            yield obj
+
+    def incremental_loader(self, settings=None, /, **kwargs):
+        load_incremental = self.compiled.load_incremental
+        if load_incremental is None:
+            raise NotImplementedError(f"{self.name!r} layout can't be loaded incrementally")
+        load_type = None if self.trusted else self.load_type
+        if load_type is None:
+            return load_incremental
+
+        def loader():
+            obj = yield from load_incremental()
+            if not isinstance(obj, load_type):
+                obj = self._cast(obj, "load", self.settings)
+            return obj
+
+        return loader
+
+    def dump_many(self, objs, settings=None, /, **kwargs):
+        try:
+            return list(map(self.compiled.dump, objs))
+        except Exception as exc:
+            raise nc.NetcastError(f"dumping failed: {exc}") from exc
+
+    def load_many(self, objs, settings=None, /, **kwargs):
+        try:
+            loads = list(map(self.compiled.load, objs))
+        except Exception as exc:
+            raise nc.NetcastError(f"loading failed: {exc}") from exc
+        load_type = None if self.trusted else self.load_type
+        if load_type is not None and loads and not isinstance(loads[0], load_type):
+            loads = [self._cast(obj, "load", self.settings) for obj in loads]
+        return loads
+
+
+class Struct(Interface):
+    implements = nc.ModelSerializer
+
+    def __init__(self, *fields, **settings):
+        self.fields = fields
+        super().__init__(**settings)
+
+    def _configure(self):
+        self._impl = ModelNode(self.name, self.get_impls(self.fields, self.settings))
+
+
+class Array(Interface):
+    implements = nc.Array
+
+    def __init__(self, data_type, /, **settings):
+        self.size = settings.setdefault("size")
+        if not isinstance(self.size, int):
+            raise NotImplementedError("codegen supports only arrays of a fixed size")
+        self.data_type = data_type
+        super().__init__(**settings)
+
+    def _configure(self):
+        element = self.get_impl(self.data_type, **self.settings)
+        self._impl = ArrayNode(self.name, element, self.size)
+
+
+class Driver(nc.Driver):
+    StructInterface = nc.driver_interface(Struct)
+    ArrayInterface = nc.driver_interface(Array, default=nc.List)
+
+    ListArray = ArrayInterface(nc.List)
+    TupleArray = ArrayInterface(nc.Tuple)
+    Array = ListArray
+
+    DictStruct = StructInterface(nc.Dict)
+    MappingProxyStruct = StructInterface(nc.MappingProxy)
+    SimpleNamespaceStruct = StructInterface(nc.SimpleNamespace)
+    Struct = DictStruct
+
+    default_model_serializer = Struct
+
+
+@Driver.impl
+class Integer(Interface):
+    implements = nc.Integer
+    format_codes = {8: "b", 16: "h", 32: "i", 64: "q"}
+
+    def __init__(self, **settings):
+        self.signed = settings.setdefault("signed", True)
+        self.bit_size = settings.get("bit_size", 32)
+        super().__init__(**settings)
+
+    def _configure(self, *, signed):
+        if self.bit_size % 8:
+            raise NotImplementedError("codegen supports only byte-aligned integers")
+        byte_order = _byte_order(self.settings)
+        code = self.format_codes.get(self.bit_size)
+        if code is None:
+            self._impl = BigInteger(self.name, self.bit_size // 8, byte_order, signed)
+            return
+        if not signed:
+            code = code.upper()
+        self._impl = Primitive(self.name, code, None if self.bit_size == 8 else byte_order)
+
+
+@Driver.impl
+class FloatingPoint(Interface):
+    implements = nc.FloatingPoint
+    format_codes = {16: "e", 32: "f", 64: "d"}
+
+    def __init__(self, **settings):
+        self.bit_size = settings.get("bit_size", 32)
+        super().__init__(**settings)
+
+    def _configure(self):
+        code = self.format_codes.get(self.bit_size)
+        if code is None:
+            raise NotImplementedError(f"codegen does not support {self.bit_size}-bit floats")
+        self._impl = Primitive(self.name, code, _byte_order(self.settings))
+
+
+@Driver.impl
+class String(Interface):
+    implements = nc.String
+    default_encoding = "ASCII"
+
+    def __init__(self, **settings):
+        self.null_terminated = settings.setdefault("null_terminated")
+        self.encoding = settings.setdefault("encoding", self.default_encoding)
+        self.pascal = settings.setdefault("pascal")
+        self.greedy = settings.setdefault("greedy")
+        self.padded = settings.setdefault("padded", 0)
+        self.size = settings.setdefault("size")
+
+        if not any((self.null_terminated, self.pascal, self.greedy, self.padded)):
+            self.null_terminated = settings["null_terminated"] = True
+
+        super().__init__(**settings)
+
+    def _configure(self, *, size, null_terminated, pascal, greedy, padded, encoding):
+        encoding = encoding.casefold()
+
+        if null_terminated:
+            impl = CString(self.name, encoding)
+
+        elif pascal:
+            if size is None:
+                prefix = Primitive(None, "B")
+            else:
+                prefix = self.get_impl(size)
+            if prefix.format is None:
+                raise NotImplementedError("pascal string prefix must be a fixed-size number")
+            impl = PascalString(self.name, prefix, encoding)
+
+        elif padded:
+            if size is None:
+                raise ValueError("undefined size for a fixed-size string serializer")
+            impl = PaddedString(self.name, size, encoding)
+
+        elif greedy:
+            impl = GreedyString(self.name, encoding)
+
+        else:
+            raise ValueError("invalid string serializer configuration")
+
+        self._impl = impl
+
+
+@Driver.impl
+class Switch(Interface):
+    implements = nc.Switch
+
+    def __init__(self, func, cases=(), **settings):
+        self.func = func
+        self.cases = cases
+        self.default_case = settings.setdefault("default_case")
+        super().__init__(**settings)
+
+    def _configure(self, default_case):
+        settings = {
+            key: value
+            for key, value in self.settings.items()
+            if key not in ("func", "cases", "default_case")
+        }
+        cases = {case.key: self.get_impl(case.obj, **settings) for case in self.cases}
+        default = None
+        if default_case is not None:
+            default = self.get_impl(default_case, **settings)
+        self._impl = SwitchNode(self.name, self.func, cases, default)
+
+
+@Driver.init_for(nc.Array)
+def init_array(origin, serializer, components=(), settings=None):
+    settings = Settings(origin.settings).layer(settings)
+    return serializer(nc.repeated_element(components), **settings)
@@ -1,9 +1,13 @@
 from __future__ import annotations  # Python 3.8
 
 import enum
+import io
 
 import construct
 import netcast as nc
+from netcast.drivers.construct_cache import CompileCache
+from netcast.tools.collections import Settings
+from netcast.tools.streams import BufferWriter
 
 
 DRIVER_NAME = "construct"
@@ -13,8 +17,12 @@ class Interface(nc.Interface):
     def __init__(self, **settings):
         self.compiled = settings.setdefault("compiled", not self.driver.DEBUG)
         self.skip = set()
+        self._wrapped = {}
         super().__init__(**settings)
 
+    def _invalidate(self):
+        self._wrapped = {}
+
     def impl(self, driver=None, settings=None, final=False):
         impl = self._impl
 
@@ -23,7 +31,17 @@ class Interface(nc.Interface):
 
         if ... in self.skip:
             return impl
-        return self._wrap_impl(impl)
+
+        # Only the outermost construct is compiled, the nested ones are inlined into it
+        compiled = self.compiled and not final
+
+        # Wrapping (and compiling) is costly, so reuse the result until reconfigured
+        wrapped = self._wrapped.get(compiled)
+        if wrapped is None or wrapped[0] is not impl or wrapped[1] != self.name:
+            wrapped = self._wrapped[compiled] = (
+                impl, self.name, self._wrap_impl(impl, compiled=compiled)
+            )
+        return wrapped[2]
 
     def _wrap_one_of(self, impl, value, fn):
         if isinstance(value, (enum.Enum, enum.EnumMeta)):
@@ -46,7 +64,14 @@ class Interface(nc.Interface):
                     impl = fn(impl, value)
         return impl
 
-    def _wrap_impl(self, impl):
+    def _compile(self, impl):
+        filename = self.settings.get("filename")
+        cache = self.driver.compile_cache
+        if cache is None or filename is not None:
+            return impl.compile(filename)
+        return cache.compile(impl)
+
+    def _wrap_impl(self, impl, compiled=False):
         impl = self._wrap_once(
             impl, key="api_default", default=nc.MISSING, fn=construct.Default
         )
@@ -80,9 +105,8 @@ class Interface(nc.Interface):
         ):
             impl = self._wrap_once(impl, key=key, default=False, fn=lambda i, v: cls(i))
 
-        if self.compiled:
-            filename = self.settings.get("filename")
-            impl = impl.compile(filename)
+        if compiled:
+            impl = self._compile(impl)
 
         if self.name is not None and (getattr(impl, "name", None) != self.name):
             impl = construct.Renamed(impl, self.name)
@@ -101,6 +125,30 @@ class Interface(nc.Interface):
         impl = self.impl()
         return impl.build(obj)
 
+    def _dump_into(self, obj, buffer, offset, settings, **kwargs):
+        with BufferWriter(buffer, offset) as stream:
+            self.impl().build_stream(obj, stream)
+            return stream.tell()
+
+    def _load_stream(self, stream, settings, **kwargs):
+        impl = self.impl()
+        return impl.parse_stream(stream)
+
+    def _load_incremental(self, settings, **kwargs):
+        context = construct.Container(_parsing=True, _building=False, _sizing=False)
+        context._params = context
+        return (yield from parse_incrementally(self.impl(), context))
+
+    def _static_size(self, settings):
+        context = construct.Container(_parsing=False, _building=False, _sizing=True)
+        context._params = context
+        return _static_size(self.impl(), context, "(sizeof)")
+
+    def _encoded_size(self, obj, settings, **kwargs):
+        context = construct.Container(_parsing=False, _building=True, _sizing=False)
+        context._params = context
+        return encoded_size(self.impl(), obj, context)
+
 
 class Sequence(Interface):
     implements = nc.Sequence
@@ -184,6 +232,13 @@ class Driver(nc.Driver):
     Struct = DictStruct
 
     default_model_serializer = Struct
+    compile_cache = CompileCache.from_environ()
+
+    @classmethod
+    def use_compile_cache(cls, directory=None):
+        """Load compiled parsers from (and save them to) a directory, or stop if None."""
+        cls.compile_cache = None if directory is None else CompileCache(directory)
+        return cls.compile_cache
 
 
 @Driver.impl
@@ -301,6 +356,324 @@ class FloatingPoint(Interface):
         return obj
 
 
+_PATH = "(compiled)"
+_IMPORT_STRING_HELPERS = (
+    "from netcast.drivers.construct import "
+    "parse_c_string, build_c_string, parse_padded_string, build_padded_string, "
+    "parse_pascal_string, build_pascal_string, parse_greedy_string, build_greedy_string"
+)
+
+
+def _encode_string(obj, encoding):
+    if not isinstance(obj, str):
+        raise construct.StringError("string encoding failed, expected unicode string")
+    # Same as construct: an empty string must not turn into a byte order mark
+    return obj.encode(encoding) if obj else b""
+
+
+def _decode_string(data, encoding):
+    try:
+        return data.decode(encoding)
+    except UnicodeDecodeError as exc:
+        raise construct.StringError(
+            f"cannot use encoding {encoding!r} to decode {bytes(data)!r}"
+        ) from exc
+
+
+def parse_c_string(stream, term, encoding):
+    unit = len(term)
+    data = bytearray()
+    while True:
+        chunk = construct.core.stream_read(stream, unit, _PATH)
+        if chunk == term:
+            return _decode_string(data, encoding)
+        data += chunk
+
+
+def build_c_string(obj, stream, term, encoding):
+    stream.write(_encode_string(obj, encoding) + term)
+    return obj
+
+
+def parse_padded_string(stream, length, pad, encoding):
+    data = construct.core.stream_read(stream, length, _PATH)
+    unit = len(pad)
+    if unit == 1:
+        data = data.rstrip(pad)
+    else:
+        tail = len(data) % unit
+        end = len(data)
+        if tail and data[-tail:] == pad[:tail]:
+            end -= tail
+        while end - unit >= 0 and data[end - unit:end] == pad:
+            end -= unit
+        data = data[:end]
+    return _decode_string(data, encoding)
+
+
+def build_padded_string(obj, stream, length, encoding):
+    data = _encode_string(obj, encoding)
+    if len(data) > length:
+        raise construct.PaddingError(
+            f"subcon build {len(data)} bytes but was allowed only {length}"
+        )
+    stream.write(data + bytes(length - len(data)))
+    return obj
+
+
+def parse_pascal_string(stream, length, encoding):
+    return _decode_string(construct.core.stream_read(stream, length, _PATH), encoding)
+
+
+def build_pascal_string(obj, stream, encoding, build_length):
+    data = _encode_string(obj, encoding)
+    build_length(len(data))
+    stream.write(data)
+    return obj
+
+
+def parse_greedy_string(stream, encoding):
+    return _decode_string(stream.read(), encoding)
+
+
+def build_greedy_string(obj, stream, encoding):
+    stream.write(_encode_string(obj, encoding))
+    return obj
+
+
+class CString(construct.StringEncoded):
+    """construct.CString that can be inlined into compiled parsers."""
+
+    def __init__(self, encoding, term):
+        super().__init__(
+            construct.NullTerminated(construct.GreedyBytes, term=term), encoding
+        )
+        self.term = term
+
+    def _emitparse(self, code):
+        code.append(_IMPORT_STRING_HELPERS)
+        return f"parse_c_string(io, {self.term!r}, {self.encoding!r})"
+
+    def _emitbuild(self, code):
+        code.append(_IMPORT_STRING_HELPERS)
+        return f"build_c_string(obj, io, {self.term!r}, {self.encoding!r})"
+
+    def _emitfulltype(self, ksy, bitwise):
+        return dict(type="strz", encoding=self.encoding)
+
+
+class PaddedString(construct.StringEncoded):
+    """construct.PaddedString that can be inlined into compiled parsers."""
+
+    def __init__(self, length, encoding, pad):
+        super().__init__(
+            construct.FixedSized(
+                length, construct.NullStripped(construct.GreedyBytes, pad=pad)
+            ),
+            encoding,
+        )
+        self.length = length
+        self.pad = pad
+
+    def _emitparse(self, code):
+        if not isinstance(self.length, int):
+            raise NotImplementedError
+        code.append(_IMPORT_STRING_HELPERS)
+        return (
+            f"parse_padded_string(io, {self.length!r}, {self.pad!r}, {self.encoding!r})"
+        )
+
+    def _emitbuild(self, code):
+        if not isinstance(self.length, int):
+            raise NotImplementedError
+        code.append(_IMPORT_STRING_HELPERS)
+        return f"build_padded_string(obj, io, {self.length!r}, {self.encoding!r})"
+
+    def _emitfulltype(self, ksy, bitwise):
+        return dict(size=self.length, type="strz", encoding=self.encoding)
+
+
+class PascalString(construct.StringEncoded):
+    """construct.PascalString that can be inlined into compiled parsers."""
+
+    def __init__(self, length_field, encoding):
+        super().__init__(construct.Prefixed(length_field, construct.GreedyBytes), encoding)
+        self.length_field = length_field
+
+    def _emitparse(self, code):
+        code.append(_IMPORT_STRING_HELPERS)
+        length = self.length_field._compileparse(code)
+        return f"parse_pascal_string(io, {length}, {self.encoding!r})"
+
+    def _emitbuild(self, code):
+        code.append(_IMPORT_STRING_HELPERS)
+        build_length = self.length_field._compilebuild(code)
+        return f"build_pascal_string(obj, io, {self.encoding!r}, lambda obj: {build_length})"
+
+
+class GreedyString(construct.StringEncoded):
+    """construct.GreedyString that can be inlined into compiled parsers."""
+
+    def __init__(self, encoding):
+        super().__init__(construct.GreedyBytes, encoding)
+
+    def _emitparse(self, code):
+        code.append(_IMPORT_STRING_HELPERS)
+        return f"parse_greedy_string(io, {self.encoding!r})"
+
+    def _emitbuild(self, code):
+        code.append(_IMPORT_STRING_HELPERS)
+        return f"build_greedy_string(obj, io, {self.encoding!r})"
+
+
+def _static_size(impl, context, path):
+    try:
+        return impl._sizeof(context, path)
+    except Exception:  # pylint: disable=W0703
+        # Sizes may depend on fields that have not been parsed yet
+        return None
+
+
+def parse_incrementally(impl, context, path="(incremental)"):
+    """
+    Parse a construct with a generator that yields the number of bytes
+    (or the terminator of the bytes) it needs next, see netcast.tools.streams.Decoder.
+    """
+    while isinstance(impl, (construct.Renamed, construct.Default, construct.Compiled)):
+        impl = impl.defersubcon if isinstance(impl, construct.Compiled) else impl.subcon
+
+    if isinstance(impl, CString):
+        return _decode_string((yield impl.term), impl.encoding)
+
+    if isinstance(impl, PascalString):
+        length = yield from parse_incrementally(impl.length_field, context, path)
+        return _decode_string((yield length), impl.encoding)
+
+    size = _static_size(impl, context, path)
+    if size is not None:
+        return impl._parsereport(io.BytesIO((yield size)), context, path)
+
+    if isinstance(impl, construct.Struct):
+        context = construct.Container(
+            _=context,
+            _params=context["_params"],
+            _root=None,
+            _parsing=True,
+            _building=False,
+            _sizing=False,
+            _subcons=None,
+            _io=None,
+            _index=context.get("_index", None),
+        )
+        context._root = context._.get("_root", context)
+        result = construct.Container()
+        for subcon in impl.subcons:
+            value = yield from parse_incrementally(subcon, context, path)
+            if subcon.name:
+                result[subcon.name] = context[subcon.name] = value
+        return result
+
+    if isinstance(impl, construct.Sequence):
+        items = construct.ListContainer()
+        for subcon in impl.subcons:
+            items.append((yield from parse_incrementally(subcon, context, path)))
+        return items
+
+    if isinstance(impl, construct.Switch):
+        key = construct.core.evaluate(impl.keyfunc, context)
+        case = impl.cases.get(key, impl.default)
+        return (yield from parse_incrementally(case, context, path))
+
+    if isinstance(impl, construct.Array):
+        count = construct.core.evaluate(impl.count, context)
+        items = construct.ListContainer()
+        for _ in range(count):
+            items.append((yield from parse_incrementally(impl.subcon, context, path)))
+        return items
+
+    if isinstance(impl, construct.NullTerminated) and (
+        impl.subcon is construct.GreedyBytes and impl.consume and not impl.include
+    ):
+        return (yield impl.term)
+
+    if isinstance(impl, construct.Adapter):
+        obj = yield from parse_incrementally(impl.subcon, context, path)
+        return impl._decode(obj, context, path)
+
+    raise NotImplementedError(f"{type(impl).__name__} can't be parsed incrementally")
+
+
+def encoded_size(impl, obj, context, path="(sizing)"):
+    """Compute the size of the build of an object without building it, where possible."""
+    while isinstance(impl, (construct.Renamed, construct.Default, construct.Compiled)):
+        if isinstance(impl, construct.Default) and obj is None:
+            obj = construct.core.evaluate(impl.value, context)
+        impl = impl.defersubcon if isinstance(impl, construct.Compiled) else impl.subcon
+
+    size = _static_size(impl, context, path)
+    if size is not None:
+        return size
+
+    if impl is construct.GreedyBytes:
+        return len(obj)
+
+    if isinstance(impl, construct.Struct):
+        if obj is None:
+            obj = construct.Container()
+        context = construct.Container(
+            _=context,
+            _params=context["_params"],
+            _root=None,
+            _parsing=False,
+            _building=True,
+            _sizing=False,
+            _subcons=None,
+            _io=None,
+            _index=context.get("_index", None),
+        )
+        context._root = context._.get("_root", context)
+        context.update(obj)
+        size = 0
+        for subcon in impl.subcons:
+            value = obj.get(subcon.name) if subcon.flagbuildnone else obj[subcon.name]
+            size += encoded_size(subcon, value, context, path)
+        return size
+
+    if isinstance(impl, construct.Sequence):
+        return sum(
+            encoded_size(subcon, value, context, path)
+            for subcon, value in zip(impl.subcons, obj)
+        )
+
+    if isinstance(impl, construct.Switch):
+        key = construct.core.evaluate(impl.keyfunc, context)
+        case = impl.cases.get(key, impl.default)
+        return encoded_size(case, obj, context, path)
+
+    if isinstance(impl, construct.Array):
+        size = _static_size(impl.subcon, context, path)
+        if size is not None:
+            return size * len(obj)
+        return sum(encoded_size(impl.subcon, item, context, path) for item in obj)
+
+    if isinstance(impl, construct.NullTerminated) and (
+        impl.subcon is construct.GreedyBytes and not impl.include
+    ):
+        return len(obj) + len(impl.term)
+
+    if isinstance(impl, construct.Prefixed) and not impl.includelength:
+        size = encoded_size(impl.subcon, obj, context, path)
+        return encoded_size(impl.lengthfield, size, context, path) + size
+
+    if isinstance(impl, construct.Adapter):
+        return encoded_size(impl.subcon, impl._encode(obj, context, path), context, path)
+
+    # Anything else is measured by building it
+    stream = io.BytesIO()
+    impl._build(obj, stream, context, path)
+    return stream.tell()
+
+
 class _EncodingUnitExtension:
     def __init__(self):
         self._unit_cache = construct.possiblestringencodings.copy()
@@ -315,36 +688,11 @@ class _EncodingUnitExtension:
 
     def c_string(self, encoding):
         encoding = encoding.casefold()
-        macro = construct.StringEncoded(
-            construct.NullTerminated(
-                construct.GreedyBytes, term=self.encoding_unit(encoding)
-            ),
-            encoding,
-        )
-
-        def _netcast_emitfulltype(_ksy, _bitwise):
-            return dict(type="strz", encoding=encoding)
-
-        macro._emitfulltype = _netcast_emitfulltype
-        return macro
+        return CString(encoding, self.encoding_unit(encoding))
 
     def padded_string(self, length, encoding):
         encoding = encoding.casefold()
-        macro = construct.StringEncoded(
-            construct.FixedSized(
-                length,
-                construct.NullStripped(
-                    construct.GreedyBytes, pad=self.encoding_unit(encoding)
-                ),
-            ),
-            encoding,
-        )
-
-        def _netcast_emitfulltype(_ksy, _bitwise):
-            return dict(size=length, type="strz", encoding=encoding)
-
-        macro._emitfulltype = _netcast_emitfulltype
-        return macro
+        return PaddedString(length, encoding, self.encoding_unit(encoding))
 
 
 @Driver.impl
@@ -358,13 +706,12 @@ class String(Interface):
         self.encoding = settings.setdefault("encoding", self.default_encoding)
         self.pascal = settings.setdefault("pascal")
         self.greedy = settings.setdefault("greedy")
-
-        if not any((self.null_terminated, self.pascal, self.greedy)):
-            self.null_terminated = settings["null_terminated"] = True
-
         self.padded = settings.setdefault("padded", 0)
         self.size = settings.setdefault("size")
 
+        if not any((self.null_terminated, self.pascal, self.greedy, self.padded)):
+            self.null_terminated = settings["null_terminated"] = True
+
         super().__init__(**settings)
 
         self.skip.update({"null_terminated", "padded"})
@@ -378,7 +725,7 @@ class String(Interface):
         elif pascal:
             if size is None:
                 size = self.get_impl(self.driver.Int8(signed=False))
-            impl = construct.PascalString(size, encoding)
+            impl = PascalString(size, encoding)
 
         elif padded:
             if size is None:
@@ -386,7 +733,7 @@ class String(Interface):
             impl = self.encoded_strings.padded_string(size, encoding)
 
         elif greedy:
-            impl = construct.GreedyString(encoding)
+            impl = GreedyString(encoding)
 
         if impl is None:
             raise ValueError("invalid string serializer configuration")
@@ -406,6 +753,20 @@ class Range(Interface):
         self._impl = construct.GreedyRange(self.get_impl(self.obj, **self.settings))
 
 
+class _Switch(construct.Switch):
+    """construct.Switch that isn't inlined into compiled parsers if keyed by a function."""
+
+    def _emitparse(self, code):
+        if callable(self.keyfunc) and not isinstance(self.keyfunc, construct.expr.ExprMixin):
+            raise NotImplementedError
+        return super()._emitparse(code)
+
+    def _emitbuild(self, code):
+        if callable(self.keyfunc) and not isinstance(self.keyfunc, construct.expr.ExprMixin):
+            raise NotImplementedError
+        return super()._emitbuild(code)
+
+
 @Driver.impl
 class Switch(Interface):
     implements = nc.Switch
@@ -418,7 +779,7 @@ class Switch(Interface):
 
     def _configure(self, default_case):
         cases = {case.key: self.get_impl(case, **self.settings) for case in self.cases}
-        self._impl = construct.Switch(self.func, cases, default_case)
+        self._impl = _Switch(self.func, cases, default_case)
 
 
 @Driver.impl
@@ -442,9 +803,5 @@ class Entity(Interface):
 
 @Driver.init_for(nc.Array)
 def init_array(origin, serializer, components=(), settings=None):
-    if settings is None:
-        settings = {}
-    settings = {**origin.settings, **settings}
-    if len(components) != 1:
-        raise ValueError("construct.Array() takes exactly 1 argument")
-    return serializer(*components, **settings)
+    settings = Settings(origin.settings).layer(settings)
+    return serializer(nc.repeated_element(components), **settings)
@@ -0,0 +1,302 @@
+"""
+On-disk cache of compiled construct parsers.
+
+Compiling a big construct Struct takes tens of milliseconds, so the source code emitted
+by `Construct.compile()` is stored (together with its marshalled code object) in a cache
+directory, under a fingerprint of the whole construct tree. The fingerprint covers
+the construct classes and all their parameters (so the field types and the settings
+they were built with), the netcast and construct versions and the Python bytecode tag.
+
+Parsers that link to runtime objects (e.g. Switch cases keyed by a lambda) can't be
+restored from source and are simply compiled every time.
+
+Pre-warm the cache at deploy time with::
+
+    python -m netcast.drivers.construct_cache CACHE_DIR package.module:Model [...]
+"""
+from __future__ import annotations  # Python 3.8
+
+import argparse
+import ast
+import enum
+import functools
+import hashlib
+import importlib
+import importlib.machinery
+import importlib.util
+import marshal
+import os
+import pathlib
+import sys
+import tempfile
+from importlib import metadata
+from typing import Any, Iterable, NamedTuple
+
+import construct
+import netcast as nc
+
+
+__all__ = (
+    "CACHE_FORMAT",
+    "CompileCache",
+    "CompileCacheInfo",
+    "ENVIRON_KEY",
+    "fingerprint",
+    "warm_cache",
+)
+
+CACHE_FORMAT = 1
+ENVIRON_KEY = "NETCAST_CONSTRUCT_CACHE"
+
+
+@functools.lru_cache(maxsize=None)
+def _netcast_version():
+    try:
+        return metadata.version("netcast")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+class Unfingerprintable(Exception):
+    """The construct tree refers to an object that can't be described stably."""
+
+
+def _describe(obj, parts, seen):
+    if obj is None or isinstance(obj, (bool, int, float, complex, str, bytes)):
+        parts.append(repr(obj))
+    elif isinstance(obj, enum.Enum):
+        parts.append(f"{type(obj).__module__}.{type(obj).__qualname__}.{obj.name}")
+    elif isinstance(obj, enum.EnumMeta):
+        parts.append(f"{obj.__module__}.{obj.__qualname__}")
+        parts.append(repr([(member.name, member.value) for member in obj]))
+    elif isinstance(obj, type):
+        parts.append(f"{obj.__module__}.{obj.__qualname__}")
+    elif isinstance(obj, construct.expr.ExprMixin):
+        parts.append(f"<expr {obj!r}>")
+    elif isinstance(obj, (list, tuple, dict, construct.Construct)):
+        # Constructs are commonly shared within a tree, describe each one only once
+        ref = seen.get(id(obj))
+        if ref is not None:
+            parts.append(ref)
+            return
+        seen[id(obj)] = f"<#{len(seen)}>"
+        if isinstance(obj, construct.Construct):
+            parts.append(f"{type(obj).__module__}.{type(obj).__qualname__}(")
+            for key, value in sorted(vars(obj).items()):
+                # Per-instance _emit* closures only derive Kaitai output from other parameters
+                if not key.startswith("_emit"):
+                    parts.append(key)
+                    _describe(value, parts, seen)
+            parts.append(")")
+        elif isinstance(obj, dict):
+            parts.append(f"{type(obj).__qualname__}{{")
+            for key, value in sorted(obj.items(), key=lambda item: repr(item[0])):
+                _describe(key, parts, seen)
+                _describe(value, parts, seen)
+            parts.append("}")
+        else:
+            parts.append(f"{type(obj).__qualname__}[")
+            for item in obj:
+                _describe(item, parts, seen)
+            parts.append("]")
+    else:
+        raise Unfingerprintable(f"can't fingerprint {type(obj).__name__} objects")
+
+
+def fingerprint(impl: construct.Construct) -> str | None:
+    """
+    Return a stable fingerprint of a construct tree to be compiled,
+    or None if the tree can't be described stably.
+    """
+    parts = [
+        repr((
+            CACHE_FORMAT,
+            _netcast_version(),
+            construct.version_string,
+            sys.implementation.cache_tag,
+        ))
+    ]
+    try:
+        _describe(impl, parts, {})
+    except Unfingerprintable:
+        return None
+    return hashlib.sha256("\x1f".join(parts).encode()).hexdigest()
+
+
+class CompileCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    skipped: int
+    directory: pathlib.Path
+
+
+class CompileCache:
+    """A directory of compiled construct parsers."""
+
+    def __init__(self, directory: str | os.PathLike):
+        self.directory = pathlib.Path(directory)
+        self.hits = self.misses = self.skipped = 0
+
+    @classmethod
+    def from_environ(cls, key: str = ENVIRON_KEY) -> CompileCache | None:
+        directory = os.environ.get(key)
+        if not directory:
+            return None
+        return cls(directory)
+
+    def path(self, key: str) -> pathlib.Path:
+        return self.directory / (key + ".bin")
+
+    def compile(self, impl: construct.Construct) -> construct.Compiled:
+        """Equivalent of `impl.compile()`, but reusing the source code compiled before."""
+        key = fingerprint(impl)
+        if key is None:
+            self.skipped += 1
+            return impl.compile()
+
+        path = self.path(key)
+        try:
+            source, code = marshal.loads(path.read_bytes())
+        except (OSError, EOFError, ValueError, TypeError):
+            pass
+        else:
+            self.hits += 1
+            return self._restore(impl, source, code)
+
+        compiled = impl.compile()
+        if compiled.module.linkedinstances:
+            self.skipped += 1
+        else:
+            self.misses += 1
+            code = compile(compiled.source, "", "exec")
+            self._store(path, marshal.dumps((compiled.source, code)))
+        return compiled
+
+    @staticmethod
+    def _restore(impl, source, code):
+        # Mirrors what Construct.compile() does after generating the source code
+        modulename = hashlib.sha1(source.encode()).hexdigest()
+        module_spec = importlib.machinery.ModuleSpec(modulename, None)
+        module = importlib.util.module_from_spec(module_spec)
+        exec(code, module.__dict__)  # pylint: disable=W0122
+        compiled = module.compiled
+        compiled.source = source
+        compiled.module = module
+        compiled.modulename = modulename
+        compiled.defersubcon = impl
+        return compiled
+
+    def _store(self, path, data):
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as file:
+                    file.write(data)
+                os.replace(tmp, path)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+        except OSError:
+            # A read-only or full cache directory must not break serialization
+            pass
+
+    def clear(self) -> int:
+        """Remove all the cached parsers, return the number of removed files."""
+        removed = 0
+        for path in self.directory.glob("*.bin"):
+            path.unlink()
+            removed += 1
+        return removed
+
+    def info(self) -> CompileCacheInfo:
+        return CompileCacheInfo(self.hits, self.misses, self.skipped, self.directory)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({str(self.directory)!r})"
+
+
+def warm_cache(
+    models: Iterable[Any],
+    directory: str | os.PathLike | None = None,
+    versions: Iterable[Any] = (),
+    **settings: Any,
+) -> CompileCacheInfo:
+    """
+    Compile the construct parsers of the given models into a cache directory.
+
+    If no directory is given, the cache of the construct driver is used.
+    Every model is compiled once per requested version (or once with the
+    given settings, if no versions are given).
+    """
+    driver = nc.get_driver("construct")
+    cache = driver.compile_cache if directory is None else CompileCache(directory)
+    if cache is None:
+        raise ValueError(
+            f"no cache directory given and {ENVIRON_KEY} environment variable is not set"
+        )
+
+    versions = list(versions)
+    settings_list = (
+        [{**settings, "version": version} for version in versions]
+        if versions else [settings]
+    )
+    for model in models:
+        for model_settings in settings_list:
+            impl = model().impl(driver, model_settings, final=True)
+            # The driver compiles the outermost construct before renaming it
+            if isinstance(impl, construct.Renamed):
+                impl = impl.subcon
+            cache.compile(impl)
+    return cache.info()
+
+
+def _import_model(path):
+    module_name, _, qualname = path.partition(":")
+    if not qualname:
+        raise argparse.ArgumentTypeError(f"expected module:Model, got {path!r}")
+    obj = importlib.import_module(module_name)
+    for attr in qualname.split("."):
+        obj = getattr(obj, attr)
+    return obj
+
+
+def _setting(arg):
+    key, sep, value = arg.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError(f"expected key=value, got {arg!r}")
+    try:
+        value = ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        pass
+    return key, value
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m netcast.drivers.construct_cache",
+        description="Pre-warm the on-disk cache of compiled construct parsers.",
+    )
+    parser.add_argument("directory", help="cache directory")
+    parser.add_argument(
+        "models", nargs="+", type=_import_model, help="models to compile, as module:Model"
+    )
+    parser.add_argument(
+        "-v", "--version", dest="versions", action="append", default=[],
+        type=ast.literal_eval, help="model version to compile (may be repeated)",
+    )
+    parser.add_argument(
+        "-s", "--setting", dest="settings", action="append", default=[],
+        type=_setting, help="serializer setting as key=value (may be repeated)",
+    )
+    args = parser.parse_args(argv)
+    info = warm_cache(args.models, args.directory, args.versions, **dict(args.settings))
+    print(
+        f"{info.directory}: {info.misses} compiled, {info.hits} already cached, "
+        f"{info.skipped} not cacheable"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,272 @@
+from __future__ import annotations  # Python 3.8
+
+import operator
+import struct
+from typing import Any, Callable, NamedTuple
+
+import netcast as nc
+from netcast.tools.collections import Settings
+
+
+DRIVER_NAME = "struct"
+FALLBACK_DRIVER_NAME = "construct"
+
+
+class Member(NamedTuple):
+    """A single field of a flat, fixed-layout model, expressed as a struct format code."""
+
+    name: str | None
+    format: str
+    byte_order: str | None = None  # None if the member does not depend on byte order
+    encode: Callable[[Any], Any] | None = None
+    decode: Callable[[Any], Any] | None = None
+
+
+def get_byte_order(settings):
+    if settings.get("big_endian"):
+        return ">"
+    if settings.get("little_endian", True):
+        return "<"
+    return "="
+
+
+class Interface(nc.Interface):
+    def impl(self, driver=None, settings=None, final=False):
+        impl = self._impl
+        if impl is NotImplemented:
+            raise NotImplementedError("missing requested serializer implementation")
+        return impl
+
+    @property
+    def driver(self):
+        return Driver
+
+    def _static_size(self, settings):
+        impl = self.impl()
+        if isinstance(impl, Member):
+            return struct.calcsize("<" + impl.format)
+        return impl.size
+
+
+class Struct(Interface):
+    """Flat model serializer, packing all the members with one precompiled struct.Struct."""
+
+    implements = nc.ModelSerializer
+
+    def __init__(self, *fields, **settings):
+        self.fields = fields
+        super().__init__(**settings)
+
+    def _configure(self):
+        members = self.get_impls(self.fields, self.settings)
+        byte_orders = set()
+
+        for member in members:
+            if not isinstance(member, Member):
+                raise NotImplementedError(
+                    f"{type(member).__name__} can't be packed into a flat struct"
+                )
+            if member.byte_order is not None:
+                byte_orders.add(member.byte_order)
+
+        if len(byte_orders) > 1:
+            raise NotImplementedError("members of a struct must share the byte order")
+
+        byte_order = byte_orders.pop() if byte_orders else "<"
+        fmt = byte_order + "".join(member.format for member in members)
+
+        self.members = members
+        self.names = names = tuple(member.name for member in members)
+        self.encoders = tuple(
+            (idx, member.encode) for idx, member in enumerate(members) if member.encode
+        )
+        self.decoders = tuple(
+            (idx, member.decode) for idx, member in enumerate(members) if member.decode
+        )
+        if len(names) > 1:
+            self.getter = operator.itemgetter(*names)
+        else:
+            self.getter = lambda obj: tuple(obj[name] for name in names)
+        self._impl = struct.Struct(fmt)
+
+    def _values(self, obj):
+        values = self.getter(obj)
+        if self.encoders:
+            values = list(values)
+            for idx, encode in self.encoders:
+                values[idx] = encode(values[idx])
+        return values
+
+    def _state(self, values):
+        if self.decoders:
+            values = list(values)
+            for idx, decode in self.decoders:
+                values[idx] = decode(values[idx])
+        return dict(zip(self.names, values))
+
+    def pack_into(self, obj, buffer, offset=0):
+        """Pack the object into a writable buffer, return the number of bytes written."""
+        self._impl.pack_into(buffer, offset, *self._values(obj))
+        return self._impl.size
+
+    def unpack_from(self, buffer, offset=0):
+        """Unpack the object from a buffer, without copying it."""
+        return self._state(self._impl.unpack_from(buffer, offset))
+
+    def _dump(self, obj, settings, **kwargs):
+        return self._impl.pack(*self._values(obj))
+
+    def _dump_into(self, obj, buffer, offset, settings, **kwargs):
+        return self.pack_into(obj, buffer, offset)
+
+    def _load(self, obj, settings, **kwargs):
+        return self.unpack_from(obj)
+
+    def _load_from(self, buffer, offset, settings, **kwargs):
+        return self.unpack_from(buffer, offset), self._impl.size
+
+    def _load_stream(self, stream, settings, **kwargs):
+        return self.unpack_from(stream.read(self._impl.size))
+
+    def _load_incremental(self, settings, **kwargs):
+        return self.unpack_from((yield self._impl.size))
+
+
+class Array(Interface):
+    """Fixed-size array of numbers, packing all the items with one precompiled struct.Struct."""
+
+    implements = nc.Array
+
+    def __init__(self, data_type, /, **settings):
+        self.data_type = data_type
+        self.size = settings.setdefault("size")
+        super().__init__(**settings)
+
+    def _configure(self, *, size):
+        member = self.get_impl(self.data_type, **self.settings)
+        if not isinstance(member, Member) or member.encode or not isinstance(size, int):
+            raise NotImplementedError("struct supports only fixed-size arrays of numbers")
+        self._impl = struct.Struct((member.byte_order or "<") + f"{size}{member.format}")
+
+    def _dump(self, obj, settings, **kwargs):
+        return self._impl.pack(*obj)
+
+    def _dump_into(self, obj, buffer, offset, settings, **kwargs):
+        self._impl.pack_into(buffer, offset, *obj)
+        return self._impl.size
+
+    def _load(self, obj, settings, **kwargs):
+        return self._impl.unpack_from(obj)
+
+    def _load_from(self, buffer, offset, settings, **kwargs):
+        return self._impl.unpack_from(buffer, offset), self._impl.size
+
+    def _load_stream(self, stream, settings, **kwargs):
+        return self._impl.unpack(stream.read(self._impl.size))
+
+    def _load_incremental(self, settings, **kwargs):
+        return self._impl.unpack((yield self._impl.size))
+
+
+class Driver(nc.Driver):
+    StructInterface = nc.driver_interface(Struct)
+    ArrayInterface = nc.driver_interface(Array, default=nc.List)
+
+    ListArray = ArrayInterface(nc.List)
+    TupleArray = ArrayInterface(nc.Tuple)
+    Array = ListArray
+
+    DictStruct = StructInterface(nc.Dict)
+    MappingProxyStruct = StructInterface(nc.MappingProxy)
+    SimpleNamespaceStruct = StructInterface(nc.SimpleNamespace)
+    Struct = DictStruct
+
+    default_model_serializer = Struct
+    fallback_driver_name = FALLBACK_DRIVER_NAME
+
+    @classmethod
+    def lookup_model_serializer(cls, model, /, **settings):
+        """Look up a flat struct serializer, or the fallback driver's one if impossible."""
+        try:
+            return type(cls).lookup_model_serializer(cls, model, **settings)
+        except NotImplementedError:
+            fallback = nc.get_driver(cls.fallback_driver_name)
+            if fallback is None:
+                raise
+            return fallback.lookup_model_serializer(model, **settings)
+
+
+@Driver.init_for(nc.Array)
+def init_array(origin, serializer, components=(), settings=None):
+    settings = Settings(origin.settings).layer(settings)
+    return serializer(nc.repeated_element(components), **settings)
+
+
+@Driver.impl
+class Integer(Interface):
+    implements = nc.Integer
+    format_codes = {8: "b", 16: "h", 32: "i", 64: "q"}
+
+    def __init__(self, **settings):
+        self.signed = settings.setdefault("signed", True)
+        self.bit_size = settings.get("bit_size", 32)
+        super().__init__(**settings)
+
+    def _configure(self, *, signed):
+        code = self.format_codes.get(self.bit_size)
+        if code is None:
+            raise NotImplementedError(
+                f"struct does not support {self.bit_size}-bit integers"
+            )
+        if not signed:
+            code = code.upper()
+        byte_order = None if self.bit_size == 8 else get_byte_order(self.settings)
+        self._impl = Member(self.name, code, byte_order)
+
+
+@Driver.impl
+class FloatingPoint(Interface):
+    implements = nc.FloatingPoint
+    format_codes = {16: "e", 32: "f", 64: "d"}
+
+    def __init__(self, **settings):
+        self.bit_size = settings.get("bit_size", 32)
+        super().__init__(**settings)
+
+    def _configure(self):
+        code = self.format_codes.get(self.bit_size)
+        if code is None:
+            raise NotImplementedError(f"struct does not support {self.bit_size}-bit floats")
+        self._impl = Member(self.name, code, get_byte_order(self.settings))
+
+
+@Driver.impl
+class String(Interface):
+    """Only fixed-size, null-padded strings are supported."""
+
+    implements = nc.String
+    default_encoding = "ASCII"
+
+    def __init__(self, **settings):
+        self.encoding = settings.setdefault("encoding", self.default_encoding)
+        self.padded = settings.setdefault("padded", 0)
+        self.size = settings.setdefault("size")
+        super().__init__(**settings)
+
+    def _configure(self, *, size, padded, encoding):
+        if not padded or size is None:
+            raise NotImplementedError("struct supports only fixed-size padded strings")
+        pad = bytes(len("\x00".encode(encoding)))
+
+        def encode(obj):
+            data = obj.encode(encoding)
+            if len(data) > size:
+                raise ValueError(f"string is longer than {size} bytes")
+            return data
+
+        def decode(data):
+            while data.endswith(pad):
+                data = data[: -len(pad)]
+            return data.decode(encoding)
+
+        self._impl = Member(self.name, f"{size}s", None, encode, decode)
@@ -1,17 +1,39 @@
 from __future__ import annotations  # Python 3.8
 
+import array
 import collections.abc
 import contextlib
 import functools
-import inspect
-from typing import Any, cast, ClassVar, Type, TypeVar, Union
+import itertools
+import threading
+import weakref
+from typing import (
+    Any,
+    Callable,
+    cast,
+    ClassVar,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    Sequence,
+    Type,
+    TypeVar,
+    Union,
+)
 
+from netcast.common import Array, Number, Statement
 from netcast.constants import MISSING, GREATEST
 from netcast.driver import DriverMeta, Driver, load_driver
 from netcast.serializer import Interface, SettingsT, Serializer
 from netcast.stack import Stack, VersionAwareStack
 from netcast.tools import strings
-from netcast.tools.collections import IDLookupDictionary, classproperty
+from netcast.tools.collections import (
+    IDLookupDictionary,
+    LRUCache,
+    Settings,
+    classproperty,
+)
+from netcast.tools.streams import Decoder, StreamReader
 
 
 __all__ = (
@@ -22,11 +44,43 @@ __all__ = (
     "Field",
     "FieldAlias",
     "Model",
+    "ModelStorage",
+    "ModelView",
+    "repeated",
+    "repeated_cache",
+    "serializer_cache",
+    "view_layout_cache",
 )
 
 FIELD_NAME_ESCAPE = "f__"
 REPEATED_NAME_TEMPLATE = "%(name)s[%(size)d]"
 REPEATED_MEMBER_NAME_TEMPLATE = "%(name)s_%(index)d"
+SERIALIZER_CACHE_SIZE = 256
+
+# Built model serializers, keyed by
+# (model class, driver, settings fingerprint, stack generation),
+# stored with the settings of the components they were built from, see _lookup_serializer().
+serializer_cache = LRUCache(SERIALIZER_CACHE_SIZE)
+# Models made by repeated(), keyed by its arguments.
+repeated_cache: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+# Field loaders and known field offsets of model views, keyed by
+# (model class, driver argument, call settings, stack generation).
+view_layout_cache = LRUCache(SERIALIZER_CACHE_SIZE)
+# Model class attributes computed on first use, see Model._build().
+DEFERRED_ATTRIBUTES = (
+    "stack",
+    "_descriptors",
+    "_storage_class",
+    "_descriptor_tables",
+    "_descriptor_tables_generation",
+    "_default_state",
+    "_value_fields",
+    "_model_fields",
+)
+# Held while building model classes; models build their bases and submodels.
+_build_lock = threading.RLock()
+# Model classes being built by the thread holding _build_lock.
+_building: set = set()
 
 
 def escape(field_name: str) -> str:
@@ -41,11 +95,239 @@ class ModelProperty:
     component: ComponentT
 
 
+class DeferredAttribute:
+    """
+    Placeholder for a class attribute of a model that is not built yet.
+
+    Looking it up builds the model class, which replaces the placeholder
+    with the real value.
+    """
+
+    __slots__ = ("name",)
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        with _build_lock:
+            for cls in reversed(owner.__mro__):
+                if cls in _building:
+                    return self  # looked up while building, e.g. a field name
+                if "_pending" in cls.__dict__:
+                    cls._build()
+        if instance is None:
+            return getattr(owner, self.name)
+        return getattr(instance, self.name)
+
+
+class ModelStorage:
+    """
+    Per-instance storage of model field values, with one slot per field.
+
+    Every model class generates its own subclass of the storage class of its base,
+    see Model._build_storage().
+    """
+
+    __slots__ = ()
+    size: ClassVar[int] = 0
+
+
+class ViewLayout(NamedTuple):
+    """Field loaders of a model view and the offsets of its fixed-size prefix."""
+
+    names: dict[str, int]  # field name -> field index
+    loaders: tuple[Callable[[Any, int], tuple[Any, int]], ...]
+    offsets: tuple[int | None, ...]  # len(loaders) + 1 relative offsets, None if dynamic
+    serializers: tuple[Serializer | None, ...]  # one-field serializers, None for models
+    sizes: tuple[int | None, ...]  # static sizes of the fields, None if dynamic
+    # Loader of the whole model if some field refers to other fields, see reads_context()
+    loader: Callable[[Any, int], tuple[Any, int]] | None = None
+
+
+class ModelView:
+    """
+    Read-only view of a model dump in a buffer, see Model.view().
+
+    Fields are decoded from the buffer when first read and memoized on the view.
+    Offsets of fields preceded only by fixed-size fields are known up front,
+    the other ones are found by decoding the preceding fields.
+    len(view) is the size of the whole viewed dump.
+
+    If a field refers to other fields (e.g. a Switch keyed by a preceding field),
+    the fields can't be decoded on their own, so the whole dump is loaded on first read
+    and nested models are then read as loaded by the driver, not as views.
+    """
+
+    __slots__ = ("_layout", "_buffer", "_start", "_values", "_offsets")
+
+    def __init__(self, layout: ViewLayout, buffer: Any, offset: int = 0):
+        object.__setattr__(self, "_layout", layout)
+        object.__setattr__(self, "_buffer", buffer)
+        object.__setattr__(self, "_start", offset)
+        object.__setattr__(self, "_values", [MISSING] * len(layout.loaders))
+        object.__setattr__(self, "_offsets", list(layout.offsets))
+
+    def _locate(self, index: int) -> int:
+        offsets = self._offsets
+        if offsets[index] is None:
+            if self._layout.loader is not None:
+                self._load()
+                return offsets[index]
+            known = index
+            while offsets[known] is None:
+                known -= 1
+            for preceding in range(known, index):
+                self._get(preceding)
+        return offsets[index]
+
+    def _get(self, index: int) -> Any:
+        value = self._values[index]
+        if value is MISSING:
+            if self._layout.loader is not None:
+                self._load()
+                return self._values[index]
+            offset = self._locate(index)
+            value, size = self._layout.loaders[index](self._buffer, self._start + offset)
+            self._values[index] = value
+            self._offsets[index + 1] = offset + size
+        return value
+
+    def _load(self):
+        """Decode all the fields at once."""
+        state, size = self._layout.loader(self._buffer, self._start)
+        values = self._values
+        for name, index in self._layout.names.items():
+            values[index] = state[name]
+        self._offsets[-1] = size
+
+    def __getattr__(self, item: str) -> Any:
+        index = self._layout.names.get(item)
+        if index is None:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {item!r}")
+        return self._get(index)
+
+    def __getitem__(self, key: str) -> Any:
+        return self._get(self._layout.names[key])
+
+    def __iter__(self):
+        for name, index in self._layout.names.items():
+            yield name, self._get(index)
+
+    def __len__(self) -> int:
+        return self._locate(len(self._layout.loaders))
+
+    def __setattr__(self, key: str, value: Any):
+        raise AttributeError("model views are read-only")
+
+    def __delattr__(self, item: str):
+        raise AttributeError("model views are read-only")
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} of {len(self._layout.loaders)} fields at {self._start}>"
+
+
+# Types of the field values that can't change without setting the field again
+IMMUTABLE_TYPES = frozenset({int, float, complex, bool, str, bytes, type(None)})
+
+
+class DumpCache:
+    """
+    The last dump of a model instance made with a serializer and settings,
+    see Model.dump().
+
+    Fields holding mutable values (e.g. lists) are re-encoded on every dump,
+    as they may have changed without being set again.
+    The layout is None until the first redump(), False if fields can't be spliced,
+    e.g. if a field refers to another one (see reads_context()).
+    """
+
+    __slots__ = ("serializer", "driver", "settings", "buffer", "layout", "view", "volatile")
+
+    def __init__(self, serializer: Serializer, driver: DriverArgT, settings: dict[str, Any]):
+        self.serializer = serializer
+        self.driver = driver
+        self.settings = settings
+        self.buffer = None
+        self.layout = None
+        self.view = None
+        self.volatile = None
+
+    def reset(self, dump: Any):
+        """Cache a new full dump."""
+        if isinstance(dump, (bytes, bytearray)):
+            self.buffer = bytearray(dump)
+        else:
+            self.buffer = None
+        self.view = None
+
+    def redump(self, model: Model) -> bytes | None:
+        """
+        Splice the fields of the model set since the last dump into the cached dump.
+        Return None if the model has to be dumped entirely.
+        """
+        layout = self.layout
+        if layout is None:
+            try:
+                layout = type(model)._view_layout(self.driver, self.settings)
+            except Exception:  # pylint: disable=W0703
+                layout = False  # some field can't be dumped on its own
+            # Nested models may change on their own, so they are always dumped,
+            # and fields referring to other fields may change with them
+            if layout and (None in layout.serializers or layout.loader is not None):
+                layout = False
+            self.layout = layout
+        if not layout:
+            return None
+        volatile = self.volatile
+        if volatile is None:
+            volatile = self.volatile = {
+                field for field in model._choose_descriptors(self.settings).values()
+                if type(field.get_state(model)) not in IMMUTABLE_TYPES
+            }
+        changed = model._dirty | volatile if volatile else model._dirty
+        splices = []
+        for field in changed:
+            name = field.component.name
+            index = layout.names.get(name)
+            if index is None:  # not chosen with these settings
+                continue
+            if layout.sizes[index] is None:
+                return None
+            value = field.get_state(model)
+            if value is MISSING:
+                return None
+            if type(value) not in IMMUTABLE_TYPES:
+                volatile.add(field)
+            splices.append((index, name, value))
+        buffer = self.buffer
+        if splices:
+            view = self.view
+            if view is None:
+                view = self.view = ModelView(layout, buffer)
+            try:
+                for index, name, value in splices:
+                    serializer = layout.serializers[index]
+                    state = {name: value}
+                    if not serializer.trusted:
+                        state = serializer.ensure_load_type(state)
+                    serializer.dump_into(state, buffer, view._locate(index), self.settings)
+            except Exception:  # pylint: disable=W0703
+                # E.g. a field depending on other fields can't be dumped on its own
+                return None
+        model._dirty.clear()
+        return bytes(buffer)
+
+
 class Field(ModelProperty):
     def __init__(self, component: ComponentT):
         self.component = component
-        self.states = IDLookupDictionary()
-        self.models = IDLookupDictionary()
+        self.slot = None
+        self._read = self._write = None
+
+    def bind(self, slot) -> None:
+        """Bind this field to a member descriptor of a model storage class."""
+        self.slot = slot
+        self._read, self._write = slot.__get__, slot.__set__
 
     @functools.cached_property
     def refers_to_model(self):
@@ -53,10 +335,12 @@ class Field(ModelProperty):
 
     def get_component(self, model: Model) -> Serializer | Model:
         if self.refers_to_model:
-            component = self.models.get(model)
-            if component is None:
+            storage = model._storage
+            try:
+                component = self._read(storage)
+            except AttributeError:
                 component = self.component()
-                self.models[model] = component
+                self._write(storage, component)
         else:
             component = self.component
         return component
@@ -68,7 +352,10 @@ class Field(ModelProperty):
             if settings is None:
                 settings = {}
             return self.get_component(instance).get_state(empty, **settings)
-        state = self.states.setdefault(instance, empty)
+        try:
+            state = self._read(instance._storage)
+        except AttributeError:
+            return empty
         return empty if state is MISSING else state
 
     def __get__(self, instance: Model | None, owner: type[Model] | None) -> Any:
@@ -86,7 +373,8 @@ class Field(ModelProperty):
             else:
                 model.set_state(state)
         else:
-            self.states[instance] = state
+            self._write(instance._storage, state)
+        instance._dirty.add(self)
 
     def __call__(self, state) -> Any:
         self.__set__(state=state)
@@ -131,6 +419,11 @@ class Model:
     _field_alias_class = FieldAlias
     _repeated_name_template = None
     _repeated_member_name_template = None
+    _storage_class: ClassVar[type[ModelStorage]] = ModelStorage
+    _settings: Settings | None = None  # see _get_settings()
+    _dump_cache: DumpCache | None = None  # see dump()
+    _dumped: bool = False  # see dump()
+    _pending: tuple | None = None  # see _build()
 
     def __init__(
         self,
@@ -149,11 +442,12 @@ class Model:
         propagate_driver = self.settings.pop("propagate_driver", True)
         settings = self._normalize_settings(settings)
 
+        self._storage = self._storage_class()
+        self._dirty = set()  # fields set since the last dump
         self._defaults = defaults
         self._empty = empty
 
-        self._infer_states(settings)
-        self._init_defaults()
+        self._init_state(defaults, settings)
 
         self.contained: bool = False
 
@@ -172,21 +466,75 @@ class Model:
         self.settings = {**self.settings, **settings}
 
     def _choose_descriptors(self, settings: SettingsT) -> dict[Any, Field]:
+        """
+        Return the descriptors of the components chosen with the given settings.
+        The returned dictionary may be shared, it must not be modified.
+        """
+        cls = type(self)
+        stack = cls.stack
+        try:
+            key = stack.selection_key({**settings, **self.settings})
+            hash(key)
+        except TypeError:  # unhashable settings, can't cache
+            key = None
+        if key is None:
+            return self._select_descriptors(settings)
+        if cls._descriptor_tables_generation != stack.generation:
+            cls._descriptor_tables = {}
+            cls._descriptor_tables_generation = stack.generation
+        descriptors = cls._descriptor_tables.get(key)
+        if descriptors is None:
+            descriptors = cls._descriptor_tables[key] = self._select_descriptors(settings)
+        return descriptors
+
+    def _select_descriptors(self, settings: SettingsT) -> dict[Any, Field]:
         namespace = set(self.choose_components(**settings))
         descriptors = {
             name: desc for name, desc in self._descriptors.items() if name in namespace
         }
         return descriptors
 
-    def _infer_states(self, settings: SettingsT):
-        for key in settings.copy():
-            if key in self._descriptors:
-                self[key] = settings.pop(key)
-
-    def _init_defaults(self):
-        for key, value in self.default.items():
-            if self[key] is MISSING:
-                self[key] = value
+    def _init_state(self, defaults: dict[str, Any], settings: SettingsT):
+        """
+        Set the fields passed as keyword arguments and the default values
+        of the fields not passed, see _build_defaults().
+        """
+        for field in self._model_fields:
+            field.get_component(self)
+        state = self._default_state
+        if defaults:
+            state = {**defaults, **state}
+        descriptors = self._descriptors
+        values = [key for key in settings if key in descriptors]
+        if values:
+            state = state.copy()
+            for key in values:
+                value = settings.pop(key)
+                if key in self._value_fields:
+                    if value is not MISSING or key not in state:
+                        state[key] = value
+                else:
+                    self[key] = value
+        if not self._write_state(state):
+            for key, value in state.items():
+                if self[key] is MISSING:
+                    self[key] = value
+
+    def _write_state(self, state: dict) -> bool:
+        """
+        Write a state of plain fields straight into the storage.
+        Return False without doing anything if the state has any other keys.
+        """
+        fields = self._value_fields
+        if not state.keys() <= fields.keys():
+            return False
+        storage = self._storage
+        dirty = self._dirty
+        for key, value in state.items():
+            field = fields[key]
+            field._write(storage, value)
+            dirty.add(field)
+        return True
 
     @property
     def default(self) -> Any:
@@ -206,6 +554,8 @@ class Model:
     def configure(cls, **settings):
         cls.name = settings.pop("name", cls.name)
         cls.settings.update(settings)
+        Serializer.settings_generation += 1
+        view_layout_cache.invalidate(lambda key: issubclass(key[0], cls))
         return cls
 
     def get_state(self, empty=MISSING, /, **settings: Any) -> dict:
@@ -236,9 +586,10 @@ class Model:
     def impl(
         self, driver: DriverArgT = None, settings: SettingsT = None, final: bool = False
     ):
-        if settings is None:
-            settings = {}
-        settings = {**settings, **self.settings}
+        if settings:
+            settings = Settings(settings).layer(self._get_settings())
+        else:
+            settings = self._get_settings()
         default_driver = self.default_driver
 
         if driver is None:
@@ -248,19 +599,20 @@ class Model:
 
         elif isinstance(driver, str):
             driver_name = driver
-            with contextlib.suppress(ValueError):
-                load_driver(driver_name)
-            driver = Driver.registry.get(driver_name, default_driver)
+            driver = Driver.registry.get(driver_name)
+            if driver is None:
+                with contextlib.suppress(ValueError):
+                    load_driver(driver_name)
+                driver = Driver.registry.get(driver_name, default_driver)
             if driver is None:
                 raise ValueError(f"no driver named {driver_name!r} available")
 
         if isinstance(driver, DriverMeta):
-            settings.update(name=self.name)
-            serializer = driver.lookup_model_serializer(self, **settings)
+            serializer = self._lookup_serializer(driver, settings)
 
         else:
             serializer = driver
-            settings.update(name=self.name, default=self.default)
+            settings = settings.layer(default=self.default)
             serializer = serializer.get_dep(serializer, **settings)
 
         if final:
@@ -268,11 +620,284 @@ class Model:
 
         return serializer
 
+    def _get_settings(self) -> Settings:
+        """Return the settings of this model with its name, as a Settings object."""
+        settings = self._settings
+        if settings is None or settings.get("name") != self.name:
+            settings = self._settings = Settings(self.settings, name=self.name)
+        return settings
+
+    def _lookup_serializer(self, driver: DriverMeta, settings: Settings) -> Serializer:
+        try:
+            key = (type(self), driver, settings, self.stack.generation)
+            hash(key)
+        except TypeError:  # unhashable settings, can't cache
+            return driver.lookup_model_serializer(self, **settings)
+        entry = serializer_cache.get(key)
+        if entry is not None:
+            serializer, settings_generation, components_settings = entry
+            if settings_generation == Serializer.settings_generation:
+                return serializer
+            # Some serializer was configured since, check the components of this model
+            if components_settings == _components_settings(type(self)):
+                serializer_cache[key] = (
+                    serializer, Serializer.settings_generation, components_settings
+                )
+                return serializer
+        serializer = driver.lookup_model_serializer(self, **settings)
+        serializer_cache[key] = (
+            serializer, Serializer.settings_generation, _components_settings(type(self))
+        )
+        return serializer
+
+    @classmethod
+    def invalidate_cache(cls) -> int:
+        """
+        Forget the serializers built for this model class and its subclasses.
+        Serializers built before the model stack was modified are not used anyway,
+        this only frees them up.
+        """
+        view_layout_cache.invalidate(lambda key: issubclass(key[0], cls))
+        return serializer_cache.invalidate(lambda key: issubclass(key[0], cls))
+
     def dump(self, driver: DriverArgT = None, /, **settings: Any) -> Any:
+        """
+        Dump this model.
+
+        From the second dump of an instance on, the dump is cached on the instance:
+        if only fixed-size fields were set since the previous dump with the same driver
+        and settings, their new bytes are spliced into the cached dump instead of
+        encoding the whole model again. Instances dumped once keep no copy of their dump.
+        """
         serializer = self.impl(driver, settings)
-        source = serializer.ensure_load_type(self.get_state(**settings))
+        if not self._dumped:
+            dump = self._dump(serializer, settings)
+            self._dumped = True
+            self._dirty.clear()
+            return dump
+        cache = self._dump_cache
+        if cache is None or cache.serializer is not serializer or cache.settings != settings:
+            if not (driver is None or isinstance(driver, (str, DriverMeta))):
+                return self._dump(serializer, settings)
+            cache = self._dump_cache = DumpCache(serializer, driver, settings)
+        elif cache.buffer is not None:
+            dump = cache.redump(self)
+            if dump is not None:
+                return dump
+        dump = self._dump(serializer, settings)
+        cache.reset(dump)
+        self._dirty.clear()
+        return dump
+
+    def _dump(self, serializer: Serializer, settings: dict[str, Any]) -> Any:
+        source = self.get_state(**settings)
+        if not serializer.trusted:
+            source = serializer.ensure_load_type(source)
         return serializer.dump(source, settings)
 
+    @property
+    def dirty_fields(self) -> frozenset[str]:
+        """Return the names of the fields set since the last dump of this model."""
+        dirty = self._dirty
+        return frozenset(name for name, field in self._descriptors.items() if field in dirty)
+
+    def dump_into(
+        self, buffer: Any, offset: int = 0, driver: DriverArgT = None, /, **settings: Any
+    ) -> int:
+        """
+        Dump this model into a writable buffer (a bytearray, memoryview, mmap...)
+        at an offset, return the number of bytes written.
+
+        The buffer must be large enough, it is never resized.
+        """
+        serializer = self.impl(driver, settings)
+        source = self.get_state(**settings)
+        if not serializer.trusted:
+            source = serializer.ensure_load_type(source)
+        return serializer.dump_into(source, buffer, offset, settings)
+
+    @classmethod
+    def view(
+        cls, buffer: Any, offset: int = 0, driver: DriverArgT = None, /, **settings: Any
+    ) -> ModelView:
+        """
+        Return a read-only view of this model's dump in a buffer (bytes, a bytearray,
+        memoryview, mmap...) at an offset, decoding every field only when it is read.
+        """
+        return ModelView(cls._view_layout(driver, settings), buffer, offset)
+
+    @classmethod
+    def _view_layout(cls, driver: DriverArgT, settings: SettingsT) -> ViewLayout:
+        try:
+            key = (cls, driver, Settings(settings), cls.stack.generation)
+            hash(key)
+        except TypeError:  # unhashable settings, can't cache
+            key = None
+        layout = None if key is None else view_layout_cache.get(key)
+        if layout is None:
+            template = cls()
+            layout = cls._build_view_layout(
+                template.impl(driver, settings).driver,
+                Settings(settings).layer(template._get_settings()),
+            )
+            if key is not None:
+                view_layout_cache[key] = layout
+        return layout
+
+    @classmethod
+    def _build_view_layout(cls, driver: DriverMeta, settings: Settings) -> ViewLayout:
+        """Build a loader of every chosen field, each one wrapped in a one-field model."""
+        names, loaders, offsets, serializers, sizes = {}, [], [0], [], []
+        offset = 0
+        components = cls.stack.choose_components(settings)
+        for name, component in components.items():
+            model = component if isinstance(component, type) else type(component)
+            if issubclass(model, Model):
+                loader = functools.partial(_load_view, model, driver, settings)
+                serializer = None
+                size = model.static_size(driver, **settings)
+            else:
+                stack = Stack()
+                stack.push(component)
+                wrapper = create_model(stack=stack, name=cls.name)
+                serializer = wrapper().impl(driver, settings)
+                loader = functools.partial(_load_field, serializer, name, settings)
+                size = serializer.static_size(settings)
+            names[name] = len(loaders)
+            loaders.append(loader)
+            serializers.append(serializer)
+            sizes.append(size)
+            if offset is not None and size is not None:
+                offset += size
+            else:
+                offset = None
+            offsets.append(offset)
+        loader = None
+        if any(map(reads_context, components.values())):
+            loader = functools.partial(_load_state, cls().impl(driver, settings), settings)
+        return ViewLayout(
+            names, tuple(loaders), tuple(offsets), tuple(serializers), tuple(sizes), loader
+        )
+
+    @classmethod
+    def static_size(cls, driver: DriverArgT = None, /, **settings: Any) -> int | None:
+        """
+        Return the size of every dump of this model in bytes if it is fixed
+        (all the chosen components are fixed-size), or None otherwise.
+
+        The size is computed once per serializer, i.e. per driver and settings.
+        """
+        serializer = cls().impl(driver, settings)
+        return serializer.static_size(settings)
+
+    def encoded_size(self, driver: DriverArgT = None, /, **settings: Any) -> int:
+        """Return the size of the dump of this model in bytes, without dumping it."""
+        serializer = self.impl(driver, settings)
+        size = serializer.static_size(settings)
+        if size is not None:
+            return size
+        source = self.get_state(**settings)
+        if not serializer.trusted:
+            source = serializer.ensure_load_type(source)
+        return serializer.encoded_size(source, settings)
+
+    @classmethod
+    def dump_many(
+        cls,
+        instances: Iterable[Model],
+        driver: DriverArgT = None,
+        /,
+        *,
+        output: str = "list",
+        **settings: Any,
+    ) -> list | tuple[bytes, array.array]:
+        """
+        Dump many instances of this model, resolving and configuring the serializer once.
+
+        All the instances are dumped with the serializer of the first one.
+        Return a list of dumps if output is "list", or a tuple (buffer, offsets)
+        if output is "buffer", where buffer is all the dumps concatenated and offsets
+        is an array of len(instances) + 1 integers, the i-th dump being
+        buffer[offsets[i]:offsets[i + 1]].
+        """
+        if output not in ("list", "buffer"):
+            raise ValueError(f"invalid output: {output!r}")
+        instances = list(instances)
+        template = instances[0] if instances else cls()
+        serializer = template.impl(driver, settings)
+        sources = [instance.get_state(**settings) for instance in instances]
+        if not serializer.trusted:
+            sources = list(map(serializer.ensure_load_type, sources))
+        dumps = serializer.dump_many(sources, settings)
+        if output == "list":
+            return dumps
+        offsets = array.array("Q", itertools.accumulate(map(len, dumps), initial=0))
+        return b"".join(dumps), offsets
+
+    @classmethod
+    def load_many(
+        cls,
+        dumps: Iterable[Any] | Any,
+        driver: DriverArgT = None,
+        /,
+        *,
+        offsets: Sequence[int] | None = None,
+        output: str = "models",
+        **settings: Any,
+    ) -> list:
+        """
+        Load many dumps of this model, resolving and configuring the serializer once.
+
+        Dumps are either an iterable of separate dumps, or one buffer (or a binary
+        stream that is read to its end) split at offsets, as returned by
+        dump_many(..., output="buffer").
+        Return a list of model instances if output is "models",
+        or a list of the loaded states if output is "states".
+        """
+        if output not in ("models", "states"):
+            raise ValueError(f"invalid output: {output!r}")
+        if offsets is not None:
+            buffer = dumps.read() if hasattr(dumps, "read") else dumps
+            dumps = (buffer[start:end] for start, end in zip(offsets, offsets[1:]))
+        elif hasattr(dumps, "read"):
+            raise ValueError("offsets are required to load from a stream")
+        serializer = cls().impl(driver, settings)
+        if not serializer.trusted:
+            dumps = map(serializer.ensure_dump_type, dumps)
+        loads = serializer.load_many(dumps, settings)
+        if output == "states":
+            return loads
+        return [cls().load_state(load) for load in loads]
+
+    @classmethod
+    def iter_load(
+        cls, stream: Any, driver: DriverArgT = None, /, **settings: Any
+    ) -> Iterator[Model]:
+        """
+        Lazily load successive instances of this model from a binary file-like object
+        or a socket, until it is exhausted.
+
+        Only a bounded part of the stream is buffered at a time, see StreamReader.
+        """
+        if not isinstance(stream, StreamReader):
+            stream = StreamReader(stream)
+        serializer = cls().impl(driver, settings)
+        for load in serializer.iter_load(stream, settings):
+            yield cls().load_state(load)
+
+    @classmethod
+    def decoder(cls, driver: DriverArgT = None, /, **settings: Any) -> Decoder:
+        """
+        Return a push-style incremental decoder of successive instances of this model.
+
+        decoder.feed(chunk) returns an iterator of the instances completed by the chunk;
+        a partially received instance is kept parsed up to the last complete field.
+        """
+        serializer = cls().impl(driver, settings)
+        return Decoder(
+            serializer.incremental_loader(settings), lambda load: cls().load_state(load)
+        )
+
     def load(
         self, driver: DriverArgT = None, dump: Any = MISSING, /, **settings
     ) -> Model:
@@ -284,12 +909,26 @@ class Model:
         if dump is MISSING:
             raise ValueError("the source to load from is a required argument")
         serializer = self.impl(driver, settings)
-        source = serializer.ensure_dump_type(dump)
-        return serializer.load(source, settings)
+        if not serializer.trusted:
+            dump = serializer.ensure_dump_type(dump)
+        return serializer.load(dump, settings)
+
+    def load_from(
+        self, buffer: Any, offset: int = 0, driver: DriverArgT = None, /, **settings
+    ) -> int:
+        """
+        Load this model from a buffer (bytes, a bytearray, memoryview, mmap...)
+        at an offset without copying the buffer, return the number of bytes consumed.
+        """
+        serializer = self.impl(driver, settings)
+        load, consumed = serializer.load_from(buffer, offset, settings)
+        self.load_state(load)
+        return consumed
 
     def load_state(self, load: Any):
         state = self.read_state(load)
-        self.set_state(state)
+        if not (type(state) is dict and self._write_state(state)):
+            self.set_state(state)
         return self
 
     # noinspection PyPropertyDefinition
@@ -349,6 +988,8 @@ class Model:
         if key in self._descriptors:
             self._descriptors[key].__set__(self, value)
             return
+        if key == "settings":
+            object.__setattr__(self, "_settings", None)
         # TODO: find a better way to do it
         object.__setattr__(self, key, value)
 
@@ -372,14 +1013,17 @@ class Model:
         return tuple(state.values()) < tuple(other_state.values())
 
     @classmethod
-    def _build_stack(cls, stack, settings):
-        cls._descriptors = final = collections.OrderedDict()
+    def _build_stack(cls, stack, settings, components, inherited=None):
+        final = collections.OrderedDict()
         descriptors = {}
         seen_descriptors = IDLookupDictionary()
+        if inherited:
+            descriptors.update(inherited)
+            for field in inherited.values():
+                if isinstance(field, Field):
+                    seen_descriptors[field.component] = field
 
-        for idx, (attribute, component) in enumerate(
-            inspect.getmembers(cls, check_component), start=1
-        ):
+        for idx, (attribute, component) in enumerate(components, start=stack.size + 1):
             seen = seen_descriptors.get(component)
             attribute_unescaped = unescape(attribute)
 
@@ -406,11 +1050,12 @@ class Model:
         final.update(sorted(descriptors.items(), key=lambda kv: kv[1].priority))
         descriptors.clear()
         seen_descriptors.clear()
+        return final
 
     @classmethod
     def _load_stack(cls, stack, settings: SettingsT):
-        components = stack.choose_components(**settings)
-        cls._descriptors = descriptors = collections.OrderedDict()
+        components = stack.choose_components(settings)
+        descriptors = collections.OrderedDict()
 
         for idx, (name, component) in enumerate(components.items(), start=1):
             component.settings.setdefault("priority", idx)
@@ -418,6 +1063,53 @@ class Model:
             while isinstance(getattr(cls, name, None), ModelProperty):
                 name = escape(name)
             setattr(cls, name, descriptor)
+        return descriptors
+
+    @classmethod
+    def _build_storage(cls, descriptors) -> type[ModelStorage]:
+        """
+        Generate the storage class of this model, with a slot for every field
+        not stored by the storage class of the base model yet.
+        """
+        base = super(cls, cls)._storage_class
+        fields = [
+            field for field in descriptors.values()
+            if isinstance(field, Field) and field.slot is None
+        ]
+        slots = tuple(f"_{idx}" for idx in range(base.size, base.size + len(fields)))
+        storage_class = type(
+            cls.__name__ + "Storage",
+            (base,),
+            {"__slots__": slots, "__module__": cls.__module__, "size": base.size + len(slots)},
+        )
+        for field, slot in zip(fields, slots):
+            field.bind(getattr(storage_class, slot))
+        return storage_class
+
+    @classmethod
+    def _build_defaults(cls, descriptors) -> dict[str, Any]:
+        """
+        Sort out the fields storing plain values from the fields of submodels
+        and gather the default values of the former, used by __init__().
+        """
+        value_fields = {}
+        model_fields = []
+        for name, field in descriptors.items():
+            if not isinstance(field, Field):
+                continue
+            if field.refers_to_model:
+                model_fields.append(field)
+            else:
+                value_fields[name] = field
+        return dict(
+            _value_fields=value_fields,
+            _model_fields=tuple(model_fields),
+            _default_state={
+                name: field.component.default
+                for name, field in value_fields.items()
+                if field.component.default is not MISSING
+            },
+        )
 
     @classmethod
     def _normalize_settings(cls, settings: SettingsT):
@@ -436,9 +1128,68 @@ class Model:
         include: tuple[str, ...] | None = None,
         **settings: Any,
     ):
+        # Only the own namespace is scanned, inherited fields come from the base stack
+        components = sorted(
+            (item for item in cls.__dict__.items() if check_component(item[1])),
+            key=lambda item: item[0],
+        )
+        settings = cls._normalize_settings(settings)
+        cls._pending = (stack, build_stack, stack_class, include, components, dict(settings))
+        for attribute in DEFERRED_ATTRIBUTES:
+            setattr(cls, attribute, DeferredAttribute(attribute))
+        for attribute, _ in components:
+            setattr(cls, attribute, DeferredAttribute(attribute))
+
+        if serializer is not None:
+            cls.serializer = serializer
+
+        cls.settings = settings
+
+        if name is None:
+            name = cls.__name__.casefold()
+        cls.name = name
+
+        if stack is not None:
+            # Fields of a given stack are not known before loading it
+            cls._build()
+
+    @classmethod
+    def _build(cls):
+        """
+        Build the stack, the fields and the storage class of this model.
+
+        Deferred from class creation until any of them is first needed.
+        The built attributes replace the placeholders all at once under _build_lock,
+        so other threads never see a partially built model.
+        """
+        with _build_lock:
+            pending = cls.__dict__.get("_pending")
+            if pending is None:
+                return
+            for base in reversed(cls.__mro__[1:]):
+                if "_pending" in base.__dict__:
+                    base._build()
+            _building.add(cls)
+            try:
+                cls._build_pending(*pending)
+            finally:
+                _building.discard(cls)
+            del cls._pending
+
+    @classmethod
+    def _build_pending(cls, stack, build_stack, stack_class, include, components, settings):
+        # Class creation arguments take precedence over clashing field names
+        preserved = {
+            attribute: cls.__dict__[attribute]
+            for attribute in ("serializer", "settings", "name")
+            if attribute in cls.__dict__
+            and not isinstance(cls.__dict__[attribute], DeferredAttribute)
+        }
+
         if build_stack is None:
             build_stack = stack is None
 
+        inherited = None
         if stack is None:
             base = cls.__base__
             stack = stack_class()
@@ -448,38 +1199,92 @@ class Model:
                     for component in include_from:
                         stack.push(component)
                 else:
-                    for name in include:
+                    for included in include:
                         matched = tuple(
-                            filter(lambda comp: comp.name == name, include_from)
+                            filter(lambda comp: comp.name == included, include_from)
                         )
                         if len(matched) > 1:
-                            raise ValueError(f"multiple components match name {name!r}")
+                            raise ValueError(f"multiple components match name {included!r}")
                         if len(matched) == 0:
-                            raise ValueError(f"no component matches name {name!r}")
+                            raise ValueError(f"no component matches name {included!r}")
                         stack.push(*matched)
-
-        settings = cls._normalize_settings(settings)
+                # Fields of the base model, bound to the slots of its storage class
+                pushed = set(map(id, stack.all()))
+                inherited = {
+                    name: field for name, field in base._descriptors.items()
+                    if id(field.component) in pushed
+                }
 
         if build_stack:
-            cls._build_stack(stack, settings)
+            descriptors = cls._build_stack(stack, settings, components, inherited)
         else:
-            cls._load_stack(stack, settings)
-
-        if serializer is not None:
-            cls.serializer = serializer
-
-        cls.stack = stack
-        cls.settings = settings
-
-        if name is None:
-            name = cls.__name__.casefold()
-        cls.name = name
+            descriptors = cls._load_stack(stack, settings)
+
+        built = dict(
+            stack=stack,
+            _descriptors=descriptors,
+            _storage_class=cls._build_storage(descriptors),
+            # Descriptors chosen by stack selection keys, see _choose_descriptors()
+            _descriptor_tables={},
+            _descriptor_tables_generation=stack.generation,
+            **cls._build_defaults(descriptors),
+        )
+        for attribute, value in built.items():
+            setattr(cls, attribute, value)
+        # Components not replaced by a field stay as they were defined
+        for attribute, component in components:
+            if isinstance(cls.__dict__.get(attribute), DeferredAttribute):
+                setattr(cls, attribute, component)
+        for attribute, value in preserved.items():
+            setattr(cls, attribute, value)
+
+
+def _components_settings(model: type[Model]) -> list:
+    """Return the settings of the components of a model and its submodels, in order."""
+    settings = [dict(model.settings)]
+    for component in model.stack.snapshot():
+        if not isinstance(component, type):
+            if not isinstance(component, Model):
+                settings.append((component.name, component.default, dict(component.settings)))
+                continue
+            component = type(component)
+        settings.append(_components_settings(component))
+    return settings
+
+
+def _load_field(serializer, name, settings, buffer, offset):
+    load, size = serializer.load_from(buffer, offset, settings)
+    return load[name], size
+
+
+def _load_state(serializer, settings, buffer, offset):
+    return serializer.load_from(buffer, offset, settings)
+
+
+def _load_view(model, driver, settings, buffer, offset):
+    view = model.view(buffer, offset, driver, **settings)
+    return view, len(view)
 
 
 ComponentT = TypeVar("ComponentT", Serializer, Model)
 ComponentArgT = Union[ComponentT, Type[ComponentT]]
 
 
+def reads_context(component: ComponentT) -> bool:
+    """
+    Tell whether a component refers to other fields of its model when serialized,
+    i.e. it is a statement (e.g. Switch) or a setting of it (e.g. size) is a function.
+    """
+    if isinstance(component, type):
+        return issubclass(component, Statement)
+    if isinstance(component, Model):
+        return False
+    return isinstance(component, Statement) or any(
+        callable(value) and not isinstance(value, type)
+        for value in component.settings.values()
+    )
+
+
 def check_component(obj: Any, acknowledge_type: bool = True) -> bool:
     is_instance = isinstance(obj, (Serializer, Model))
     is_type = (
@@ -526,17 +1331,41 @@ def repeated(
     member_name_template=None,
     factory=create_model,
 ) -> Type[Model]:
+    """
+    Return a model of a component (a model class, a serializer class or instance)
+    repeated the given number of times, with one field per repetition.
+
+    The models are memoized as long as they are referenced elsewhere.
+    Repeated numbers are serialized as one array instead of separate members.
+    """
     if repeat < 1:
         raise ValueError("dimension size must be at least 1")
+    try:
+        key = (cls, repeat, name, name_template, member_name_template, factory)
+        hash(key)
+    except TypeError:  # unhashable component, can't cache
+        key = None
+    else:
+        model = repeated_cache.get(key)
+        if model is not None:
+            return model
     if name_template is None:
         name_template = REPEATED_NAME_TEMPLATE
     if member_name_template is None:
         member_name_template = REPEATED_MEMBER_NAME_TEMPLATE
+    component_type = cls if isinstance(cls, type) else type(cls)
     if name is None:
-        name = cls.__name__
+        name = component_type.__name__
     fmt = {"name": name, "size": repeat}
-    components = (
-        cls(name=member_name_template % {**fmt, "index": i + 1})
-        for i in range(repeat)
-    )
-    return factory(*components, name=name_template % fmt)
+    member_names = [member_name_template % {**fmt, "index": i + 1} for i in range(repeat)]
+    settings = {}
+    if issubclass(component_type, Model):
+        components = [cls.clone(name=member_name) for member_name in member_names]
+    else:
+        components = [cls(name=member_name) for member_name in member_names]
+        if issubclass(component_type, Number):
+            settings.update(serializer=Array, size=repeat)
+    model = factory(*components, name=name_template % fmt, **settings)
+    if key is not None:
+        repeated_cache[key] = model
+    return model
@@ -3,11 +3,13 @@ from __future__ import annotations  # Python 3.8
 import abc
 import functools
 import typing
-from typing import Any, TypeVar, Dict, Optional, Literal
+from typing import Any, ClassVar, TypeVar, Mapping, Optional, Literal
 
 from netcast.constants import MISSING
 from netcast.exceptions import NetcastError
+from netcast.tools.collections import Settings, freeze
 from netcast.tools.inspection import match_params
+from netcast.tools.streams import BufferReader
 
 if typing.TYPE_CHECKING:
     from typing import Union, Type
@@ -20,7 +22,7 @@ else:
     DepT = TypeVar("DepT")
 
 
-SettingsT = Optional[Dict[str, Any]]
+SettingsT = Optional[Mapping[str, Any]]
 Phase = Literal["dump", "load", "both"]
 
 
@@ -29,6 +31,12 @@ class Serializer:
 
     load_type: type | None = None
     dump_type: type | None = None
+    _configured: bool = False
+    _fixed_size: int | None = MISSING  # cached static_size()
+    # Changes whenever any serializer is configured, see VersionAwareStack._get_index()
+    settings_generation: ClassVar[int] = 0
+    # Trust that the objects to dump and load have the proper types, skipping casts
+    trusted: bool = False
 
     def __init__(
         self,
@@ -56,7 +64,8 @@ class Serializer:
         if settings is None:
             settings = {}
         settings = self.configure(**settings)
-        obj = self._cast(obj, "dump", settings)
+        if not self.trusted:
+            obj = self._cast(obj, "dump", settings)
         try:
             obj = self._dump(obj, settings, **kwargs)
         except Exception as exc:
@@ -77,12 +86,149 @@ class Serializer:
             obj = self._load(obj, settings, **kwargs)
         except Exception as exc:
             raise NetcastError(f"loading failed: {exc}") from exc
-        obj = self._cast(obj, "load", settings)
+        if not self.trusted:
+            obj = self._cast(obj, "load", settings)
         return obj
 
+    def dump_into(
+        self, obj, buffer, offset: int = 0, settings: SettingsT = None, /, **kwargs
+    ) -> int:
+        """
+        Dump a loaded object into a writable buffer at an offset,
+        return the number of bytes written.
+        """
+        if settings is None:
+            settings = {}
+        settings = self.configure(**settings)
+        if not self.trusted:
+            obj = self._cast(obj, "dump", settings)
+        try:
+            return self._dump_into(obj, buffer, offset, settings, **kwargs)
+        except Exception as exc:
+            raise NetcastError(f"dumping failed: {exc}") from exc
+
+    def load_from(
+        self, buffer, offset: int = 0, settings: SettingsT = None, /, **kwargs
+    ) -> tuple[Any, int]:
+        """
+        Load an object from a buffer at an offset without copying the buffer,
+        return the loaded object and the number of bytes consumed.
+        """
+        if settings is None:
+            settings = {}
+        settings = self.configure(**settings)
+        try:
+            obj, consumed = self._load_from(buffer, offset, settings, **kwargs)
+        except Exception as exc:
+            raise NetcastError(f"loading failed: {exc}") from exc
+        if not self.trusted:
+            obj = self._cast(obj, "load", settings)
+        return obj, consumed
+
+    def static_size(self, settings: SettingsT = None, /) -> int | None:
+        """
+        Return the size of every dump in bytes if it is fixed,
+        or None if the size depends on the dumped object.
+        """
+        if settings is None:
+            settings = {}
+        settings = self.configure(**settings)
+        size = self._fixed_size
+        if size is MISSING:
+            try:
+                size = self._static_size(settings)
+            except Exception as exc:
+                raise NetcastError(f"sizing failed: {exc}") from exc
+            self._fixed_size = size
+        return size
+
+    def encoded_size(self, obj, settings: SettingsT = None, /, **kwargs) -> int:
+        """Return the size of the dump of a loaded object in bytes, without dumping it."""
+        size = self.static_size(settings)
+        if size is not None:
+            return size
+        settings = self.settings
+        if not self.trusted:
+            obj = self._cast(obj, "dump", settings)
+        try:
+            return self._encoded_size(obj, settings, **kwargs)
+        except Exception as exc:
+            raise NetcastError(f"sizing failed: {exc}") from exc
+
+    def dump_many(self, objs, settings: SettingsT = None, /, **kwargs) -> list:
+        """Dump many loaded objects, configuring this serializer only once."""
+        if settings is None:
+            settings = {}
+        settings = self.configure(**settings)
+        trusted, cast, dump = self.trusted, self._cast, self._dump
+        dumps = []
+        for obj in objs:
+            if not trusted:
+                obj = cast(obj, "dump", settings)
+            try:
+                dumps.append(dump(obj, settings, **kwargs))
+            except Exception as exc:
+                raise NetcastError(f"dumping failed: {exc}") from exc
+        return dumps
+
+    def load_many(self, objs, settings: SettingsT = None, /, **kwargs) -> list:
+        """Load many dumped objects, configuring this serializer only once."""
+        if settings is None:
+            settings = {}
+        settings = self.configure(**settings)
+        trusted, cast, load = self.trusted, self._cast, self._load
+        loads = []
+        for obj in objs:
+            try:
+                obj = load(obj, settings, **kwargs)
+            except Exception as exc:
+                raise NetcastError(f"loading failed: {exc}") from exc
+            loads.append(obj if trusted else cast(obj, "load", settings))
+        return loads
+
+    def iter_load(self, stream, settings: SettingsT = None, /, **kwargs):
+        """
+        Lazily load successive objects from a stream reader until it is exhausted.
+
+        The stream is a netcast.tools.streams.StreamReader.
+        """
+        if settings is None:
+            settings = {}
+        settings = self.configure(**settings)
+        trusted, cast, load = self.trusted, self._cast, self._load_stream
+        while not stream.at_eof():
+            try:
+                obj = load(stream, settings, **kwargs)
+            except Exception as exc:
+                raise NetcastError(f"loading failed: {exc}") from exc
+            yield obj if trusted else cast(obj, "load", settings)
+
+    def incremental_loader(self, settings: SettingsT = None, /, **kwargs):
+        """
+        Return a generator function loading one object incrementally,
+        to be used with netcast.tools.streams.Decoder.
+        """
+        if settings is None:
+            settings = {}
+        settings = self.configure(**settings)
+        cast, load = self._cast, self._load_incremental
+        if self.trusted:
+            return functools.partial(load, settings, **kwargs)
+
+        def loader():
+            obj = yield from load(settings, **kwargs)
+            return cast(obj, "load", settings)
+
+        return loader
+
     def configure(self, **settings):
         """Configure this serializer, possibly applying new settings to public attributes."""
+        if self._configured and self._has_settings(settings):
+            return self.settings
+        self._invalidate()
+        self._fixed_size = MISSING
         self.settings.update(settings)
+        Serializer.settings_generation += 1
         matched = match_params(self._configure, self.settings)
         self._configure(**matched)
         new_settings = self.settings
@@ -91,8 +237,21 @@ class Serializer:
                 continue
             if hasattr(self, attr):
                 setattr(self, attr, value)
+        self._configured = True
         return new_settings
 
+    def _has_settings(self, settings: dict[str, Any]) -> bool:
+        """Return True if the given settings are already applied."""
+        current = self.settings
+        for key, value in settings.items():
+            old_value = current.get(key, MISSING)
+            if old_value is not value and (old_value is MISSING or old_value != value):
+                return False
+        return True
+
+    def _invalidate(self):
+        """Forget whatever was built with the previous configuration."""
+
     def impl(self, driver=None, settings=None, final=False):
         return NotImplemented
 
@@ -105,6 +264,41 @@ class Serializer:
     def _load(self, obj, settings, **kwargs):
         """Load an object."""
 
+    def _dump_into(self, obj, buffer, offset, settings, **kwargs) -> int:
+        """Dump an object into a writable buffer, return the number of bytes written."""
+        data = self._dump(obj, settings, **kwargs)
+        size = len(data)
+        with memoryview(buffer) as view:
+            if offset + size > len(view):
+                raise ValueError("buffer too small")
+            view[offset:offset + size] = data
+        return size
+
+    def _static_size(self, settings) -> int | None:
+        """Return the size of every dump in bytes, or None if it isn't fixed."""
+        return None
+
+    def _encoded_size(self, obj, settings, **kwargs) -> int:
+        """Return the size of the dump of an object, by dumping it if nothing better is known."""
+        return len(self._dump(obj, settings, **kwargs))
+
+    def _load_from(self, buffer, offset, settings, **kwargs) -> tuple[Any, int]:
+        """Load an object from a buffer, return it with the number of bytes consumed."""
+        with BufferReader(buffer, offset) as stream:
+            obj = self._load_stream(stream, settings, **kwargs)
+            return obj, stream.tell()
+
+    def _load_stream(self, stream, settings, **kwargs):
+        """Load an object from a stream reader, consuming exactly the bytes it takes."""
+        raise NotImplementedError(f"{type(self).__name__} can't load from streams")
+
+    def _load_incremental(self, settings, **kwargs):
+        """
+        Load an object with a generator that yields the number of bytes it needs
+        or a terminator of the bytes it needs, see netcast.tools.streams.Decoder.
+        """
+        raise NotImplementedError(f"{type(self).__name__} can't load incrementally")
+
     def load_type_guard(self, obj):
         if self.load_type is None or isinstance(obj, self.load_type):
             return obj
@@ -260,7 +454,24 @@ class Interface(Serializer):
             dep = resolved
 
         dep = self.get_dep(dep, **settings)
-        settings = {**dep.settings, **settings}
+        settings = Settings(dep.settings).layer(settings)
+        key = self._memo_key(dep, settings)
+        if key is None:
+            return self._build_impl(dep, settings)
+        return self.driver.memoize(key, lambda: self._build_impl(dep, settings))
+
+    @staticmethod
+    def _memo_key(dep: DepT, settings: Settings):
+        if not isinstance(dep, Serializer):  # models are cached on their own
+            return None
+        try:
+            key = type(dep), dep.name, freeze(dep.default), settings
+            hash(key)
+        except TypeError:  # unhashable settings, can't memoize
+            return None
+        return key
+
+    def _build_impl(self, dep: DepT, settings: Settings):
         impl = dep.impl(self.driver, settings, final=True)
 
         if impl is NotImplemented:
@@ -268,10 +479,7 @@ class Interface(Serializer):
             resolved_type = self.driver.lookup_type(dep_type)
 
             if resolved_type is not NotImplemented:
-                settings.update(
-                    name=dep.name,
-                    default=dep.default,
-                )
+                settings = settings.layer(name=dep.name, default=dep.default)
                 dep = self.get_dep(resolved_type, **settings)
                 impl = dep.impl(self.driver, settings, final=True)
 
@@ -287,9 +495,9 @@ class Interface(Serializer):
 
     def get_deps(self, deps: tuple[DepT, ...], settings: SettingsT) -> tuple[DepT, ...]:
         final_deps = []
+        settings = Settings.of(settings)
         for dep in deps:
-            local_settings = settings.copy()
-            local_settings.update(name=dep.name, default=dep.default)
+            local_settings = settings.layer(name=dep.name, default=dep.default)
             final_deps.append(self.get_dep(dep, **local_settings))
         return deps
 
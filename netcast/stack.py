@@ -1,15 +1,13 @@
 from __future__ import annotations
 
-import functools
-import heapq
-import operator
+import bisect
 import string
 import threading
 import typing
 from typing import Callable, Type
 
 from netcast import GREATEST, LEAST
-from netcast.tools.collections import Comparable
+from netcast.tools.collections import Comparable, IndexedHeap
 from netcast.serializer import Serializer, SettingsT
 
 if typing.TYPE_CHECKING:
@@ -19,18 +17,6 @@ if typing.TYPE_CHECKING:
 __all__ = ("Stack", "SelectiveStack", "VersionAwareStack")
 
 
-@functools.total_ordering
-class _PrioritySortWrapper:
-    def __init__(self, component):
-        self.component = component
-
-    def __eq__(self, other: _PrioritySortWrapper) -> bool:
-        return self.component.priority == other.component.priority
-
-    def __lt__(self, other: _PrioritySortWrapper) -> bool:
-        return self.component.priority < other.component.priority
-
-
 class Stack:
     def __init__(
         self,
@@ -41,8 +27,24 @@ class Stack:
             name = f"{type(self).__name__.casefold()}_{id(self)}"
         self.name = name
         self.default_name_template = default_name_template
-        self._components = []
+        self._components = IndexedHeap()
         self._lock = threading.RLock()
+        # (generation, components in order), replaced on every change of the components
+        # so that readers can use it without locking
+        self._snapshot = (0, ())
+
+    @property
+    def generation(self) -> int:
+        """A number that changes whenever the components of this stack change."""
+        return self._snapshot[0]
+
+    def snapshot(self) -> tuple[ComponentT, ...]:
+        """Return an immutable snapshot of the components, in order of priority."""
+        return self._snapshot[1]
+
+    def _publish(self):
+        # Call with the lock acquired
+        self._snapshot = self._snapshot[0] + 1, tuple(self._components)
 
     def add(
         self,
@@ -52,26 +54,31 @@ class Stack:
         name: str | None = None,
     ):
         """Push with transform."""
-        if isinstance(settings, dict):
-            settings = settings.copy()
+        if settings is not None:
+            settings = dict(settings)
         transformed = self.transform_component(
             component=component, name=name, settings=settings
         )
         self.push(transformed)
         return transformed
 
-    def all(self):
-        return self._components.copy()
+    def all(self) -> list[ComponentT]:
+        return list(self.snapshot())
 
     def discard(self, component: ComponentT):
-        self._lock.acquire()
-        try:
-            idx = self._components.index(component)
-        except IndexError:
-            idx = None
-        self._lock.release()
-        if idx is not None:
-            self.pop(idx)
+        with self._lock:
+            if self._components.discard(component):
+                self._publish()
+
+    def reprioritize(self, component: ComponentT, priority: int):
+        """Change the priority of a component in this stack."""
+        with self._lock:
+            if isinstance(component, Serializer):
+                component.priority = priority
+            else:  # a model class
+                component.settings["priority"] = priority
+            self._components.update(component, priority)
+            self._publish()
 
     def default_name(self):
         fmt = {"name": self.name, "index": len(self._components) + 1}
@@ -85,49 +92,61 @@ class Stack:
         return name
 
     def push(self, component: ComponentT):
-        self._lock.acquire()
-        name = getattr(component, "name", None)
-        if name is None:
-            component.name = self.default_name()
-        heapq.heappush(self._components, _PrioritySortWrapper(component))
-        self._lock.release()
-
-    def pop(self, index: int | None = None) -> ComponentT | None:
-        self._lock.acquire()
-        if index is None:
-            obj = heapq.heappop(self._components)
-        else:
-            obj = self._components.pop(index)
-        self._lock.release()
-        return obj
+        with self._lock:
+            name = getattr(component, "name", None)
+            if name is None:
+                component.name = self.default_name()
+            self._components.push(component, component.priority)
+            self._publish()
+
+    def pop(self, index: int | None = None) -> ComponentT:
+        """
+        Remove and return the component of the lowest priority,
+        or the one at the given index of the ordered components.
+        """
+        with self._lock:
+            if index is None:
+                component = self._components.pop()
+            else:
+                component = self.snapshot()[index]
+                self._components.remove(component)
+            self._publish()
+        return component
 
     def get(self, index: int = -1, settings: SettingsT = None) -> ComponentT | None:
-        self._lock.acquire()
         try:
-            obj = self._components[index].component
+            return self.snapshot()[index]
         except IndexError:
-            obj = None
-        self._lock.release()
-        return obj
+            return None
 
     def clear(self):
-        self._lock.acquire()
-        self._components.clear()
-        self._lock.release()
+        with self._lock:
+            self._components.clear()
+            self._publish()
 
     @property
     def size(self) -> int:
         return len(self._components)
 
+    def choose(self, component: ComponentT, settings: SettingsT) -> bool:
+        """Return whether to choose a component with the given settings."""
+        return True
+
     def choose_components(self, settings: SettingsT = None) -> dict[str, ComponentT]:
         if settings is None:
             settings = {}
-        suitable = {}
-        for idx in range(self.size):
-            component = self.get(idx, settings)
-            if component is not None:
-                suitable[component.name] = component
-        return suitable
+        choose = self.choose
+        return {
+            component.name: component for component in self.snapshot()
+            if choose(component, settings)
+        }
+
+    def selection_key(self, settings: SettingsT = None) -> typing.Hashable | None:
+        """
+        Return a hashable key of the settings, such that settings with the same key
+        make choose_components() select the same components, or None if there's no such key.
+        """
+        return ()
 
     @classmethod
     def transform_submodel(cls, submodel: Type[Model]) -> Type[Model]:
@@ -175,14 +194,16 @@ class Stack:
 
     def __repr__(self) -> str:
         name = type(self).__name__
-        components = list(map(operator.attrgetter("component"), self._components))
-        return f"<{name} {components}>"
+        return f"<{name} {list(self.snapshot())}>"
 
 
 class SelectiveStack(Stack):
     def predicate(self, component, settings: SettingsT):
         return True
 
+    def choose(self, component: ComponentT, settings: SettingsT) -> bool:
+        return self.predicate(component, settings)
+
     def get(self, index: int = -1, settings: SettingsT = None):
         component = super().get(index, settings)
         if component is None:
@@ -191,11 +212,18 @@ class SelectiveStack(Stack):
             component = None
         return component
 
+    def selection_key(self, settings: SettingsT = None) -> typing.Hashable | None:
+        return None  # an arbitrary predicate can depend on anything
+
 
 class VersionAwareStack(SelectiveStack):
     """
     A very simple and basic versioning layer.  `foo = Int64(version_added=1, version_removed=5)`
     will inform the model to include `foo` component only if `1 <= <version> < 5`.
+
+    Versions of the components may change after they were pushed, as long as
+    they are changed with configure(): the settings dictionaries of the components
+    are not watched, so changing them in place has no effect on cached selections.
     """
 
     def __init__(
@@ -217,28 +245,152 @@ class VersionAwareStack(SelectiveStack):
         self.default_version = default_version
         self.default_version_added = default_version_added
         self.default_version_removed = default_version_removed
+        # (stack generation, serializer settings generation, versions, index),
+        # see _get_index()
+        self._index = None
 
-    def predicate_version(self, component: ComponentT, settings: SettingsT):
-        if settings is None:
-            settings = {}
-        version = settings.get(self.settings_version_field, self.default_version)
-        default_added = self.default_version_added
-        default_removed = self.default_version_removed
+    def version_added(self, component: ComponentT) -> Comparable:
         if callable(self.version_added_field):
             version_added = self.version_added_field(component)
         else:
             version_added = getattr(component, self.version_added_field, None)
         if version_added is None:
-            version_added = default_added
-        if callable(self.version_added_field):
+            version_added = self.default_version_added
+        return version_added
+
+    def version_removed(self, component: ComponentT) -> Comparable:
+        if callable(self.version_removed_field):
             version_removed = self.version_removed_field(component)
         else:
             version_removed = getattr(component, self.version_removed_field, None)
         if version_removed is None:
-            version_removed = default_removed
-        introduced = version_added <= version
-        up_to_date = version_removed > version
+            version_removed = self.default_version_removed
+        return version_removed
+
+    def predicate_version(self, component: ComponentT, settings: SettingsT):
+        if settings is None:
+            settings = {}
+        version = settings.get(self.settings_version_field, self.default_version)
+        introduced = self.version_added(component) <= version
+        up_to_date = self.version_removed(component) > version
         return introduced and up_to_date
 
     def predicate(self, component: ComponentT, settings: SettingsT):
         return self.predicate_version(component, settings)
+
+    def _get_index(self) -> _VersionIndex | None:
+        """
+        Return the index of the components by version intervals,
+        or None if their versions can't be sorted.
+        """
+        if type(self).predicate is not VersionAwareStack.predicate:
+            return None  # a custom predicate, selection isn't based on versions only
+        cached = self._index
+        generation, components = self._snapshot
+        settings_generation = Serializer.settings_generation
+        if cached is not None and cached[0] == generation:
+            if cached[1] == settings_generation:
+                return cached[3]
+            # Some serializer was configured since, check the versions of the components
+            versions = self._versions(components)
+            if cached[2] == versions:
+                self._index = generation, settings_generation, versions, cached[3]
+                return cached[3]
+            # Layouts chosen in this generation are stale, start a new one
+            with self._lock:
+                self._publish()
+            generation, components = self._snapshot
+        versions = self._versions(components)
+        try:
+            bounds = [
+                (component, self.version_added(component), self.version_removed(component))
+                for component in components
+            ]
+            boundaries = set()
+            for _, version_added, version_removed in bounds:
+                boundaries.update((version_added, version_removed))
+            boundaries.discard(self.default_version_added)
+            boundaries.discard(self.default_version_removed)
+            index = _VersionIndex(self.default_version_added, sorted(boundaries), bounds)
+        except TypeError:  # unhashable or incomparable versions
+            index = None
+        self._index = generation, settings_generation, versions, index
+        return index
+
+    def _versions(self, components: tuple[ComponentT, ...]) -> list[tuple]:
+        return [
+            (self.version_added(component), self.version_removed(component))
+            for component in components
+        ]
+
+    def _locate(self, settings: SettingsT) -> tuple[_VersionIndex, int] | None:
+        """Return the index and the position of the layout to choose."""
+        index = self._get_index()
+        if index is None:
+            return None
+        if settings is None:
+            settings = {}
+        version = settings.get(self.settings_version_field, self.default_version)
+        try:
+            return index, bisect.bisect_right(index.breakpoints, version)
+        except TypeError:
+            return None
+
+    def choose_components(self, settings: SettingsT = None) -> dict[str, ComponentT]:
+        located = self._locate(settings)
+        if located is None:
+            return super().choose_components(settings)
+        index, position = located
+        return index.layout(position).copy()
+
+    def selection_key(self, settings: SettingsT = None) -> typing.Hashable | None:
+        if type(self).predicate is not VersionAwareStack.predicate:
+            return None
+        located = self._locate(settings)
+        if located is None:
+            if settings is None:
+                settings = {}
+            return settings.get(self.settings_version_field, self.default_version)
+        return "layout", located[1]
+
+    def versions(self) -> list[Comparable]:
+        """
+        Return the lowest version of every distinct layout of components, in order.
+        The first one is the default lowest version added (LEAST by default),
+        standing for the versions lower than any other.
+        """
+        index = self._get_index()
+        if index is None:
+            raise TypeError("versions of the components can't be sorted")
+        versions = [self.default_version_added]
+        previous = index.layout(0)
+        for position, version in enumerate(index.breakpoints, start=1):
+            layout = index.layout(position)
+            if layout != previous:
+                versions.append(version)
+            previous = layout
+        return versions
+
+
+class _VersionIndex:
+    """
+    Sorted version boundaries of components. Layout i, the components chosen
+    for breakpoints[i - 1] <= version < breakpoints[i], is computed on demand.
+    """
+
+    def __init__(self, lowest: Comparable, breakpoints: list, bounds: list[tuple]):
+        self.lowest = lowest
+        self.breakpoints = breakpoints
+        self.bounds = bounds  # (component, version added, version removed)
+        self.layouts = [None] * (len(breakpoints) + 1)
+
+    def layout(self, position: int) -> dict[str, ComponentT]:
+        layout = self.layouts[position]
+        if layout is None:
+            version = self.breakpoints[position - 1] if position else self.lowest
+            layout = self.layouts[position] = {
+                component.name: component
+                for component, version_added, version_removed in self.bounds
+                if version_added <= version < version_removed
+            }
+        return layout
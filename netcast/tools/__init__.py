@@ -0,0 +1,14 @@
+from netcast.tools import _lazy
+
+# Submodules imported on first access, see __getattr__()
+_lazy_submodules = (
+    "arrangements",
+    "collections",
+    "contexts",
+    "inspection",
+    "streams",
+    "strings",
+    "symbol",
+)
+
+__getattr__ = _lazy.lazy_getattr(__name__, _lazy_submodules)
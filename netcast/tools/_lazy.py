@@ -0,0 +1,40 @@
+from __future__ import annotations  # Python 3.8
+
+import importlib
+import sys
+import threading
+from typing import Any, Callable, Iterable, Mapping, Union
+
+__all__ = ("lazy_getattr",)
+
+# Shared by all the modules, as building an attribute may build others in other modules
+_lock = threading.RLock()
+
+
+def lazy_getattr(
+    module_name: str, names: Union[Mapping[str, Callable[[], Any]], Iterable[str]]
+) -> Callable[[str], Any]:
+    """
+    Return a module __getattr__() providing names on their first access.
+
+    Names are either a mapping of attribute names to factories, each called once
+    and its result stored in the module, or an iterable of submodules to import.
+    """
+    if isinstance(names, Mapping):
+        factories, submodules = names, frozenset()
+    else:
+        factories, submodules = {}, frozenset(names)
+
+    def __getattr__(name: str) -> Any:
+        if name in submodules:
+            return importlib.import_module("." + name, module_name)
+        factory = factories.get(name)
+        if factory is None:
+            raise AttributeError(f"module {module_name!r} has no attribute {name!r}")
+        namespace = vars(sys.modules[module_name])
+        with _lock:
+            if name not in namespace:
+                namespace[name] = factory()
+        return namespace[name]
+
+    return __getattr__
@@ -10,15 +10,12 @@ from netcast.tools.collections import (
     ParameterHolder,
     classproperty,
 )
-from netcast.tools.contexts import *
+from netcast.tools import contexts
+from netcast.tools._lazy import lazy_getattr
+from netcast.tools.contexts import Context, ContextT
 from netcast.tools.inspection import is_classmethod
 
-try:
-    import ssl
-except ImportError:
-    ssl = None
-
-__all__ = (
+__all__ = (  # noqa: F822, see __getattr__()
     "ArrangementT",
     "Arrangement",
     "AsyncioLifoQueueArrangement",
@@ -96,7 +93,6 @@ __all__ = (
 )
 
 ArrangementT = TypeVar("ArrangementT", bound="ClassArrangement")
-DefaultContextT = ConstructContext
 
 
 def bind_factory(
@@ -292,7 +288,7 @@ class ClassArrangement(_BaseArrangement):
             (context_class,) = filter(None, (context_class, cls.context_class))
 
         if context_class is None and descent_context_class is None:
-            context_class = DefaultContextT
+            context_class = contexts.ConstructContext
 
         if context_class is None:
             context_class = descent_context_class
@@ -489,7 +485,7 @@ class Arrangement(ClassArrangement, no_subclasshook=True):
         super().__init_subclass__(
             descent=descent,
             clear_init=clear_init,
-            context_class=MemoryDictContext,
+            context_class=contexts.MemoryDictContext,
             config=config,
             no_subclasshook=no_subclasshook,
             setup_context=False,
@@ -674,59 +670,67 @@ def wrap_to_arrangement(
 
 _ = wrap_to_arrangement
 
-ClassDictArrangement = _("ClassDictArrangement", DictContext, True)
-ClassListArrangement = _("ClassListArrangement", ListContext, True)
-ClassByteArrayArrangement = _("ClassByteArrayArrangement", ByteArrayContext, True)
-ClassDequeArrangement = _("ClassDequeArrangement", DequeContext, True)
-ClassQueueArrangement = _("ClassQueueArrangement", QueueContext, True)
-ClassLifoQueueArrangement = _("ClassLifoQueueArrangement", LifoQueueContext, True)
-ClassPriorityQueueArrangement = _(
-    "ClassPriorityQueueArrangement", PriorityQueueContext, True
-)
-ClassAsyncioQueueArrangement = _(
-    "ClassAsyncioQueueArrangement", AsyncioQueueContext, True
-)
-ClassAsyncioLifoQueueArrangement = _(
-    "ClassAsyncioLifoQueueArrangement", AsyncioLifoQueueContext, True
-)
-ClassAsyncioPriorityQueueArrangement = _(
-    "ClassAsyncioPriorityQueueArrangement", AsyncioPriorityQueueContext, True
-)
-ClassBytesIOArrangement = _("ClassBytesIOArrangement", BytesIOContext, True)
-ClassStringIOArrangement = _("ClassStringIOArrangement", StringIOContext, True)
-ClassFileIOArrangement = _("ClassFileIOArrangement", FileIOContext, True)
-ClassSocketArrangement = _("ClassSocketArrangement", SocketContext, True)
-
-if ssl:
-    SSLSocketContext = bind_factory(SSLSocketContext, factory=ssl.wrap_socket)
-    ClassSSLSocketArrangement = _("ClassSSLSocketArrangement", SSLSocketContext, True)
-else:
-    SSLSocketContext = None
-    ClassSSLSocketArrangement = None
-
-ClassCounterArrangement = _("ClassCounterArrangement", CounterContext, True)
-ClassConstructArrangement = _("ClassConstructArrangement", ConstructContext, True)
-
-DictArrangement = _("DictArrangement", DictContext)
-ListArrangement = _("ListArrangement", ListContext)
-ByteArrayArrangement = _("ByteArrayArrangement", ByteArrayContext)
-DequeArrangement = _("DequeArrangement", DequeContext)
-QueueArrangement = _("QueueArrangement", QueueContext)
-LifoQueueArrangement = _("LifoQueueArrangement", LifoQueueContext)
-PriorityQueueArrangement = _("PriorityQueueArrangement", PriorityQueueContext)
-AsyncioQueueArrangement = _("AsyncioQueueArrangement", AsyncioQueueContext)
-AsyncioLifoQueueArrangement = _("AsyncioLifoQueueArrangement", AsyncioLifoQueueContext)
-AsyncioPriorityQueueArrangement = _(
-    "AsyncioPriorityQueueArrangement", AsyncioPriorityQueueContext
-)
-FileIOArrangement = _("FileIOArrangement", FileIOContext)
-BytesIOArrangement = _("BytesIOArrangement", BytesIOContext)
-StringIOArrangement = _("StringIOArrangement", StringIOContext)
-SocketArrangement = _("SocketArrangement", SocketContext)
-if ssl:
-    SSLSocketArrangement = _("SSLSocketArrangement", SSLSocketContext)
-else:
-    SSLSocketArrangement = None
-
-CounterArrangement = _("CounterArrangement", CounterContext)
-ConstructArrangement = _("ConstructArrangement", ConstructContext)
+
+def _ssl_socket_context():
+    ssl_socket_context = contexts.SSLSocketContext
+    if ssl_socket_context is None:
+        return None
+    import ssl
+
+    return bind_factory(ssl_socket_context, factory=ssl.wrap_socket)
+
+
+def _lazy(name, context_name, class_arrangement=False):
+    def factory():
+        context_class = __getattr__(context_name)
+        if context_class is None:
+            return None
+        return _(name, context_class, class_arrangement)
+
+    return factory
+
+
+# Wrapped arrangement classes, built on first access, see __getattr__().
+# Until then, they are not listed by ClassArrangement.__subclasses__() either;
+# getattr() every name in __all__ to build them all.
+_lazy_arrangements = {
+    "DefaultContextT": lambda: contexts.ConstructContext,
+    "SSLSocketContext": _ssl_socket_context,
+}
+for _context_name in (
+    "Dict",
+    "List",
+    "ByteArray",
+    "Deque",
+    "Queue",
+    "LifoQueue",
+    "PriorityQueue",
+    "AsyncioQueue",
+    "AsyncioLifoQueue",
+    "AsyncioPriorityQueue",
+    "BytesIO",
+    "StringIO",
+    "FileIO",
+    "Socket",
+    "SSLSocket",
+    "Counter",
+    "Construct",
+):
+    _lazy_arrangements[f"Class{_context_name}Arrangement"] = _lazy(
+        f"Class{_context_name}Arrangement", f"{_context_name}Context", True
+    )
+    _lazy_arrangements[f"{_context_name}Arrangement"] = _lazy(
+        f"{_context_name}Arrangement", f"{_context_name}Context"
+    )
+del _context_name
+_getattr = lazy_getattr(__name__, _lazy_arrangements)
+
+
+def __getattr__(name):
+    if name not in _lazy_arrangements and name in contexts.__all__:
+        return getattr(contexts, name)
+    return _getattr(name)
+
+
+def __dir__():
+    return sorted({*globals(), *_lazy_arrangements})
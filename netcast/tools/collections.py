@@ -1,6 +1,12 @@
 from __future__ import annotations  # Python 3.8
 
-from typing import Any, Callable, Protocol, TypeVar, runtime_checkable
+import bisect
+import collections
+import collections.abc
+import itertools
+import threading
+import types
+from typing import Any, Callable, Hashable, Protocol, TypeVar, runtime_checkable
 
 from netcast.constants import MISSING
 
@@ -85,6 +91,355 @@ class IDLookupDictionary(KeyTransformingDict):
         return id_of_key
 
 
+CacheInfo = collections.namedtuple(
+    "CacheInfo", ("hits", "misses", "evictions", "maxsize", "currsize")
+)
+
+
+class LRUCache:
+    """
+    A bounded, thread-safe mapping that evicts the least recently used entries first.
+
+    Cache hits, misses and evictions are counted, see :meth:`info`.
+    If `maxsize` is None, the cache is unbounded.
+    """
+
+    def __init__(self, maxsize: int | None = 128):
+        if maxsize is not None and maxsize < 0:
+            raise ValueError("cache size must not be negative")
+        self.maxsize = maxsize
+        self.hits = self.misses = self.evictions = 0
+        self._data = collections.OrderedDict()
+        self._lock = threading.RLock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def __setitem__(self, key: Hashable, value: Any):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if self.maxsize is not None:
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+                    self.evictions += 1
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def invalidate(self, predicate: Callable[[Any], bool] | None = None) -> int:
+        """Drop the entries whose keys match the predicate (all, by default)."""
+        with self._lock:
+            if predicate is None:
+                keys = list(self._data)
+            else:
+                keys = [key for key in self._data if predicate(key)]
+            for key in keys:
+                del self._data[key]
+        return len(keys)
+
+    def clear(self):
+        """Drop all the entries and reset the statistics."""
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(
+            self.hits, self.misses, self.evictions, self.maxsize, len(self._data)
+        )
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {self.info()}>"
+
+
+class IndexedHeap:
+    """
+    A binary min-heap of items ordered by priority and then by insertion,
+    indexed by item identity for O(log n) removal and priority changes.
+
+    The entries are also kept sorted, so iteration yields the items in order
+    without sorting them. Not thread-safe.
+    """
+
+    def __init__(self):
+        self._heap = []  # [priority, sequence number, item]
+        self._positions = {}  # id(item) -> index in the heap
+        self._ordered = []  # the entries of the heap, sorted
+        self._sequence = itertools.count()
+
+    def push(self, item: Any, priority: Comparable):
+        if id(item) in self._positions:
+            raise ValueError(f"{item!r} is already in the heap")
+        entry = [priority, next(self._sequence), item]
+        self._heap.append(entry)
+        self._positions[id(item)] = len(self._heap) - 1
+        bisect.insort(self._ordered, entry)
+        self._sift_up(len(self._heap) - 1)
+
+    def pop(self) -> Any:
+        """Remove and return the item of the lowest priority."""
+        if not self._heap:
+            raise IndexError("pop from an empty heap")
+        item = self._heap[0][2]
+        self._remove_at(0)
+        return item
+
+    def peek(self) -> Any:
+        if not self._heap:
+            raise IndexError("peek into an empty heap")
+        return self._heap[0][2]
+
+    def remove(self, item: Any):
+        self._remove_at(self._positions[id(item)])
+
+    def discard(self, item: Any) -> bool:
+        """Remove an item if present, return whether it was."""
+        position = self._positions.get(id(item))
+        if position is None:
+            return False
+        self._remove_at(position)
+        return True
+
+    def priority(self, item: Any) -> Comparable:
+        return self._heap[self._positions[id(item)]][0]
+
+    def update(self, item: Any, priority: Comparable):
+        """Change the priority of an item."""
+        position = self._positions[id(item)]
+        entry = self._heap[position]
+        self._unorder(entry)
+        old_priority, entry[0] = entry[0], priority
+        bisect.insort(self._ordered, entry)
+        if priority < old_priority:
+            self._sift_up(position)
+        else:
+            self._sift_down(position)
+
+    def clear(self):
+        self._heap.clear()
+        self._positions.clear()
+        self._ordered.clear()
+
+    def _unorder(self, entry: list):
+        ordered = self._ordered
+        del ordered[bisect.bisect_left(ordered, entry)]
+
+    def _remove_at(self, position: int):
+        heap = self._heap
+        entry = heap[position]
+        del self._positions[id(entry[2])]
+        self._unorder(entry)
+        last = heap.pop()
+        if position < len(heap):
+            heap[position] = last
+            self._positions[id(last[2])] = position
+            if last < entry:
+                self._sift_up(position)
+            else:
+                self._sift_down(position)
+
+    def _sift_up(self, position: int):
+        heap, positions = self._heap, self._positions
+        entry = heap[position]
+        while position:
+            parent = (position - 1) >> 1
+            if not entry < heap[parent]:
+                break
+            heap[position] = heap[parent]
+            positions[id(heap[position][2])] = position
+            position = parent
+        heap[position] = entry
+        positions[id(entry[2])] = position
+
+    def _sift_down(self, position: int):
+        heap, positions = self._heap, self._positions
+        size = len(heap)
+        entry = heap[position]
+        while True:
+            child = 2 * position + 1
+            if child >= size:
+                break
+            if child + 1 < size and heap[child + 1] < heap[child]:
+                child += 1
+            if not heap[child] < entry:
+                break
+            heap[position] = heap[child]
+            positions[id(heap[position][2])] = position
+            position = child
+        heap[position] = entry
+        positions[id(entry[2])] = position
+
+    def __contains__(self, item: Any) -> bool:
+        return id(item) in self._positions
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __iter__(self):
+        return (entry[2] for entry in self._ordered)
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {list(self)}>"
+
+
+def freeze(obj: Any) -> Hashable:
+    """
+    Return a hashable, order-independent fingerprint of a (possibly nested) settings object.
+
+    freeze({"a": [1, 2], "b": {3}}) == freeze({"b": {3}, "a": [1, 2]})
+
+    Raise TypeError if any of the leaf values is unhashable.
+    """
+    if isinstance(obj, collections.abc.Mapping):
+        return frozenset((key, freeze(value)) for key, value in obj.items())
+    if isinstance(obj, (list, tuple)):
+        return type(obj), tuple(map(freeze, obj))
+    if isinstance(obj, (set, frozenset)):
+        return frozenset(map(freeze, obj))
+    hash(obj)
+    return obj
+
+
+_HASH_MASK = (1 << 64) - 1
+_SCALAR_TYPES = frozenset((int, float, str, bytes, bool, type(None)))
+_ABSENT = object()  # settings values may be MISSING
+
+
+def _item_hash(key: str, value: Any) -> int:
+    if type(value) in _SCALAR_TYPES:  # freeze() returns them as they are
+        return hash((key, value))
+    return hash((key, freeze(value)))
+
+
+class Settings(collections.abc.Mapping):
+    """
+    An immutable mapping of settings: local overrides on top of optional parent settings.
+
+    Keys are looked up through the chain of parents, so layering settings only stores
+    the overrides. Settings are hashable if their values are (see :func:`freeze`),
+    the hash is computed up front from the parent's one, so they can be used directly
+    in cache keys. Layering settings that are already applied returns the same object.
+    """
+
+    __slots__ = ("parent", "local", "_data", "_hash")
+
+    def __init__(
+        self,
+        local: collections.abc.Mapping[str, Any] | None = None,
+        /,
+        parent: Settings | None = None,
+        **kwargs: Any,
+    ):
+        local = {} if local is None else dict(local)
+        local.update(kwargs)
+        self.parent = parent
+        self.local = types.MappingProxyType(local)
+        self._data = local if parent is None else None  # flattened on demand
+        try:
+            if parent is None:
+                item_hash = sum(itertools.starmap(_item_hash, local.items()))
+            else:
+                item_hash = parent._hash
+                if item_hash is None:
+                    raise TypeError
+                for key, value in local.items():
+                    old_value = parent.get(key, _ABSENT)
+                    if old_value is not _ABSENT:
+                        item_hash -= _item_hash(key, old_value)
+                    item_hash += _item_hash(key, value)
+        except TypeError:  # unhashable values
+            item_hash = None
+        self._hash = None if item_hash is None else item_hash & _HASH_MASK
+
+    @classmethod
+    def of(cls, settings: collections.abc.Mapping[str, Any] | None) -> Settings:
+        """Return settings as a Settings object, without copying if they already are one."""
+        if isinstance(settings, cls):
+            return settings
+        return cls(settings)
+
+    def layer(
+        self, overrides: collections.abc.Mapping[str, Any] | None = None, /, **kwargs: Any
+    ) -> Settings:
+        """Return these settings with the overrides applied on top of them."""
+        if overrides:
+            kwargs = {**overrides, **kwargs}
+        for key, value in kwargs.items():
+            old_value = self.get(key, _ABSENT)
+            if old_value is not value and (old_value is _ABSENT or old_value != value):
+                break
+        else:
+            return self
+        return type(self)(kwargs, parent=self)
+
+    def _flatten(self) -> dict[str, Any]:
+        data = self._data
+        if data is None:
+            data = self._data = {**self.parent._flatten(), **self.local}
+        return data
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key, _ABSENT)
+        if value is _ABSENT:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        return self.get(key, _ABSENT) is not _ABSENT
+
+    def __iter__(self):
+        return iter(self._flatten())
+
+    def __len__(self) -> int:
+        return len(self._flatten())
+
+    def get(self, key: str, default: Any = None) -> Any:
+        settings = self
+        while settings._data is None:
+            local = settings.local
+            if key in local:
+                return local[key]
+            settings = settings.parent
+        return settings._data.get(key, default)
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            # An override may have replaced the unhashable values of the parent
+            item_hash = sum(itertools.starmap(_item_hash, self._flatten().items()))
+            self._hash = item_hash & _HASH_MASK
+        return self._hash
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if isinstance(other, Settings):
+            if (
+                self._hash is not None
+                and other._hash is not None
+                and self._hash != other._hash
+            ):
+                return False
+            return self._flatten() == other._flatten()
+        if isinstance(other, collections.abc.Mapping):
+            return self._flatten() == dict(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._flatten()})"
+
+
 class AttributeDict(dict):
     """A dictionary with attribute-as-item access."""
 
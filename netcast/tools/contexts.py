@@ -1,12 +1,10 @@
 from __future__ import annotations  # Python 3.8
 
-import asyncio
 import collections.abc
 import functools
+import importlib
 import inspect
 import io
-import queue
-import socket
 import sys
 import threading
 import warnings
@@ -26,19 +24,15 @@ from typing import (
 from netcast.constants import MISSING
 from netcast.exceptions import NetcastError
 from netcast.tools import strings
+from netcast.tools._lazy import lazy_getattr
 from netcast.tools.collections import (
     AttributeDict,
     IDLookupDictionary,
     ParameterHolder,
 )
 
-try:
-    import ssl
-except ImportError:
-    ssl = None  # type: ignore
 
-
-__all__ = (
+__all__ = (  # noqa: F822, see __getattr__()
     "AsyncioLifoQueueContext",
     "AsyncioPriorityQueueContext",
     "AsyncioQueueContext",
@@ -241,6 +235,8 @@ class _HookCaller:
         trigger = None
 
         if async_:
+            import asyncio
+
             trigger = asyncio.gather(
                 *(
                     _call_observer_async(observer, context, params)
@@ -341,7 +337,12 @@ def append_exit_pool(
 
 
 thread_safe = functools.partial(append_exit_pool, cm_class=threading.RLock)
-async_safe = functools.partial(append_exit_pool, cm_class=asyncio.Lock)
+
+
+def async_safe(context_class, **kwds):
+    import asyncio
+
+    return append_exit_pool(context_class, cm_class=asyncio.Lock, **kwds)
 
 
 class Context:  # (metaclass=abc.ABCMeta):
@@ -556,10 +557,6 @@ _counter_methods = (
     "__iand__",
 )
 
-ListContext = wrap_to_context(list, _list_methods)
-DequeContext = wrap_to_context(collections.deque, _deque_methods)
-DictContext = wrap_to_context(AttributeDict, _dict_methods, name="DictContext")
-
 
 class UpwardContextMixin(Context):
     """
@@ -633,27 +630,53 @@ LinkedListContextMixin = SinglyDownwardContextMixin
 
 _ = wrap_to_context
 
-ConstructContext = _((collections.OrderedDict, UpwardContextMixin, AttributeDict))
-ByteArrayContext = _(bytearray, _list_methods, name="ByteArrayContext")
-MemoryDictContext = _(IDLookupDictionary, _dict_methods)
-QueueContext = _(queue.Queue, _queue_methods)
-PriorityQueueContext = _(queue.PriorityQueue, _queue_methods)
-LifoQueueContext = _(queue.LifoQueue, _queue_methods)
-AsyncioQueueContext = _(asyncio.Queue, _queue_methods, name="AsyncioQueueContext")
-AsyncioPriorityQueueContext = _(
-    asyncio.PriorityQueue, _queue_methods, name="AsyncioPriorityQueueContext"
-)
-AsyncioLifoQueueContext = _(
-    asyncio.LifoQueue, _queue_methods, name="AsyncioLifoQueueContext"
-)
-FileIOContext = _(io.FileIO, _io_methods)
-BytesIOContext = _(io.BytesIO, _io_methods)
-StringIOContext = _(io.StringIO, _io_methods)
-SocketContext = _(socket.socket, _socket_methods)
 
-if ssl:
-    SSLSocketContext = _(ssl.SSLSocket, _socket_methods)
-else:
-    SSLSocketContext = None
+def _import(module, name):
+    return getattr(importlib.import_module(module), name)
 
-CounterContext = _(collections.Counter, _counter_methods)
+
+def _ssl_socket_context():
+    try:
+        ssl_socket = _import("ssl", "SSLSocket")
+    except ImportError:
+        return None
+    return _(ssl_socket, _socket_methods)
+
+
+# Wrapped context classes, built on first access, see __getattr__().
+# Until then, they are not listed by Context.__subclasses__() either.
+_lazy_contexts = {
+    "ListContext": lambda: _(list, _list_methods),
+    "DequeContext": lambda: _(collections.deque, _deque_methods),
+    "DictContext": lambda: _(AttributeDict, _dict_methods, name="DictContext"),
+    "ConstructContext": lambda: _(
+        (collections.OrderedDict, UpwardContextMixin, AttributeDict)
+    ),
+    "ByteArrayContext": lambda: _(bytearray, _list_methods, name="ByteArrayContext"),
+    "MemoryDictContext": lambda: _(IDLookupDictionary, _dict_methods),
+    "QueueContext": lambda: _(_import("queue", "Queue"), _queue_methods),
+    "PriorityQueueContext": lambda: _(_import("queue", "PriorityQueue"), _queue_methods),
+    "LifoQueueContext": lambda: _(_import("queue", "LifoQueue"), _queue_methods),
+    "AsyncioQueueContext": lambda: _(
+        _import("asyncio", "Queue"), _queue_methods, name="AsyncioQueueContext"
+    ),
+    "AsyncioPriorityQueueContext": lambda: _(
+        _import("asyncio", "PriorityQueue"),
+        _queue_methods,
+        name="AsyncioPriorityQueueContext",
+    ),
+    "AsyncioLifoQueueContext": lambda: _(
+        _import("asyncio", "LifoQueue"), _queue_methods, name="AsyncioLifoQueueContext"
+    ),
+    "FileIOContext": lambda: _(io.FileIO, _io_methods),
+    "BytesIOContext": lambda: _(io.BytesIO, _io_methods),
+    "StringIOContext": lambda: _(io.StringIO, _io_methods),
+    "SocketContext": lambda: _(_import("socket", "socket"), _socket_methods),
+    "SSLSocketContext": _ssl_socket_context,
+    "CounterContext": lambda: _(collections.Counter, _counter_methods),
+}
+__getattr__ = lazy_getattr(__name__, _lazy_contexts)
+
+
+def __dir__():
+    return sorted({*globals(), *_lazy_contexts})
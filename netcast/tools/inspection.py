@@ -1,8 +1,14 @@
 from __future__ import annotations  # Python 3.8
 
 import inspect
+import weakref
 from typing import Any, Callable
 
+# Keyword parameters of callables and of methods (keyed by the underlying function,
+# since bound methods are created on every attribute access)
+_function_params = weakref.WeakKeyDictionary()
+_method_params = weakref.WeakKeyDictionary()
+
 
 def is_classmethod(cls: type, method: Callable) -> bool:
     return getattr(method, "__self__", None) is cls
@@ -21,18 +27,35 @@ def match_params(func: Callable, kwargs: dict[str, Any]) -> dict[str, Any]:
     match_params(foo, kwds) -> {"bar": "bar", "biz": "biz"}
     match_params(bar, kwds) -> {"bar": "bar", "biz": "biz", "baz": "baz"}
     """
-    params = inspect.signature(func).parameters
-    variadic = any(
-        param.kind is inspect.Parameter.VAR_KEYWORD for param in params.values()
-    )
-    matched = {}
+    variadic, keywords = keyword_params(func)
     if variadic:
-        matched.update(kwargs)
+        return dict(kwargs)
+    return {name: value for name, value in kwargs.items() if name in keywords}
+
+
+def keyword_params(func: Callable) -> tuple[bool, frozenset[str]]:
+    """
+    Return whether a callable takes variadic keyword arguments and the names
+    of the parameters it takes as keyword arguments.
+
+    The result is cached as long as the callable (or the function of a method) lives.
+    """
+    if inspect.ismethod(func):
+        cache, key = _method_params, func.__func__
     else:
-        for name, value in kwargs.items():
-            param = params.get(name)
-            if param is None:
-                continue
-            if param.kind in (param.POSITIONAL_OR_KEYWORD, param.KEYWORD_ONLY):
-                matched[name] = value
-    return matched
+        cache, key = _function_params, func
+    try:
+        return cache[key]
+    except (KeyError, TypeError):
+        pass
+    params = inspect.signature(func).parameters.values()
+    variadic = any(param.kind is param.VAR_KEYWORD for param in params)
+    keywords = frozenset(
+        param.name for param in params
+        if param.kind in (param.POSITIONAL_OR_KEYWORD, param.KEYWORD_ONLY)
+    )
+    try:
+        cache[key] = variadic, keywords
+    except TypeError:  # not weakly referenceable
+        pass
+    return variadic, keywords
@@ -0,0 +1,322 @@
+from __future__ import annotations  # Python 3.8
+
+import io
+import sys
+from typing import Any, Callable, Generator, Iterator
+
+from netcast.exceptions import NetcastError
+
+
+__all__ = ("BufferReader", "BufferWriter", "Decoder", "StreamReader")
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+class StreamReader(io.RawIOBase):
+    """
+    Buffered binary reader of a file-like object or a socket.
+
+    The bytes are read from the underlying object in chunks, but consumed exactly
+    as requested, so successive records can be loaded one by one with memory bounded
+    by the chunk size and the size of a single record. tell() returns the number
+    of bytes consumed so far.
+    """
+
+    def __init__(self, stream: Any, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        super().__init__()
+        # No socket exists unless the socket module has been imported
+        socket = sys.modules.get("socket")
+        if socket is not None and isinstance(stream, socket.socket):
+            self._read_raw = stream.recv
+        else:
+            self._read_raw = stream.read
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self._buffer = bytearray()
+        self._pos = 0
+        self._consumed = 0  # bytes discarded from the buffer
+        self._eof = False
+
+    def _fill(self, size: int) -> bool:
+        """Buffer at least `size` unconsumed bytes, return False if the stream ended before."""
+        buffer = self._buffer
+        if self._pos:
+            # Drop the consumed bytes only when refilling, so that it is amortized
+            del buffer[:self._pos]
+            self._consumed += self._pos
+            self._pos = 0
+        while len(buffer) < size:
+            if self._eof:
+                return False
+            chunk = self._read_raw(max(self.chunk_size, size - len(buffer)))
+            if not chunk:
+                self._eof = True
+                return False
+            buffer += chunk
+        return True
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        """Consume and return at most `size` bytes, or all the remaining ones if negative."""
+        if size is None or size < 0:
+            while self._fill(len(self._buffer) - self._pos + self.chunk_size):
+                pass
+            size = len(self._buffer) - self._pos
+        elif len(self._buffer) - self._pos < size:
+            self._fill(size)
+        pos = self._pos
+        data = bytes(self._buffer[pos:pos + size])
+        self._pos = pos + len(data)
+        return data
+
+    def readinto(self, buffer) -> int:
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def read_until(self, term: bytes) -> bytes:
+        """
+        Consume the bytes up to and including a terminator aligned to its length,
+        return them without the terminator.
+        """
+        unit = len(term)
+        scanned = 0  # number of unconsumed bytes already searched
+        while True:
+            buffer, pos = self._buffer, self._pos
+            end = buffer.find(term, pos + scanned)
+            while end >= 0:
+                if (end - pos) % unit == 0:
+                    data = bytes(buffer[pos:end])
+                    self._pos = end + unit
+                    return data
+                end = buffer.find(term, end + 1)
+            scanned = (len(buffer) - pos) // unit * unit
+            if not self._fill(scanned + unit):
+                raise EOFError("stream ended before the terminator")
+
+    def at_eof(self) -> bool:
+        """Return True if all the bytes of the stream have been consumed."""
+        return self._pos == len(self._buffer) and not self._fill(1)
+
+    def tell(self) -> int:
+        return self._consumed + self._pos
+
+    def seekable(self) -> bool:
+        return True
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        """Move within the buffered (not yet discarded) bytes."""
+        if whence == io.SEEK_CUR:
+            offset += self.tell()
+        elif whence != io.SEEK_SET:
+            raise io.UnsupportedOperation("can't seek relative to the end of a stream")
+        pos = offset - self._consumed
+        if not 0 <= pos <= len(self._buffer):
+            raise io.UnsupportedOperation("can't seek outside of the buffered bytes")
+        self._pos = pos
+        return offset
+
+
+class BufferReader(io.RawIOBase):
+    """
+    Binary reader of a buffer (bytes, a bytearray, memoryview, mmap...) starting at
+    an offset, without copying the buffer. tell() returns the number of bytes read.
+
+    Call release() (or use the reader as a context manager) when done,
+    so that a bytearray can be resized again.
+    """
+
+    def __init__(self, buffer: Any, offset: int = 0):
+        super().__init__()
+        self._view = memoryview(buffer).cast("B")
+        self._start = self._pos = offset
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        pos = self._pos
+        end = len(self._view) if size is None or size < 0 else pos + size
+        data = self._view[pos:end].tobytes()
+        self._pos = pos + len(data)
+        return data
+
+    def readinto(self, buffer) -> int:
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def tell(self) -> int:
+        return self._pos - self._start
+
+    def seekable(self) -> bool:
+        return True
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self.tell()
+        elif whence == io.SEEK_END:
+            offset += len(self._view) - self._start
+        if not 0 <= self._start + offset <= len(self._view):
+            raise ValueError("can't seek outside of the buffer")
+        self._pos = self._start + offset
+        return offset
+
+    def release(self):
+        self._view.release()
+
+    def close(self):
+        self.release()
+        super().close()
+
+
+class BufferWriter(io.RawIOBase):
+    """
+    Binary writer into a preallocated writable buffer (a bytearray, memoryview, mmap...)
+    starting at an offset. tell() returns the number of bytes written.
+
+    Writing past the end of the buffer raises ValueError. Call release() (or use
+    the writer as a context manager) when done, so that a bytearray can be resized again.
+    """
+
+    def __init__(self, buffer: Any, offset: int = 0):
+        super().__init__()
+        self._view = memoryview(buffer).cast("B")
+        self._start = self._pos = offset
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        size = len(data)
+        end = self._pos + size
+        if end > len(self._view):
+            raise ValueError("buffer too small")
+        self._view[self._pos:end] = data
+        self._pos = end
+        return size
+
+    def tell(self) -> int:
+        return self._pos - self._start
+
+    def seekable(self) -> bool:
+        return True
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self.tell()
+        elif whence == io.SEEK_END:
+            offset += len(self._view) - self._start
+        if not 0 <= self._start + offset <= len(self._view):
+            raise ValueError("can't seek outside of the buffer")
+        self._pos = self._start + offset
+        return offset
+
+    def release(self):
+        self._view.release()
+
+    def close(self):
+        self.release()
+        super().close()
+
+
+class Decoder:
+    """
+    Push-style incremental decoder of successive objects.
+
+    The loader is a generator function that loads one object: it yields what it needs
+    to continue, i.e. an integer for an exact number of bytes or a bytes terminator for
+    all the bytes up to the next terminator aligned to its length, is sent the requested
+    bytes (without the terminator) and returns the loaded object.
+
+    Fed chunks are appended to one buffer which is read at an offset, and a loader
+    suspended on missing bytes is resumed where it stopped instead of starting over.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[], Generator[Any, bytes, Any]],
+        finish: Callable[[Any], Any] | None = None,
+    ):
+        self.loader = loader
+        self.finish = finish
+        self._buffer = bytearray()
+        self._pos = 0
+        self._scanned = 0  # bytes already searched for the requested terminator
+        self._load = None
+        self._request = None
+        self._start = 0
+
+    @property
+    def buffered(self) -> int:
+        """The number of fed bytes that have not been consumed yet."""
+        return len(self._buffer) - self._pos
+
+    @property
+    def busy(self) -> bool:
+        """Whether an object has been partially loaded."""
+        return self._load is not None
+
+    def feed(self, data: bytes) -> Iterator[Any]:
+        """Feed a chunk of bytes, return an iterator of the objects it completed."""
+        self._buffer += data
+        try:
+            loads = self._decode()
+        except Exception as exc:
+            self._load = None
+            raise NetcastError(f"loading failed: {exc}") from exc
+        finally:
+            self._compact()
+        return iter(loads)
+
+    def _decode(self):
+        loads = []
+        buffer = self._buffer
+        while True:
+            if self._load is None:
+                if self._pos == len(buffer):
+                    break
+                self._load = self.loader()
+                self._start = self._pos
+                data = None  # start the loader
+            elif isinstance(self._request, int):
+                end = self._pos + self._request
+                if end > len(buffer):
+                    break
+                data, self._pos = bytes(buffer[self._pos:end]), end
+            else:
+                data = self._read_until(self._request)
+                if data is None:
+                    break
+            try:
+                self._request = self._load.send(data)
+            except StopIteration as stop:
+                self._load = None
+                if self._pos == self._start:
+                    raise ValueError("can't decode objects of no size incrementally") from None
+                load = stop.value
+                if self.finish is not None:
+                    load = self.finish(load)
+                loads.append(load)
+        return loads
+
+    def _read_until(self, term):
+        buffer, pos, unit = self._buffer, self._pos, len(term)
+        end = buffer.find(term, pos + self._scanned)
+        while end >= 0:
+            if (end - pos) % unit == 0:
+                self._pos, self._scanned = end + unit, 0
+                return bytes(buffer[pos:end])
+            end = buffer.find(term, end + 1)
+        self._scanned = (len(buffer) - pos) // unit * unit
+        return None
+
+    def _compact(self):
+        # Drop the consumed bytes once they make up most of the buffer, so that
+        # the accumulated bytes are not moved on every feed
+        if self._pos and self._pos * 2 >= len(self._buffer):
+            del self._buffer[:self._pos]
+            self._start -= self._pos
+            self._pos = 0
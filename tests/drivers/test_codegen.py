@@ -0,0 +1,104 @@
+import pytest
+
+import netcast as nc
+from netcast.drivers.codegen import Compiled
+
+
+class Point(nc.Model):
+    x = nc.Int()
+    y = nc.Int()
+
+
+class Shape(nc.Model):
+    name = nc.String()
+    point = Point
+    corners = nc.Char()
+    label = nc.String(pascal=True, version_added=2)
+    padded = nc.String(padded=True, size=6)
+    big = nc.Int64(big_endian=True)
+    ratio = nc.Float()
+    wide = nc.String(encoding="utf-16-le")
+
+
+class Tagged(nc.Model):
+    a_kind = nc.Char()
+    body = nc.Switch(
+        lambda ctx: ctx.a_kind,
+        cases=(nc.Case(1, nc.Int()), nc.Case(2, nc.String())),
+    )
+
+
+Triple = nc.create_model(nc.Short(name="item"), serializer=nc.Array, size=3, name="triple")
+
+
+def make_shape():
+    shape = Shape(
+        name="square", corners=4, label="pascal", padded="pad", big=7, ratio=1.5, wide="wide"
+    )
+    shape.point.x = 1
+    shape.point.y = -2
+    return shape
+
+
+@pytest.mark.parametrize(
+    "settings", [{}, {"version": 1}, {"big_endian": True}, {"signed": True}]
+)
+def test_same_output_as_construct(settings):
+    shape = make_shape()
+    dump = shape.dump("codegen", **settings)
+    assert dump == shape.dump("construct", **settings)
+    loaded = Shape().load("codegen", dump, **settings)
+    assert loaded.state == Shape().load("construct", dump, **settings).state
+
+
+@pytest.mark.parametrize("kind, body", [(1, 5), (2, "five")])
+def test_switch(kind, body):
+    tagged = Tagged(a_kind=kind, body=body)
+    dump = tagged.dump("codegen")
+    assert dump == tagged.dump("construct")
+    assert Tagged().load("codegen", dump).state == {"a_kind": kind, "body": body}
+
+
+def test_array():
+    serializer = Triple().impl("codegen")
+    dump = serializer.dump([1, 2, 3])
+    assert dump == Triple().impl("construct").dump([1, 2, 3])
+    assert serializer.load(dump) == (1, 2, 3)
+
+
+@pytest.mark.parametrize("driver", ["codegen", "construct"])
+@pytest.mark.parametrize("settings", [{}, {"version": 1}])
+def test_encoded_size(driver, settings):
+    shape = make_shape()
+    assert Shape.static_size(driver, **settings) is None
+    assert shape.encoded_size(driver, **settings) == len(shape.dump(driver, **settings))
+    for kind, body in [(1, 5), (2, "five")]:
+        tagged = Tagged(a_kind=kind, body=body)
+        assert tagged.encoded_size(driver) == len(tagged.dump(driver))
+    assert Triple.static_size(driver) == 6
+    assert Point.static_size(driver) == 8
+
+
+def test_compiled_once():
+    serializer = make_shape().impl("codegen")
+    compiled = serializer.compiled
+    assert isinstance(compiled, Compiled)
+    assert serializer.compiled is compiled
+    assert "def dump(state)" in compiled.source
+    assert "def load_from(buf, offset=0)" in compiled.source
+
+
+def test_load_from():
+    shape = make_shape()
+    dump = shape.dump("codegen")
+    compiled = shape.impl("codegen").compiled
+    state, offset = compiled.load_from(b"\xff" * 3 + dump, 3)
+    assert offset == len(dump) + 3
+    assert state["name"] == "square"
+
+
+def test_errors():
+    with pytest.raises(nc.NetcastError):
+        Shape().load("codegen", b"\x00")
+    with pytest.raises(nc.NetcastError):
+        Point(x=2**40, y=0).dump("codegen")
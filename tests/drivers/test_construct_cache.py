@@ -0,0 +1,92 @@
+import construct
+import pytest
+
+import netcast as nc
+from netcast.drivers.construct import Driver
+from netcast.drivers.construct_cache import CompileCache, fingerprint, main, warm_cache
+
+
+class Foo(nc.Model):
+    bar = nc.String()
+    baz = nc.Int()
+    label = nc.String(pascal=True, version_added=2)
+    padded = nc.String(padded=True, size=6, encoding="utf-16-le")
+
+
+class Keyed(nc.Model):
+    a_kind = nc.Char()
+    body = nc.Switch(
+        lambda ctx: ctx.a_kind,
+        cases=(nc.Case(1, nc.Int()), nc.Case(2, nc.String())),
+    )
+
+
+def uncompiled(model, **settings):
+    return model().impl(Driver, settings, final=True)
+
+
+@pytest.mark.parametrize("settings", [{}, {"version": 1}, {"big_endian": True}])
+def test_compiled_same_output(settings):
+    foo = Foo(bar="bar", baz=1, label="label", padded="pad")
+    dump = foo.dump(Driver, **settings)
+    assert dump == foo.dump(Driver, compiled=True, **settings)
+    assert (
+        Foo().load(Driver, dump, compiled=True, **settings).state
+        == Foo().load(Driver, dump, **settings).state
+    )
+
+
+def test_fingerprint():
+    assert fingerprint(uncompiled(Foo)) == fingerprint(uncompiled(Foo))
+    assert fingerprint(uncompiled(Foo)) != fingerprint(uncompiled(Foo, version=1))
+    assert fingerprint(uncompiled(Foo)) != fingerprint(uncompiled(Foo, big_endian=True))
+    assert fingerprint(uncompiled(Keyed)) is None
+
+
+def test_compile_cache(tmp_path):
+    impl = uncompiled(Foo)
+    cache = CompileCache(tmp_path)
+    compiled = cache.compile(impl)
+    assert cache.info()[:3] == (0, 1, 0)
+
+    cache = CompileCache(tmp_path)
+    restored = cache.compile(impl)
+    assert cache.info()[:3] == (1, 0, 0)
+    assert restored.source == compiled.source
+    data = {"bar": "bar", "baz": 1, "label": "label", "padded": "pad"}
+    assert restored.build(data) == compiled.build(data) == impl.build(data)
+    assert restored.parse(impl.build(data)) == data
+
+    cache.compile(uncompiled(Keyed))
+    assert cache.info()[:3] == (1, 0, 1)
+
+    assert cache.clear() == 1
+
+
+def test_corrupted_entry(tmp_path):
+    impl = uncompiled(Foo)
+    cache = CompileCache(tmp_path)
+    cache.path(fingerprint(impl)).write_bytes(b"garbage")
+    assert isinstance(cache.compile(impl), construct.Compiled)
+    assert cache.info()[:3] == (0, 1, 0)
+
+
+def test_warm_cache(tmp_path):
+    info = warm_cache([Foo, Keyed], tmp_path, versions=[1, 2])
+    assert info.misses + info.hits == 2
+    assert info.skipped == 2
+    assert len(list(tmp_path.iterdir())) == 2
+
+    Driver.use_compile_cache(tmp_path)
+    try:
+        assert CompileCache(tmp_path).compile(uncompiled(Foo, version=2))
+        foo = Foo(bar="bar", baz=1, label="label", padded="pad")
+        assert foo.dump(Driver, compiled=True) == foo.dump(Driver)
+    finally:
+        Driver.use_compile_cache(None)
+
+
+def test_main(tmp_path, capsys):
+    assert main([str(tmp_path), f"{__name__}:Foo", "-v", "1", "-s", "big_endian=True"]) == 0
+    assert "1 compiled" in capsys.readouterr().out
+    assert len(list(tmp_path.iterdir())) == 1
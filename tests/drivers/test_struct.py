@@ -0,0 +1,49 @@
+import pytest
+
+import netcast as nc
+from netcast.drivers.struct import Struct
+
+
+class Fixed(nc.Model):
+    name = nc.String(padded=True, size=8)
+    number = nc.Int()
+    flags = nc.Char(signed=False)
+    ratio = nc.Double(version_added=2, default=0.5)
+
+
+class Dynamic(nc.Model):
+    name = nc.String()
+    number = nc.Int()
+
+
+@pytest.mark.parametrize("settings", [{}, {"version": 1}, {"big_endian": True}])
+def test_same_output_as_construct(settings):
+    instance = Fixed(name="foo", number=-1, flags=255, ratio=1.5)
+    dump = instance.dump("struct", **settings)
+    assert isinstance(instance.impl("struct", settings), Struct)
+    assert dump == instance.dump("construct", **settings)
+    assert Fixed().load("struct", dump, **settings) == Fixed().load(
+        "construct", dump, **settings
+    )
+
+
+def test_fallback():
+    instance = Dynamic(name="foo", number=1)
+    assert not isinstance(instance.impl("struct"), Struct)
+    assert instance.dump("struct") == instance.dump("construct")
+
+
+def test_pack_into():
+    instance = Fixed(name="foo", number=1, flags=2)
+    serializer = instance.impl("struct")
+    buffer = bytearray(64)
+    size = serializer.pack_into(instance.get_state(), buffer, 3)
+    assert buffer[3:3 + size] == instance.dump("struct")
+    assert serializer.unpack_from(buffer, 3) == instance.get_state()
+
+
+def test_errors():
+    with pytest.raises(nc.NetcastError):
+        Fixed(name="foo", number=1, flags=-1).dump("struct")
+    with pytest.raises(nc.NetcastError):
+        Fixed(name="foo" * 3, number=1, flags=1).dump("struct")
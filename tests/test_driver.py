@@ -0,0 +1,21 @@
+import netcast as nc
+from netcast.drivers.construct import Driver
+
+
+class TestDriverMemo:
+    def test_shared_impls(self):
+        class Foo(nc.Model):
+            bar = nc.Int()
+
+        class Baz(nc.Model):
+            bar = nc.Int()
+
+        Driver.clear_memo()
+        foo_impl = Foo().impl(Driver, final=True)
+        baz_impl = Baz().impl(Driver, final=True)
+        assert foo_impl.subcons[0] is baz_impl.subcons[0]
+        assert Driver.memo_info().hits
+        assert Driver.memo_info().currsize
+
+        Driver.clear_memo()
+        assert Driver.memo_info() == (0, 0, 0, Driver.memo_size, 0)
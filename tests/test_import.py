@@ -0,0 +1,56 @@
+import pathlib
+import subprocess
+import sys
+
+# Cumulative time of "import netcast" in microseconds, generous for slow machines
+IMPORT_TIME_BUDGET = 250_000
+LAZY_MODULES = (
+    "asyncio",
+    "construct",
+    "netcast.drivers",
+    "netcast.extras",
+    "netcast.tools.arrangements",
+    "netcast.tools.contexts",
+    "queue",
+    "socket",
+    "ssl",
+)
+
+
+def run(*args):
+    return subprocess.run(
+        [sys.executable, *args],
+        capture_output=True,
+        check=True,
+        cwd=pathlib.Path(__file__).parent.parent,
+        text=True,
+    )
+
+
+def import_times(statement):
+    times = {}
+    for line in run("-X", "importtime", "-c", statement).stderr.splitlines():
+        _, _, row = line.partition("import time:")
+        _, cumulative, module = row.split("|")
+        if cumulative.strip().isdigit():
+            times[module.strip()] = int(cumulative)
+    return times
+
+
+def test_import_time():
+    times = import_times("import netcast")
+    assert times["netcast"] < IMPORT_TIME_BUDGET
+    assert not set(LAZY_MODULES) & times.keys()
+
+
+def test_lazy_submodules():
+    modules = set(
+        run(
+            "-c",
+            "import sys, netcast\n"
+            "netcast.drivers.struct, netcast.tools.arrangements.ListArrangement\n"
+            "print(*sys.modules)",
+        ).stdout.split()
+    )
+    assert {"netcast.drivers.struct", "netcast.tools.arrangements"} <= modules
+    assert not {"asyncio", "construct", "queue", "ssl"} & modules
@@ -1,4 +1,16 @@
+import array
+import gc
+import io
+import mmap
+import sys
+import threading
+import weakref
+
+import pytest
+
 import netcast as nc
+from netcast.tools.contexts import ByteArrayContext, BytesIOContext
+from netcast.tools.streams import StreamReader
 
 
 class TestModel:
@@ -44,3 +56,545 @@ class TestModel:
         assert isinstance(bar_model.foo, nc.Field)
         assert bar_model.foo.contained
         assert bar_model.stack.size == 1
+
+    def test_storage(self):
+        class Inner(nc.Model):
+            a = nc.Int()
+
+        class Foo(nc.Model):
+            bar = nc.Int()
+            inner = Inner
+
+        first, second = Foo(bar=1, inner={"a": 2}), Foo(bar=3)
+        assert first.state == {"bar": 1, "inner": {"a": 2}}
+        assert second.state == {"bar": 3, "inner": {"a": None}}
+        assert first.inner is not second.inner
+        assert not hasattr(first._storage, "__dict__")
+
+        ref = weakref.ref(first)
+        inner_ref = weakref.ref(first.inner)
+        gc.disable()  # instances must be freed without the cycle collector
+        try:
+            del first
+            assert ref() is None
+            assert inner_ref() is None
+        finally:
+            gc.enable()
+
+    @pytest.mark.parametrize("driver", ["construct", "struct", "codegen"])
+    def test_repeated(self, driver):
+        class Point(nc.Model):
+            x = nc.Int()
+            y = nc.Int8()
+
+        assert Point[2] is Point[2]
+        points = Point[2]()
+        points.point_1.set_state({"x": 1, "y": 2})
+        points.point_2.set_state({"x": 3, "y": 4})
+        dump = points.dump(driver)
+        assert len(dump) == 10
+        assert Point[2]().load(driver, dump).state == points.state
+
+        # Repeated numbers are lowered to an array, keeping their settings
+        assert nc.Int8[3] is nc.Int8[3]
+        bytes_ = nc.Int8[3]({"Integer_1": 1, "Integer_2": 2, "Integer_3": 3})
+        assert isinstance(bytes_.impl(driver), nc.Array)
+        assert bytes_.dump(driver) == b"\x01\x02\x03"
+        assert nc.Int8[3]().load(driver, b"\x01\x02\x03").state == bytes_.state
+
+    def test_repeated_cache(self):
+        ref = weakref.ref(nc.Int16[5])
+        assert nc.repeated_cache
+        gc.collect()
+        assert ref() is None
+
+    def test_deferred_build(self):
+        class Base(nc.Model):
+            b = nc.Int()
+            a = nc.Char()
+
+        class Foo(Base):
+            name = nc.Short()
+            c = nc.Int()
+
+        assert "_pending" in vars(Base) and "_pending" in vars(Foo)
+        assert Foo.name == "foo"
+        assert isinstance(Foo.c, nc.Field)
+        assert "_pending" not in vars(Base) and "_pending" not in vars(Foo)
+        assert isinstance(Foo.a, nc.Field)
+        assert list(Base._descriptors) == ["a", "b"]
+        assert list(Foo._descriptors) == ["a", "b", "c", "name"]
+        assert Foo.stack.size == 4
+
+    @pytest.mark.parametrize("driver", ["construct", "struct", "codegen"])
+    def test_inherited_fields(self, driver):
+        class Base(nc.Model):
+            a = nc.Int32()
+            b = nc.Int32()
+
+        class Foo(Base):
+            c = nc.Int32()
+
+        class Bar(Base, include=("b",)):
+            d = nc.Char()
+
+        foo = Foo(a=1, b=2, c=3)
+        assert foo.state == {"a": 1, "b": 2, "c": 3}
+        dump = foo.dump(driver)
+        assert dump == Base(a=1, b=2).dump(driver) + b"\x03\x00\x00\x00"
+        assert Foo().load(driver, dump) == foo
+        assert Base().load(driver, Base(a=4, b=5).dump(driver)).state == {"a": 4, "b": 5}
+
+        bar = Bar(b=2, d=4)
+        assert list(Bar._descriptors) == ["b", "d"]
+        assert Bar().load(driver, bar.dump(driver)) == bar
+
+    def test_deferred_build_threads(self):
+        errors = []
+
+        def use(model, barrier):
+            barrier.wait()
+            try:
+                assert model(a=1, b=2).dump("struct") == b"\x01\x02\x00\x00\x00"
+            except Exception as exc:  # pylint: disable=W0703
+                errors.append(exc)
+
+        # Switch threads as often as possible to catch a partially built model
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            for _ in range(50):
+                class Foo(nc.Model):
+                    a = nc.Char()
+                    b = nc.Int()
+
+                barrier = threading.Barrier(8)
+                threads = [
+                    threading.Thread(target=use, args=(Foo, barrier)) for _ in range(8)
+                ]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+        finally:
+            sys.setswitchinterval(switch_interval)
+        assert not errors
+
+    def test_descriptor_tables(self):
+        class Foo(nc.Model):
+            a = nc.Int()
+            b = nc.Int(version_added=2)
+            c = nc.Int(version_removed=3)
+
+        foo = Foo(a=1, b=2, c=3)
+        assert foo.get_state(version=1) == {"a": 1, "c": 3}
+        assert foo.get_state(version=2) == {"a": 1, "b": 2, "c": 3}
+        assert foo.get_state(version=3) == {"a": 1, "b": 2}
+        assert foo._choose_descriptors({"version": 1}) is foo._choose_descriptors(
+            {"version": 1}
+        )
+        assert len(Foo._descriptor_tables) == 3
+
+        Foo.stack.pop()
+        assert Foo._choose_descriptors(foo, {"version": 1}).keys() <= {"a", "c"}
+        assert len(Foo._descriptor_tables) == 1
+
+    def test_version_change(self):
+        class Foo(nc.Model):
+            a = nc.Int()
+            b = nc.Int(version_added=2)
+
+        foo = Foo(a=1, b=2)
+        assert foo.get_state(version=1) == {"a": 1}
+        Foo.b.configure(version_added=1)
+        assert foo.get_state(version=1) == {"a": 1, "b": 2}
+
+    def test_serializer_cache(self):
+        class Foo(nc.Model):
+            bar = nc.Int()
+
+        foo = Foo(bar=1)
+        nc.serializer_cache.clear()
+        first = foo.impl("construct")
+        assert foo.impl("construct") is first
+        assert foo.impl("construct", {"version": 1}) is not first
+        assert nc.serializer_cache.info().hits == 1
+        assert nc.serializer_cache.info().misses == 2
+        assert foo.dump("construct") == b"\x01\x00\x00\x00"
+
+        assert Foo.invalidate_cache() == 2
+        assert foo.impl("construct") is not first
+
+        first = foo.impl("construct")
+        Foo.stack.add(nc.Int(name="extra"))
+        assert foo.impl("construct") is not first
+
+    @pytest.mark.parametrize("driver", ["construct", "struct", "codegen"])
+    def test_serializer_cache_reconfigure(self, driver):
+        class Foo(nc.Model):
+            a = nc.Int()
+            b = nc.Int()
+
+        foo = Foo(a=1, b=2)
+        assert foo.dump(driver) == b"\x01\x00\x00\x00\x02\x00\x00\x00"
+        Foo.b.configure(bit_size=16)
+        assert foo.dump(driver) == b"\x01\x00\x00\x00\x02\x00"
+        assert Foo(a=1, b=2).dump(driver) == b"\x01\x00\x00\x00\x02\x00"
+        serializer = foo.impl(driver)
+        nc.Int(name="unrelated")
+        assert foo.impl(driver) is serializer
+
+    @pytest.mark.parametrize("driver", ["construct", "struct", "codegen"])
+    def test_trusted(self, driver):
+        class Foo(nc.Model):
+            bar = nc.Int()
+            baz = nc.Char(signed=False)
+
+        class Trusted(nc.Model, trusted=True):
+            bar = nc.Int()
+            baz = nc.Char(signed=False)
+
+        foo = Foo(bar=1, baz=2)
+        dump = foo.dump(driver)
+        assert foo.impl(driver, {"trusted": True}).trusted
+        assert foo.dump(driver, trusted=True) == Trusted(bar=1, baz=2).dump(driver) == dump
+        assert Trusted().load(driver, dump).state == foo.state
+        assert Foo.load_many([dump], driver, trusted=True)[0].state == foo.state
+
+    @pytest.mark.parametrize("driver", ["construct", "struct", "codegen"])
+    @pytest.mark.parametrize(
+        "buffer_type", [bytearray, lambda size: memoryview(bytearray(size)), ByteArrayContext]
+    )
+    def test_dump_into(self, driver, buffer_type):
+        class Foo(nc.Model):
+            bar = nc.Int()
+            baz = nc.String(padded=True, size=4)
+
+        foos = [Foo(bar=idx, baz=str(idx)) for idx in range(3)]
+        dump = foos[0].dump(driver)
+        buffer = buffer_type(len(dump) * 3 + 1)
+        offset = 1
+        for foo in foos:
+            offset += foo.dump_into(buffer, offset, driver)
+        assert offset == len(buffer)
+        assert bytes(buffer[1:]) == b"".join(foo.dump(driver) for foo in foos)
+        with pytest.raises(nc.NetcastError):
+            foos[0].dump_into(buffer, len(buffer) - 1, driver)
+
+    @pytest.mark.parametrize("driver", ["construct", "struct", "codegen"])
+    @pytest.mark.parametrize("buffer_type", [bytes, bytearray, memoryview, "mmap"])
+    def test_load_from(self, driver, buffer_type):
+        class Foo(nc.Model):
+            bar = nc.Int()
+            baz = nc.String(padded=True, size=4)
+
+        foos = [Foo(bar=idx, baz=str(idx)) for idx in range(3)]
+        data = b"\xff" + b"".join(foo.dump(driver) for foo in foos)
+        if buffer_type == "mmap":
+            buffer = mmap.mmap(-1, len(data))
+            buffer.write(data)
+        else:
+            buffer = buffer_type(data)
+        offset = 1
+        loaded = []
+        while offset < len(data):
+            foo = Foo()
+            offset += foo.load_from(buffer, offset, driver)
+            loaded.append(foo.state)
+        assert offset == len(data)
+        assert loaded == [foo.state for foo in foos]
+        with pytest.raises(nc.NetcastError):
+            Foo().load_from(buffer, len(data) - 1, driver)
+
+    @pytest.mark.parametrize("driver", ["construct", "codegen"])
+    @pytest.mark.parametrize("buffer_type", [bytearray, memoryview, "mmap"])
+    def test_load_from_terminated(self, driver, buffer_type):
+        class Foo(nc.Model):
+            bar = nc.Int()
+            name = nc.String(null_terminated=True)
+
+        foos = [Foo(bar=idx, name="x" * idx) for idx in range(3)]
+        data = b"".join(foo.dump(driver) for foo in foos)
+        if buffer_type == "mmap":
+            buffer = mmap.mmap(-1, len(data))
+            buffer.write(data)
+        else:
+            buffer = buffer_type(data)
+        offset = 0
+        for expected in foos:
+            foo = Foo()
+            offset += foo.load_from(buffer, offset, driver)
+            assert foo.state == expected.state
+        assert offset == len(data)
+
+    def test_default_state(self):
+        class Inner(nc.Model):
+            a = nc.Int(default=1)
+
+        class Foo(nc.Model):
+            bar = nc.Int(default=2)
+            baz = nc.Char()
+            inner = Inner
+
+        assert Foo._default_state == {"bar": 2}
+        assert Foo(baz=3).get_state() == {"bar": 2, "baz": 3, "inner": {"a": 1}}
+        assert Foo(bar=4, baz=3).bar == 4
+        assert Foo({"baz": 5}).get_state() == {"bar": 2, "baz": 5, "inner": {"a": 1}}
+        assert Foo(inner={"a": 6}).get_state(None)["inner"] == {"a": 6}
+
+        foo = Foo(baz=3)
+        foo.dump("construct")
+        foo.load_state({"bar": 7, "baz": 8})
+        assert foo.dirty_fields == {"bar", "baz"}
+        assert foo.load_state({"inner": {"a": 9}}).inner.a == 9
+        assert foo.load_state((1, 2, {"a": 3})).get_state() == {
+            "bar": 1, "baz": 2, "inner": {"a": 3}
+        }
+
+    def test_dirty_fields(self):
+        class Foo(nc.Model):
+            bar = nc.Int()
+            baz = nc.Char()
+
+        foo = Foo(bar=1, baz=2)
+        assert foo.dirty_fields == {"bar", "baz"}
+        foo.dump("construct")
+        assert foo.dirty_fields == frozenset()
+        foo.baz = 3
+        foo.load_state({"bar": 2})
+        assert foo.dirty_fields == {"bar", "baz"}
+
+    @pytest.mark.parametrize("driver", ["construct", "struct", "codegen"])
+    def test_incremental_dump(self, driver, monkeypatch):
+        class Fixed(nc.Model):
+            bar = nc.Int()
+            baz = nc.String(padded=True, size=4)
+            qux = nc.Char()
+
+        foo = Fixed(bar=1, baz="a", qux=2)
+        serializer = foo.impl(driver)
+        full_dumps = []
+
+        def dump(obj, settings=None, /, **kwargs):
+            full_dumps.append(obj)
+            return type(serializer).dump(serializer, obj, settings, **kwargs)
+
+        monkeypatch.setattr(serializer, "dump", dump)
+        assert foo.dump(driver) == foo.dump(driver)
+        assert foo._dump_cache is not None
+        foo.qux = 3
+        foo.baz = "bcd"
+        assert foo.dump(driver) == Fixed(bar=1, baz="bcd", qux=3).dump(driver)
+        assert len(full_dumps) == 3  # the first two dumps and the fresh instance's one
+        foo.baz = "too long"
+        with pytest.raises(nc.NetcastError):
+            foo.dump(driver)
+
+    def test_one_shot_dump(self):
+        class Fixed(nc.Model):
+            bar = nc.Int()
+
+        foo = Fixed(bar=1)
+        foo.dump("struct")
+        assert foo._dump_cache is None  # dumped once, nothing kept
+
+    @pytest.mark.parametrize("driver", ["construct", "codegen"])
+    def test_incremental_dump_dynamic(self, driver):
+        class Dynamic(nc.Model):
+            a_name = nc.String(null_terminated=True)
+            bar = nc.Int()
+
+        foo = Dynamic(a_name="ab", bar=1)
+        foo.dump(driver)
+        foo.bar = 2
+        assert foo.dump(driver) == Dynamic(a_name="ab", bar=2).dump(driver)
+        foo.a_name = "abc"
+        assert foo.dump(driver) == Dynamic(a_name="abc", bar=2).dump(driver)
+        assert foo.dump(driver, version=1) == foo.dump(driver)
+
+    @pytest.mark.parametrize("driver", ["construct", "struct", "codegen"])
+    def test_incremental_dump_dependent(self, driver):
+        class Tagged(nc.Model):
+            a_kind = nc.Char()
+            body = nc.Switch(
+                lambda ctx: ctx.a_kind,
+                cases=(nc.Case(1, nc.Int()), nc.Case(2, nc.Short())),
+            )
+
+        tag = Tagged(a_kind=1, body=5)
+        assert tag.dump(driver) == b"\x01\x05\x00\x00\x00"
+        tag.a_kind = 2
+        assert tag.dump(driver) == Tagged(a_kind=2, body=5).dump(driver) == b"\x02\x05\x00"
+
+    @pytest.mark.parametrize("driver", ["construct", "struct", "codegen"])
+    def test_view(self, driver):
+        class Inner(nc.Model):
+            x = nc.Short()
+
+        class Foo(nc.Model):
+            a_name = nc.String(padded=True, size=4)
+            bar = nc.Int()
+            inner = Inner
+
+        foo = Foo(a_name="ab", bar=5)
+        foo.inner.x = 7
+        dump = foo.dump(driver)
+        view = Foo.view(b"\xff" + dump, 1, driver)
+        assert len(view) == len(dump)
+        assert (view.bar, view["a_name"], view.inner.x) == (5, "ab", 7)
+        assert view.inner is view.inner
+        assert dict(view)["bar"] == 5
+        with pytest.raises(AttributeError):
+            view.bar = 6
+        with pytest.raises(AttributeError):
+            view.baz
+
+        # Fields of the fixed-size prefix are decoded independently
+        broken = Foo.view(b"\xff\xff\xff\xff" + dump[4:], 0, driver)
+        assert broken.bar == 5
+        with pytest.raises(nc.NetcastError):
+            broken.a_name
+
+    @pytest.mark.parametrize("driver", ["construct", "codegen"])
+    def test_view_dynamic(self, driver):
+        class Foo(nc.Model):
+            a_name = nc.String(null_terminated=True)
+            bar = nc.Int()
+
+        foos = [Foo(a_name="x" * idx, bar=idx) for idx in range(3)]
+        buffer = memoryview(b"".join(foo.dump(driver) for foo in foos))
+        offset = 0
+        for foo in foos:
+            view = Foo.view(buffer, offset, driver)
+            assert (view.bar, view.a_name) == (foo.bar, foo.a_name)
+            offset += len(view)
+        assert offset == len(buffer)
+
+    @pytest.mark.parametrize("driver", ["construct", "struct", "codegen"])
+    def test_view_dependent(self, driver):
+        class Tagged(nc.Model):
+            a_kind = nc.Char()
+            body = nc.Switch(
+                lambda ctx: ctx.a_kind,
+                cases=(nc.Case(1, nc.Int()), nc.Case(2, nc.Short())),
+            )
+
+        tags = [Tagged(a_kind=kind, body=5) for kind in (1, 2)]
+        buffer = b"".join(tag.dump(driver) for tag in tags)
+        view = Tagged.view(buffer, 0, driver)
+        assert (view.a_kind, view.body, len(view)) == (1, 5, 5)
+        view = Tagged.view(buffer, 5, driver)
+        assert (view.body, view.a_kind, len(view)) == (5, 2, 3)
+
+    @pytest.mark.parametrize("driver", ["construct", "struct", "codegen"])
+    def test_static_size(self, driver):
+        class Fixed(nc.Model):
+            bar = nc.Int()
+            baz = nc.String(padded=True, size=4)
+            qux = nc.Char(version_added=2, default=3)
+
+        fixed = Fixed(bar=1, baz="a")
+        assert Fixed.static_size(driver, version=1) == len(fixed.dump(driver, version=1)) == 8
+        assert Fixed.static_size(driver, version=2) == 9
+        assert Fixed(bar=1, baz="a").encoded_size(driver, version=2) == 9
+
+        class Dynamic(nc.Model):
+            bar = nc.Int()
+            name = nc.String(null_terminated=True)
+
+        assert Dynamic.static_size(driver) is None
+        for name in ("", "abc", "ab" * 100):
+            foo = Dynamic(bar=1, name=name)
+            assert foo.encoded_size(driver) == len(foo.dump(driver))
+
+    @pytest.mark.parametrize("driver", ["construct", "struct", "codegen"])
+    def test_dump_many(self, driver):
+        class Foo(nc.Model):
+            bar = nc.Int()
+            baz = nc.Char(version_added=2, default=3)
+
+        foos = [Foo(bar=idx) for idx in range(5)]
+        dumps = Foo.dump_many(foos, driver, version=2)
+        assert dumps == [foo.dump(driver, version=2) for foo in foos]
+
+        buffer, offsets = Foo.dump_many(foos, driver, version=2, output="buffer")
+        assert buffer == b"".join(dumps)
+        assert list(offsets) == [0, 5, 10, 15, 20, 25]
+        assert Foo.dump_many([], driver, output="buffer") == (b"", array.array("Q", [0]))
+
+        with pytest.raises(ValueError):
+            Foo.dump_many(foos, driver, output="tuple")
+
+    @pytest.mark.parametrize("driver", ["construct", "struct", "codegen"])
+    def test_load_many(self, driver):
+        class Foo(nc.Model):
+            bar = nc.Int()
+            baz = nc.Char(version_added=2, default=3)
+
+        foos = [Foo(bar=idx) for idx in range(5)]
+        states = [foo.state for foo in foos]
+        dumps = Foo.dump_many(foos, driver)
+        loaded = Foo.load_many(dumps, driver)
+        assert all(isinstance(foo, Foo) for foo in loaded)
+        assert [foo.state for foo in loaded] == states
+        assert Foo.load_many(dumps, driver, output="states") == states
+
+        buffer, offsets = Foo.dump_many(foos, driver, output="buffer")
+        assert Foo.load_many(buffer, driver, offsets=offsets, output="states") == states
+        stream = io.BytesIO(buffer)
+        assert Foo.load_many(stream, driver, offsets=offsets, output="states") == states
+
+        with pytest.raises(ValueError):
+            Foo.load_many(io.BytesIO(buffer), driver)
+        with pytest.raises(nc.NetcastError):
+            Foo.load_many([b"\x00"], driver)
+
+    @pytest.mark.parametrize("driver", ["construct", "struct", "codegen"])
+    def test_iter_load(self, driver):
+        class Foo(nc.Model):
+            bar = nc.Int()
+            baz = nc.String(padded=True, size=4)
+
+        foos = [Foo(bar=idx, baz=str(idx)) for idx in range(20)]
+        buffer, _ = Foo.dump_many(foos, driver, output="buffer")
+        stream = BytesIOContext(buffer)
+        loaded = Foo.iter_load(StreamReader(stream, chunk_size=16), driver)
+        assert next(loaded).state == foos[0].state
+        assert stream.tell() < len(buffer)
+        assert [foo.state for foo in loaded] == [foo.state for foo in foos[1:]]
+
+        with pytest.raises(nc.NetcastError):
+            list(Foo.iter_load(io.BytesIO(buffer[:-1]), driver))
+
+    @pytest.mark.parametrize(
+        "driver, settings",
+        [("construct", {}), ("construct", {"compiled": True}), ("codegen", {}), ("struct", {})],
+    )
+    def test_decoder(self, driver, settings):
+        class Foo(nc.Model):
+            bar = nc.Int()
+            baz = nc.String(padded=True, size=4)
+
+        class Bar(nc.Model):
+            foo = Foo
+            name = nc.String(null_terminated=True)
+            title = nc.String(pascal=True)
+
+        model = Foo if driver == "struct" else Bar
+        instances = [Foo(bar=idx, baz=str(idx)) for idx in range(5)]
+        if model is Bar:
+            instances = [Bar(name="n" * idx, title="t" * idx) for idx in range(5)]
+            for idx, bar in enumerate(instances):
+                bar.foo.bar = idx
+                bar.foo.baz = str(idx)
+        buffer, _ = model.dump_many(instances, driver, output="buffer", **settings)
+
+        decoder = model.decoder(driver, **settings)
+        loaded = []
+        for idx in range(len(buffer)):
+            loaded.extend(decoder.feed(buffer[idx:idx + 1]))
+        assert all(isinstance(instance, model) for instance in loaded)
+        assert [instance.state for instance in loaded] == [
+            instance.state for instance in instances
+        ]
+        assert not decoder.busy
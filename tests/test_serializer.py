@@ -0,0 +1,43 @@
+from netcast.serializer import Serializer
+
+
+class Counting(Serializer):
+    def __init__(self, **settings):
+        self.calls = []
+        super().__init__(**settings)
+
+    def _configure(self, *, size=1):
+        self.calls.append(size)
+
+
+def test_configure_fast_path():
+    serializer = Counting(size=2)
+    assert serializer.calls == [2]
+    assert serializer.configure() is serializer.settings
+    assert serializer.configure(size=2) == {"priority": 0, "size": 2}
+    assert serializer.calls == [2]
+
+    serializer.configure(size=3)
+    assert serializer.calls == [2, 3]
+    serializer.configure(other=None)
+    assert serializer.calls == [2, 3, 3]
+    serializer.configure(other=None)
+    assert serializer.calls == [2, 3, 3]
+
+
+class Doubling(Serializer):
+    load_type = dump_type = int
+
+    def _dump(self, obj, settings, **kwargs):
+        return obj * 2
+
+    def _load(self, obj, settings, **kwargs):
+        return obj // 2
+
+
+def test_trusted():
+    assert Doubling().dump("2") == 4
+    assert Doubling().load(4.0, {}) == 2
+    assert Doubling(trusted=True).dump("2") == "22"
+    assert Doubling(trusted=True).load(4.0, {}) == 2.0
+    assert Doubling(trusted=True).dump_many(["2", 2]) == ["22", 4]
@@ -3,6 +3,7 @@ from typing import Type
 
 import pytest
 
+from netcast import LEAST
 from netcast.stack import Stack, SelectiveStack, VersionAwareStack
 from netcast.common import FloatingPoint, Integer, String
 
@@ -51,6 +52,37 @@ class TestStack:
         stack.add(serializer_class)
         assert stack.pop() is not serializer_class
 
+    def test_snapshot(self, stack, serializer):
+        generation = stack.generation
+        stack.push(serializer)
+        snapshot = stack.snapshot()
+        assert snapshot == (serializer,)
+        assert stack.generation != generation
+
+        generation = stack.generation
+        stack.discard(serializer)
+        assert stack.snapshot() == ()
+        assert snapshot == (serializer,)
+        assert stack.generation != generation
+
+    def test_priorities(self, stack, serializer_class):
+        first, second, third = (
+            serializer_class(name=name, priority=priority)
+            for name, priority in (("a", 1), ("b", 2), ("c", 3))
+        )
+        for component in (third, first, second):
+            stack.push(component)
+        assert stack.all() == [first, second, third]
+
+        stack.reprioritize(third, 0)
+        assert third.priority == 0
+        assert list(stack.choose_components()) == ["c", "a", "b"]
+        stack.discard(first)
+        assert stack.all() == [third, second]
+        assert stack.pop() is third
+        assert stack.pop(-1) is second
+        assert stack.size == 0
+
     def test_transform(self, stack, serializer_class):
         component = stack.transform_component(serializer_class)
         assert component is not serializer_class
@@ -94,3 +126,47 @@ class TestVersionAwareStack:
         settings[stack.settings_version_field] = incompatible_version
         assert not stack.predicate(component, settings=settings)
         assert stack.get(settings=settings) is None
+
+    def test_index(self, serializer_class):
+        stack = VersionAwareStack()
+        stack.add(serializer_class(name="a"))
+        stack.add(serializer_class(name="b", version_added=2))
+        stack.add(serializer_class(name="c", version_removed=3))
+        stack.add(serializer_class(name="d", version_added=2, version_removed=5))
+
+        expected = {0: "ac", 2: "abcd", 2.5: "abcd", 3: "abd", 5: "ab", 10: "ab"}
+        for version, names in expected.items():
+            chosen = stack.choose_components({"version": version})
+            assert "".join(sorted(chosen)) == names
+            assert chosen == {
+                component.name: component for component in stack.all()
+                if stack.predicate(component, {"version": version})
+            }
+        assert "".join(sorted(stack.choose_components())) == "ab"
+        assert stack.versions() == [LEAST, 2, 3, 5]
+        assert stack.selection_key({"version": 2}) == stack.selection_key({"version": 2.5})
+        assert stack.selection_key({"version": 2}) != stack.selection_key({"version": 3})
+
+        stack.add(serializer_class(name="e", version_added=7))
+        assert stack.versions() == [LEAST, 2, 3, 5, 7]
+        assert "e" in stack.choose_components()
+
+    def test_index_version_change(self, serializer_class):
+        stack = VersionAwareStack()
+        stack.add(serializer_class(name="a"))
+        b = stack.add(serializer_class(name="b", version_added=2))
+        assert list(stack.choose_components({"version": 1})) == ["a"]
+        generation = stack.generation
+
+        b.configure(version_added=1)
+        assert "".join(sorted(stack.choose_components({"version": 1}))) == "ab"
+        assert stack.versions() == [LEAST, 1]
+        assert stack.generation != generation
+
+    def test_unhashable_versions(self, serializer_class):
+        stack = VersionAwareStack()
+        stack.add(serializer_class(name="a", version_added=[1]))
+        stack.add(serializer_class(name="b", version_added=[3]))
+        with pytest.raises(TypeError):
+            stack.versions()
+        assert list(stack.choose_components({"version": [2]})) == ["a"]
@@ -8,6 +8,7 @@ import pytest
 from netcast.model import Model
 from netcast.serializer import Serializer
 from netcast.exceptions import ArrangementConstructionError
+from netcast.tools import arrangements as arrangements_module
 from netcast.tools.arrangements import (
     ClassArrangement,
     ClassFileIOArrangement,
@@ -20,6 +21,10 @@ from netcast.tools.arrangements import DefaultContextT, ArrangementT
 from netcast.tools.collections import ForwardDependency, parameters
 from netcast.tools.contexts import ContextT
 
+# Wrapped arrangement classes are built on first access
+for name in arrangements_module.__all__:
+    getattr(arrangements_module, name)
+
 class_arrangements = {ClassArrangement, *ClassArrangement.__subclasses__()}
 class_arrangements.discard(Arrangement)
 class_arrangements.discard(ClassFileIOArrangement)
@@ -0,0 +1,115 @@
+import random
+
+import pytest
+
+from netcast.tools.collections import IndexedHeap, LRUCache, Settings, freeze
+
+
+class TestLRUCache:
+    def test_eviction(self):
+        cache = LRUCache(maxsize=2)
+        cache["a"] = 1
+        cache["b"] = 2
+        assert cache.get("a") == 1  # "b" becomes the least recently used
+        cache["c"] = 3
+        assert "b" not in cache
+        assert cache.get("b") is None
+        assert cache.info() == (1, 1, 1, 2, 2)
+
+    def test_invalidate(self):
+        cache = LRUCache()
+        for key in range(5):
+            cache[key] = key
+        assert cache.invalidate(lambda key: key % 2) == 2
+        assert len(cache) == 3
+        assert cache.invalidate() == 3
+        assert not cache
+
+
+class TestIndexedHeap:
+    def test_order(self):
+        heap = IndexedHeap()
+        items = [object() for _ in range(6)]
+        for item, priority in zip(items, (3, 1, 2, 1, 0, 3)):
+            heap.push(item, priority)
+        assert list(heap) == [items[4], items[1], items[3], items[2], items[0], items[5]]
+        assert heap.peek() is items[4]
+        with pytest.raises(ValueError):
+            heap.push(items[0], 0)
+
+        heap.update(items[5], -1)
+        heap.remove(items[1])
+        assert not heap.discard(items[1])
+        assert items[1] not in heap
+        assert [heap.pop() for _ in range(len(heap))] == [
+            items[5], items[4], items[3], items[2], items[0]
+        ]
+        with pytest.raises(IndexError):
+            heap.pop()
+
+    def test_random_operations(self):
+        rng = random.Random(0)
+        heap = IndexedHeap()
+        expected = {}  # item -> (priority, insertion)
+        for step in range(2000):
+            operation = rng.random()
+            if operation < 0.5 or not expected:
+                item = object()
+                priority = rng.randrange(50)
+                heap.push(item, priority)
+                expected[item] = priority, step
+            elif operation < 0.7:
+                item = rng.choice(list(expected))
+                priority = rng.randrange(50)
+                heap.update(item, priority)
+                expected[item] = priority, expected[item][1]
+            elif operation < 0.9:
+                item = rng.choice(list(expected))
+                heap.remove(item)
+                del expected[item]
+            else:
+                item = heap.pop()
+                assert expected.pop(item) < min(expected.values(), default=(50, 0))
+        assert list(heap) == sorted(expected, key=expected.get)
+
+
+class TestSettings:
+    def test_layers(self):
+        base = Settings({"a": 1, "b": [2]})
+        child = base.layer({"b": [3]}, c=4)
+        assert child.parent is base
+        assert child.local == {"b": [3], "c": 4}
+        assert dict(child) == {"a": 1, "b": [3], "c": 4}
+        assert dict(base) == {"a": 1, "b": [2]}
+        assert base.layer() is base
+        assert child.layer(a=1, c=4) is child
+        assert Settings.of(child) is child
+
+    def test_hash(self):
+        settings = Settings({"a": 1, "b": [2]})
+        assert settings == {"b": [2], "a": 1}
+        assert settings == Settings({"b": [2]}).layer(a=1)
+        assert hash(settings) == hash(Settings({"b": [2]}).layer(a=1))
+        assert settings != settings.layer(a=2)
+        assert {settings: 1}[Settings(b=[2], a=1)] == 1
+        with pytest.raises(TypeError):
+            hash(Settings(a=object, b={}.keys()))
+        assert hash(Settings(a={}.keys()).layer(a=1)) == hash(Settings(a=1))
+
+    def test_chain(self):
+        base = Settings({"a": 1, "b": 2})
+        child = base.layer(b=3).layer(c=4)
+        assert child.parent.parent is base
+        assert (child["a"], child["b"], child.get("d")) == (1, 3, None)
+        assert "c" in child and "d" not in child
+        assert child._hash is not None  # computed up front
+        with pytest.raises(TypeError):
+            child.local["c"] = 5
+
+
+def test_freeze():
+    assert freeze({"a": [1, 2], "b": {3}}) == freeze({"b": {3}, "a": [1, 2]})
+    assert freeze({"a": [1, 2]}) != freeze({"a": (1, 2)})
+    hash(freeze({"a": {"b": [1, {"c": 2}]}}))
+    with pytest.raises(TypeError):
+        freeze({"a": bytearray()})
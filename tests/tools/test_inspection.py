@@ -0,0 +1,37 @@
+import inspect
+
+from netcast.tools.inspection import keyword_params, match_params
+
+
+def foo(baz, /, bar, *, biz):
+    pass
+
+
+def bar(foo, **baz):
+    pass
+
+
+class Foo:
+    def method(self, bar):
+        pass
+
+
+def test_match_params():
+    kwds = {"bar": "bar", "biz": "biz", "baz": "baz"}
+    assert match_params(foo, kwds) == {"bar": "bar", "biz": "biz"}
+    assert match_params(bar, kwds) == kwds
+    assert match_params(Foo().method, {"self": 1, "bar": 2}) == {"bar": 2}
+
+
+def test_keyword_params_cache(monkeypatch):
+    def baz(*, biz, **kwargs):
+        pass
+
+    assert keyword_params(Foo().method) == (False, frozenset({"bar"}))
+    calls = []
+    signature = inspect.signature
+    monkeypatch.setattr(inspect, "signature", lambda func: calls.append(func) or signature(func))
+    assert keyword_params(Foo().method) == (False, frozenset({"bar"}))
+    assert keyword_params(baz) == (True, frozenset({"biz"}))
+    assert keyword_params(baz) == (True, frozenset({"biz"}))
+    assert calls == [baz]
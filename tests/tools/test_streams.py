@@ -0,0 +1,118 @@
+import io
+import mmap
+import socket
+import threading
+
+import pytest
+
+from netcast.exceptions import NetcastError
+from netcast.tools.streams import BufferReader, BufferWriter, Decoder, StreamReader
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 5, 1024])
+def test_read(chunk_size):
+    reader = StreamReader(io.BytesIO(b"abcdefgh"), chunk_size=chunk_size)
+    assert reader.read(3) == b"abc"
+    assert reader.tell() == 3
+    assert reader.read(0) == b""
+    assert reader.read(10) == b"defgh"
+    assert reader.read(1) == b""
+    assert reader.at_eof()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 1024])
+def test_read_until(chunk_size):
+    reader = StreamReader(io.BytesIO(b"ab\x00c\x00\x00d\x00\x00\x00e"), chunk_size=chunk_size)
+    assert reader.read_until(b"\x00") == b"ab"
+    # The terminator is aligned to its length
+    assert reader.read_until(b"\x00\x00") == b"c\x00\x00d"
+    assert reader.read(1) == b"\x00"
+    assert not reader.at_eof()
+    with pytest.raises(EOFError):
+        reader.read_until(b"\x00")
+
+
+def test_seek():
+    reader = StreamReader(io.BytesIO(b"abcdef"), chunk_size=2)
+    assert reader.read(4) == b"abcd"
+    reader.seek(-1, io.SEEK_CUR)
+    assert reader.read(2) == b"de"
+    with pytest.raises(io.UnsupportedOperation):
+        reader.seek(0)
+
+
+def test_socket():
+    left, right = socket.socketpair()
+    with left, right:
+        thread = threading.Thread(target=lambda: (right.sendall(b"x" * 100), right.close()))
+        thread.start()
+        reader = StreamReader(left, chunk_size=7)
+        assert reader.read(60) == b"x" * 60
+        assert reader.read() == b"x" * 40
+        assert reader.at_eof()
+        thread.join()
+
+
+def test_buffer_reader():
+    buffer = mmap.mmap(-1, 6)
+    buffer.write(b"abcdef")
+    with BufferReader(buffer, 2) as reader:
+        assert reader.read(2) == b"cd"
+        assert reader.tell() == 2
+        data = bytearray(4)
+        assert reader.readinto(data) == 2
+        assert data == b"ef\x00\x00"
+        assert reader.read() == b""
+        reader.seek(1)
+        assert reader.read() == b"def"
+        with pytest.raises(ValueError):
+            reader.seek(5)
+
+    buffer = bytearray(b"ab")
+    with BufferReader(buffer) as reader:
+        reader.read(1)
+    buffer.extend(b"c")  # released
+    assert buffer == b"abc"
+
+
+def test_buffer_writer():
+    buffer = mmap.mmap(-1, 8)
+    with BufferWriter(buffer, 2) as writer:
+        assert writer.write(b"abc") == 3
+        writer.seek(1)
+        writer.write(b"BCD")
+        assert writer.tell() == 4
+        with pytest.raises(ValueError):
+            writer.write(b"xyz")
+    assert buffer[:] == b"\x00\x00aBCD\x00\x00"
+
+    buffer = bytearray(2)
+    with BufferWriter(buffer) as writer:
+        writer.write(b"a")
+    buffer.extend(b"b")  # released
+    assert buffer == b"a\x00b"
+
+
+def test_decoder():
+    loads = []
+
+    def loader():
+        size = (yield 1)[0]
+        loads.append(size)
+        data = yield size
+        name = yield b"\x00"
+        return data, name
+
+    decoder = Decoder(loader)
+    assert list(decoder.feed(b"\x03ab")) == []
+    assert decoder.busy
+    assert list(decoder.feed(b"cna")) == []
+    assert list(decoder.feed(b"me\x00\x01x")) == [(b"abc", b"name")]
+    # The first record was parsed once, not re-parsed on every feed
+    assert loads == [3, 1]
+    assert list(decoder.feed(b"\x00")) == [(b"x", b"")]
+    assert not decoder.busy
+    assert decoder.buffered == 0
+
+    with pytest.raises(NetcastError):
+        Decoder(lambda: iter(())).feed(b"\x00")